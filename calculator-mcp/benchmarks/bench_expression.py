@@ -0,0 +1,74 @@
+"""
+表达式整列求值基准测试
+对比逐行调用compound_interest运算与evaluate_array一次计算整张表的耗时
+
+用法: uv run python benchmarks/bench_expression.py [--rows 50000] [--repeat N]
+"""
+import argparse
+import asyncio
+import random
+import statistics
+import time
+
+from fastmcp import FastMCP
+
+from calculator_mcp.base.registry import OperationRegistry
+from calculator_mcp.expression import compiler
+from calculator_mcp.operations.compound_interest import CompoundInterestOperation
+
+FORMULA = "P*(1+r/n)^(n*t)"
+
+
+def measure(func, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples)
+
+
+def report(label: str, seconds: float) -> None:
+    print(f"{label:<44} {seconds * 1000:10.2f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="表达式整列求值基准测试")
+    parser.add_argument("--rows", type=int, default=50_000, help="表格行数")
+    parser.add_argument("--repeat", type=int, default=5, help="每项测量的重复次数（取中位数）")
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    principal = [round(rng.uniform(100, 100_000), 2) for _ in range(args.rows)]
+    rate = [round(rng.uniform(1, 10), 3) for _ in range(args.rows)]
+    years = [float(rng.randint(1, 30)) for _ in range(args.rows)]
+
+    registry = OperationRegistry(FastMCP(name="bench-expression"))
+    registry.register(CompoundInterestOperation)
+    loop = asyncio.new_event_loop()
+
+    def per_row():
+        async def run():
+            for p, r, t in zip(principal, rate, years):
+                await registry.execute(
+                    "compound_interest",
+                    {"principal": p, "rate": r, "time": t, "frequency": 12},
+                    detail="none"
+                )
+        loop.run_until_complete(run())
+
+    variables = {"P": principal, "r": [r / 100 for r in rate], "t": years, "n": 12}
+
+    def vectorized():
+        result = registry.evaluate_array(FORMULA, variables)
+        assert result.success, result.error_message
+
+    print(f"{args.rows:,} 行，公式 {FORMULA}")
+    report("逐行调用compound_interest", measure(per_row, max(1, args.repeat // 5)))
+    compiler.clear_cache()
+    report("evaluate_array（首次，含编译）", measure(vectorized, 1))
+    report("evaluate_array（命中编译缓存）", measure(vectorized, args.repeat))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""
+精确阶乘基准测试
+对比math.factorial加int转字符串与decimal质因数分解算法的耗时，
+并测量从缓存的阶乘继续计算的耗时
+
+用法: uv run python benchmarks/bench_factorial.py [--sizes 10000 100000 1000000] [--skip-baseline-above N]
+"""
+import argparse
+import math
+import sys
+import time
+
+from calculator_mcp.utils import factorials
+
+
+def timed(func):
+    start = time.perf_counter()
+    value = func()
+    return value, time.perf_counter() - start
+
+
+def report(label: str, seconds: float) -> None:
+    print(f"{label:<44} {seconds * 1000:12.2f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="精确阶乘基准测试")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000], help="n的取值")
+    parser.add_argument("--skip-baseline-above", type=int, default=100_000,
+                        help="n大于该值时跳过math.factorial对照（10^6时需要约半分钟）")
+    args = parser.parse_args()
+
+    # 对照组需要把整数完整转换为十进制字符串
+    sys.set_int_max_str_digits(0)
+
+    for n in args.sizes:
+        print(f"\nn = {n:,}")
+        if n <= args.skip_baseline_above:
+            value, seconds = timed(lambda: math.factorial(n))
+            report("math.factorial", seconds)
+            _, seconds = timed(lambda: str(value))
+            report("str(int)", seconds)
+
+        factorials.clear_cache()
+        value, seconds = timed(lambda: factorials.exact_factorial(n))
+        report("exact_factorial（质因数分解 + decimal）", seconds)
+        text, seconds = timed(lambda: factorials.to_decimal_string(value))
+        report(f"转换为十进制字符串（{len(text):,}位）", seconds)
+
+        _, seconds = timed(lambda: factorials.exact_factorial(n))
+        report("exact_factorial（命中缓存）", seconds)
+        step = max(n // 100, 1)
+        factorials.clear_cache()
+        factorials.exact_factorial(n - step)
+        _, seconds = timed(lambda: factorials.exact_factorial(n))
+        report(f"exact_factorial（从缓存的(n - {step:,})!继续乘）", seconds)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,242 @@
+"""
+端到端吞吐与延迟压测
+用FastMCP内存传输的客户端连接create_calculator_server()创建的服务器，
+以指定并发按加权组合发起工具和Prompt调用，统计每秒调用数以及每个工具的p50/p95/p99延迟。
+测量包含JSON-RPC封包、生成的工具函数和OperationResult序列化，这些是execute()微基准测不到的部分
+
+用法: uv run python benchmarks/bench_load.py [--mix mixed] [--concurrency 8] [--duration 10]
+      [--calls N] [--warmup 50] [--detail full] [--output results.json]
+--mix 可以是内置组合名称，也可以是JSON文件路径，文件内容为
+[{"kind": "tool", "name": "add", "arguments": {"a": 1, "b": 2}, "weight": 3}, ...]
+"""
+import argparse
+import asyncio
+import json
+import math
+import platform
+import random
+import time
+from collections import defaultdict
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, NamedTuple, Optional
+
+from fastmcp import Client
+
+from calculator_mcp.server import create_calculator_server
+
+
+class Call(NamedTuple):
+    """组合中的一种调用：kind为tool或prompt"""
+    kind: str
+    name: str
+    arguments: Dict[str, Any]
+    weight: float = 1.0
+
+
+_rng = random.Random(42)
+_NUMBERS_100 = [round(_rng.uniform(-1000, 1000), 3) for _ in range(100)]
+_NUMBERS_1000 = [round(_rng.uniform(-1000, 1000), 3) for _ in range(1000)]
+
+# 内置调用组合
+MIXES: Dict[str, List[Call]] = {
+    "scalar": [
+        Call("tool", "add", {"a": 12.5, "b": 7.25}, 3),
+        Call("tool", "multiply", {"a": 3.5, "b": 4}, 3),
+        Call("tool", "divide", {"a": 22, "b": 7}, 2),
+        Call("tool", "power", {"base": 1.05, "exponent": 12}, 2),
+        Call("tool", "square_root", {"value": 2}, 2),
+        Call("tool", "sine", {"angle": 30, "unit": "degree"}, 1),
+        Call("tool", "compound_interest", {"principal": 1000, "rate": 5, "time": 10, "frequency": 12}, 1),
+        Call("tool", "prime_check", {"number": 1_000_003}, 1),
+    ],
+    "lists": [
+        Call("tool", "median", {"numbers": _NUMBERS_100}, 2),
+        Call("tool", "average", {"values": _NUMBERS_100}, 2),
+        Call("tool", "variance", {"numbers": _NUMBERS_1000, "is_sample": True}, 1),
+        Call("tool", "standard_deviation", {"numbers": _NUMBERS_1000, "is_sample": False}, 1),
+        Call("tool", "square_array", {"values": _NUMBERS_1000}, 1),
+        Call("tool", "prime_check", {"start": 1, "stop": 10_000}, 1),
+    ],
+    "prompts": [
+        Call("prompt", "multiplication_table", {"size": 9}, 2),
+        Call("prompt", "health_metrics", {"height": 175, "weight": 70, "age": 30, "gender": "male"}, 1),
+        Call("prompt", "nutrition_planner", {"height": 175, "weight": 70, "age": 30, "gender": "male"}, 1),
+    ],
+    "mixed": [
+        Call("tool", "add", {"a": 12.5, "b": 7.25}, 4),
+        Call("tool", "multiply", {"a": 3.5, "b": 4}, 3),
+        Call("tool", "divide", {"a": 22, "b": 7}, 2),
+        Call("tool", "sine", {"angle": 30, "unit": "degree"}, 1),
+        Call("tool", "median", {"numbers": _NUMBERS_100}, 2),
+        Call("tool", "variance", {"numbers": _NUMBERS_1000, "is_sample": True}, 1),
+        Call("tool", "factorial", {"n": 100, "mode": "exact"}, 1),
+        Call("tool", "prime_check", {"number": 1_000_003}, 1),
+        Call("tool", "evaluate", {"expression": "2*(3+4)^2 - sqrt(16)"}, 1),
+        Call("tool", "batch_execute", {"operations": [
+            {"operation": "multiply", "arguments": {"a": i, "b": i + 1}} for i in range(1, 10)
+        ]}, 1),
+        Call("prompt", "multiplication_table", {"size": 9}, 1),
+        Call("prompt", "health_metrics", {"height": 175, "weight": 70}, 1),
+    ],
+}
+
+
+def load_mix(value: str) -> List[Call]:
+    """内置组合名称或JSON文件路径"""
+    if value in MIXES:
+        return MIXES[value]
+    path = Path(value)
+    if not path.exists():
+        raise SystemExit(f"未知的调用组合: {value}（内置组合: {', '.join(MIXES)}）")
+    calls = [Call(**item) for item in json.loads(path.read_text(encoding="utf-8"))]
+    for call in calls:
+        if call.kind not in ("tool", "prompt"):
+            raise SystemExit(f"调用类型必须是tool或prompt: {call.kind}")
+    return calls
+
+
+def percentile(samples: List[float], q: float) -> float:
+    """最近秩法百分位数，samples须已排序"""
+    rank = max(1, math.ceil(q / 100 * len(samples)))
+    return samples[rank - 1]
+
+
+async def invoke(client: Client, call: Call) -> bool:
+    """发起一次调用，返回是否成功（协议错误、工具错误和运算失败结果都算失败）"""
+    try:
+        if call.kind == "prompt":
+            await client.get_prompt(call.name, call.arguments)
+            return True
+        result = await client.call_tool(call.name, call.arguments, raise_on_error=False)
+    except Exception:
+        return False
+    if result.is_error:
+        return False
+    content = result.structured_content or {}
+    return content.get("success", True) is not False
+
+
+async def run_load(
+    calls: List[Call],
+    concurrency: int,
+    duration: Optional[float],
+    total_calls: Optional[int],
+    warmup: int,
+    detail: Optional[str]
+) -> Dict[str, Any]:
+    server = create_calculator_server(detail=detail)
+    weights = [call.weight for call in calls]
+    # 按 类型:名称 统计，同一工具的不同参数合并在一起
+    latencies: Dict[str, List[float]] = defaultdict(list)
+    errors: Dict[str, int] = defaultdict(int)
+
+    async with Client(server) as client:
+        # 预热：触发按需导入并让每种调用至少执行一次
+        for call in calls:
+            await invoke(client, call)
+        for call in _rng.choices(calls, weights, k=warmup):
+            await invoke(client, call)
+
+        issued = 0
+        deadline = None
+
+        def next_call() -> Optional[Call]:
+            nonlocal issued
+            if total_calls is not None and issued >= total_calls:
+                return None
+            if deadline is not None and time.perf_counter() >= deadline:
+                return None
+            issued += 1
+            return _rng.choices(calls, weights)[0]
+
+        async def worker():
+            while (call := next_call()) is not None:
+                start = time.perf_counter()
+                ok = await invoke(client, call)
+                label = f"{call.kind}:{call.name}"
+                latencies[label].append(time.perf_counter() - start)
+                if not ok:
+                    errors[label] += 1
+
+        started = time.perf_counter()
+        if total_calls is None:
+            deadline = started + duration
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    completed = sum(len(samples) for samples in latencies.values())
+    per_call = {}
+    for label, samples in sorted(latencies.items()):
+        samples.sort()
+        per_call[label] = {
+            "calls": len(samples),
+            "errors": errors[label],
+            "calls_per_second": len(samples) / elapsed,
+            "p50": percentile(samples, 50),
+            "p95": percentile(samples, 95),
+            "p99": percentile(samples, 99),
+            "mean": sum(samples) / len(samples),
+        }
+    all_samples = sorted(sample for samples in latencies.values() for sample in samples)
+    return {
+        "elapsed": elapsed,
+        "calls": completed,
+        "errors": sum(errors.values()),
+        "calls_per_second": completed / elapsed,
+        "p50": percentile(all_samples, 50),
+        "p95": percentile(all_samples, 95),
+        "p99": percentile(all_samples, 99),
+        "per_call": per_call,
+    }
+
+
+def print_report(summary: Dict[str, Any], concurrency: int) -> None:
+    print(f"并发 {concurrency}，{summary['calls']}次调用，耗时 {summary['elapsed']:.2f} s，"
+          f"{summary['calls_per_second']:.1f} 次/秒，失败 {summary['errors']}次\n")
+    print(f"{'调用':<34} {'次数':>7} {'次/秒':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'失败':>5}")
+    for label, stats in summary["per_call"].items():
+        print(f"{label:<34} {stats['calls']:>7} {stats['calls_per_second']:>9.1f} "
+              f"{stats['p50'] * 1000:>9.2f} {stats['p95'] * 1000:>9.2f} {stats['p99'] * 1000:>9.2f} "
+              f"{stats['errors']:>5}")
+    print(f"{'全部':<34} {summary['calls']:>7} {summary['calls_per_second']:>9.1f} "
+          f"{summary['p50'] * 1000:>9.2f} {summary['p95'] * 1000:>9.2f} {summary['p99'] * 1000:>9.2f} "
+          f"{summary['errors']:>5}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="端到端吞吐与延迟压测")
+    parser.add_argument("--mix", default="mixed", help=f"调用组合：{', '.join(MIXES)} 或JSON文件路径")
+    parser.add_argument("--concurrency", type=int, default=8, help="同时进行的调用数")
+    parser.add_argument("--duration", type=float, default=10.0, help="压测时长（秒）")
+    parser.add_argument("--calls", type=int, help="总调用次数，给出时忽略--duration")
+    parser.add_argument("--warmup", type=int, default=50, help="正式计时前的预热调用次数")
+    parser.add_argument("--detail", choices=("none", "summary", "full"), help="服务器默认元数据详细程度")
+    parser.add_argument("--output", type=Path, help="结果JSON的写入路径")
+    args = parser.parse_args()
+
+    if args.concurrency < 1:
+        raise SystemExit("--concurrency 必须是正整数")
+    calls = load_mix(args.mix)
+    summary = asyncio.run(run_load(calls, args.concurrency, args.duration, args.calls, args.warmup, args.detail))
+    print_report(summary, args.concurrency)
+
+    if args.output:
+        report = {
+            "meta": {
+                "timestamp": datetime.now(timezone.utc).isoformat(),
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "unit": "seconds",
+                "mix": args.mix,
+                "concurrency": args.concurrency,
+                "detail": args.detail,
+            },
+            **summary,
+        }
+        args.output.write_text(json.dumps(report, indent=2, ensure_ascii=False), encoding="utf-8")
+        print(f"\n结果已写入 {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+中位数基准测试
+对比整体排序与numpy.partition选择算法计算中位数和四分位数的耗时
+
+用法: uv run python benchmarks/bench_median.py [--sizes 100000 1000000 10000000] [--repeat N]
+"""
+import argparse
+import asyncio
+import random
+import statistics
+import time
+from typing import List
+
+from calculator_mcp.base.operation import detail_level
+from calculator_mcp.operations.median import MedianInput, MedianOperation
+
+
+def measure(func, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples)
+
+
+def run_operation(loop, operation: MedianOperation, input_data: MedianInput, level: str):
+    async def run():
+        with detail_level(level):
+            return await operation.execute(input_data)
+    return loop.run_until_complete(run())
+
+
+def report(label: str, seconds: float) -> None:
+    print(f"{label:<40} {seconds * 1000:10.2f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="中位数基准测试")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100_000, 1_000_000, 10_000_000],
+                        help="输入列表长度")
+    parser.add_argument("--repeat", type=int, default=3, help="每项测量的重复次数")
+    args = parser.parse_args()
+
+    operation = MedianOperation()
+    loop = asyncio.new_event_loop()
+    for size in args.sizes:
+        numbers: List[float] = [random.uniform(-1000, 1000) for _ in range(size)]
+        input_data = MedianInput.model_construct(numbers=numbers)
+
+        print(f"\n中位数与四分位数（{size}个元素）")
+        report("sorted() 整体排序", measure(lambda: sorted(numbers), args.repeat))
+        report("detail=full（排序，返回排序结果）", measure(
+            lambda: run_operation(loop, operation, input_data, "full"), args.repeat))
+        report("detail=summary（numpy.partition选择）", measure(
+            lambda: run_operation(loop, operation, input_data, "summary"), args.repeat))
+    loop.close()
+
+
+if __name__ == "__main__":
+    main()
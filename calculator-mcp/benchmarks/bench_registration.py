@@ -0,0 +1,107 @@
+"""
+注册与冷启动基准测试
+对比exec生成包装函数与基于inspect.Signature构建包装函数的耗时，
+并测量create_calculator_server()的进程内耗时和冷启动耗时
+
+用法: uv run python benchmarks/bench_registration.py [--repeat N]
+"""
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+from typing import List
+
+from calculator_mcp.base.models import OperationResult
+from calculator_mcp.base.signature import build_signature, build_tool_function
+from calculator_mcp.operations import __all__ as operation_names
+from calculator_mcp import operations
+from calculator_mcp.server import create_calculator_server
+
+
+def legacy_exec_wrapper(operation):
+    """原先OperationRegistry.register中基于exec的包装函数生成方式"""
+    input_model = operation.input_model
+    fields = input_model.model_fields
+    params = []
+    for field_name, field_info in fields.items():
+        field_type = field_info.annotation
+        type_name = field_type.__name__ if hasattr(field_type, '__name__') else str(field_type)
+        params.append(f"{field_name}: {type_name}")
+    params_str = ', '.join(params)
+    kwargs_str = ', '.join(f"'{name}': {name}" for name in fields)
+    func_code = f"""
+async def operation_tool({params_str}):
+    try:
+        kwargs = {{{kwargs_str}}}
+        input_data = input_model(**kwargs)
+        return await operation.execute(input_data)
+    except Exception as e:
+        return OperationResult(success=False, error_message=str(e), operation_name=operation.name)
+"""
+    namespace = {'input_model': input_model, 'operation': operation,
+                 'OperationResult': OperationResult, 'List': List}
+    exec(func_code, namespace, namespace)
+    return namespace['operation_tool']
+
+
+def signature_wrapper(operation):
+    """当前基于缓存签名的包装函数生成方式"""
+    async def handler(kwargs):
+        return await operation.execute(operation.input_model(**kwargs))
+    return build_tool_function(operation.name, build_signature(operation.input_model), handler)
+
+
+def time_call(func, repeat: int) -> List[float]:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def report(label: str, samples: List[float]) -> None:
+    print(f"{label:<40} median {statistics.median(samples) * 1000:9.3f} ms"
+          f"   min {min(samples) * 1000:9.3f} ms")
+
+
+def cold_start_samples(repeat: int) -> List[float]:
+    code = (
+        "import time; start = time.perf_counter(); "
+        "from calculator_mcp.server import create_calculator_server; "
+        "create_calculator_server(); print(time.perf_counter() - start)"
+    )
+    samples = []
+    for _ in range(repeat):
+        output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+        samples.append(float(output.stdout.strip().splitlines()[-1]))
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description="注册与冷启动基准测试")
+    parser.add_argument("--repeat", type=int, default=20, help="每项测量的重复次数")
+    args = parser.parse_args()
+
+    instances = [getattr(operations, name)() for name in operation_names]
+
+    def build_all_legacy():
+        for operation in instances:
+            legacy_exec_wrapper(operation)
+
+    def build_all_signature():
+        for operation in instances:
+            signature_wrapper(operation)
+
+    print(f"包装函数构建（{len(instances)}个运算）")
+    report("exec生成（旧）", time_call(build_all_legacy, args.repeat))
+    report("inspect.Signature（新）", time_call(build_all_signature, args.repeat))
+
+    print("\n服务器创建")
+    report("create_calculator_server() 进程内", time_call(create_calculator_server, args.repeat))
+    report("导入 + 创建 冷启动（子进程）", cold_start_samples(max(3, args.repeat // 4)))
+
+
+if __name__ == "__main__":
+    main()
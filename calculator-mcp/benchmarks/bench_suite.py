@@ -0,0 +1,302 @@
+"""
+运算微基准测试套件
+对每个运算在small/medium/large三档输入规模下分别测量三层耗时：
+- validation: 输入模型完整校验（预构建的TypeAdapter）
+- execute: 直接调用BaseOperation.execute（输入已校验）
+- wrapper: OperationRegistry.register生成的工具函数（校验 + 执行 + 结果处理）
+
+结果以JSON写出（p50/p90/p99/平均/最小，单位秒），可与保存的基线比较，
+任一项p50比基线慢超过阈值时以退出码1结束
+
+用法: uv run python benchmarks/bench_suite.py [--output results.json] [--baseline baseline.json]
+      [--threshold 0.2] [--update-baseline] [--operations median,prime_check]
+      [--sizes small,large] [--layers execute,wrapper] [--min-time 0.2]
+"""
+import argparse
+import asyncio
+import json
+import math
+import platform
+import random
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from fastmcp import FastMCP
+from pydantic import ValidationError
+
+from calculator_mcp.base.registry import OperationRegistry, input_adapter
+from calculator_mcp.manifest import OPERATIONS, import_component
+
+SIZES = ("small", "medium", "large")
+LAYERS = ("validation", "execute", "wrapper")
+
+# 列表类输入在各档规模下的长度
+LIST_LENGTHS = {"small": 10, "medium": 1_000, "large": 100_000}
+
+# magnitude_array每个元素需要Stirling级数求值，数组长度取小一些
+MAGNITUDE_LENGTHS = {"small": 10, "medium": 100, "large": 1_000}
+
+# 无法重复调用的运算：每次调用都会改变服务器状态
+EXCLUDED = {
+    "stream_open": "每次调用新建一个数据流",
+    "stream_close": "数据流关闭后无法再次关闭",
+}
+
+_rng = random.Random(42)
+
+
+def floats(size: str, low: float = -1000.0, high: float = 1000.0) -> List[float]:
+    return [_rng.uniform(low, high) for _ in range(LIST_LENGTHS[size])]
+
+
+def integers(size: str, low: int = 1, high: int = 10**6, lengths: Dict[str, int] = LIST_LENGTHS) -> List[int]:
+    return [_rng.randint(low, high) for _ in range(lengths[size])]
+
+
+def scaled(small: Any, medium: Any, large: Any) -> Callable[[str], Any]:
+    """标量输入按规模取不同的值"""
+    values = {"small": small, "medium": medium, "large": large}
+    return lambda size: values[size]
+
+
+def case(**arguments: Callable[[str], Any]) -> Callable[[str], Dict[str, Any]]:
+    """由各参数的生成函数组成一个用例；非函数的参数在各档规模下保持不变"""
+    return lambda size: {
+        name: value(size) if callable(value) else value
+        for name, value in arguments.items()
+    }
+
+
+# 运算名称 -> 按规模生成参数的函数
+CASES: Dict[str, Callable[[str], Dict[str, Any]]] = {
+    "add": case(a=scaled(1.5, 1.5e8, 1.5e300), b=scaled(2.25, 2.25e8, 2.25e300)),
+    "subtract": case(a=scaled(1.5, 1.5e8, 1.5e300), b=scaled(2.25, 2.25e8, 2.25e300)),
+    "multiply": case(a=scaled(1.5, 1.5e8, 1.5e150), b=scaled(2.25, 2.25e8, 2.25e150)),
+    "divide": case(a=scaled(1.5, 1.5e8, 1.5e300), b=scaled(2.25, 2.25e8, 2.25e-3)),
+    "square": case(value=scaled(3.5, 3.5e8, 3.5e150)),
+    "square_root": case(value=scaled(2.0, 2.0e8, 2.0e300)),
+    "nth_root": case(value=scaled(27.0, 2.7e8, 2.7e300), n=scaled(3, 7, 101)),
+    "cube": case(value=scaled(3.5, 3.5e8, 3.5e100)),
+    "average": case(values=floats),
+    "power": case(base=scaled(2.0, 1.0001, 1.5), exponent=scaled(10, 1e4, 1700)),
+    "logarithm": case(number=scaled(100.0, 1e8, 1e300), base=scaled(10, 2, 7.5)),
+    "absolute": case(number=scaled(-3.5, -3.5e8, -3.5e300)),
+    "percentage": case(calculation_type="percentage", value=scaled(20, 2e8, 2e300), reference=scaled(50, 5e8, 5e300)),
+    "median": case(numbers=floats),
+    "standard_deviation": case(numbers=floats, is_sample=True),
+    "variance": case(numbers=floats, is_sample=True),
+    "modulo": case(dividend=scaled(17, 1.7e8, 1.7e300), divisor=scaled(5, 12345, 7.5)),
+    "gcd": case(numbers=integers),
+    "lcm": case(numbers=lambda size: integers(size, 1, 100)),
+    "sine": case(angle=scaled(30, 3e6, 3e15), unit="degree"),
+    "cosine": case(angle=scaled(30, 3e6, 3e15), unit="degree"),
+    "tangent": case(angle=scaled(0.5, 5e6, 5e15), unit="radian"),
+    "simple_interest": case(principal=scaled(1000, 1e8, 1e15), rate=5, time=scaled(1, 30, 100)),
+    "compound_interest": case(principal=scaled(1000, 1e8, 1e15), rate=5, time=scaled(1, 30, 100), frequency=scaled(1, 12, 365)),
+    "discount": case(original_price=scaled(100, 1e8, 1e15), discount_percent=20),
+    "factorial": case(n=scaled(10, 1_000, 20_000), mode="exact"),
+    "permutation": case(n=scaled(10, 150, 170), r=scaled(3, 50, 170)),
+    "combination": case(n=scaled(10, 150, 170), r=scaled(3, 50, 85)),
+    "prime_check": lambda size: (
+        {"number": 97} if size == "small" else {"numbers": integers(size, 2, 10**12)}
+    ),
+    "square_array": case(values=floats),
+    "cube_array": case(values=floats),
+    "square_root_array": case(values=lambda size: floats(size, 0, 1e6)),
+    "absolute_array": case(values=floats),
+    "logarithm_array": case(values=lambda size: floats(size, 1, 1e6), base=10),
+    "sine_array": case(values=floats, unit="degree"),
+    "cosine_array": case(values=floats, unit="degree"),
+    "tangent_array": case(values=floats, unit="radian"),
+    "stream_push": case(numbers=floats),
+    "stream_stats": case(is_sample=True),
+    "factorize": case(number=scaled(360, 600851475143, 2**61 - 1)),
+    "primes_in_range": case(start=scaled(1, 10**6, 10**9), stop=scaled(100, 10**6 + 10_000, 10**9 + 100_000)),
+    "count_primes": case(start=scaled(1, 10**6, 10**9), stop=scaled(100, 10**6 + 10_000, 10**9 + 100_000)),
+    "magnitude_array": case(
+        kind="combination",
+        n_values=lambda size: integers(size, 10**6, 10**9, MAGNITUDE_LENGTHS),
+        r_values=lambda size: integers(size, 1, 10**6, MAGNITUDE_LENGTHS)
+    ),
+}
+
+# 需要先打开数据流的运算
+STREAM_OPERATIONS = ("stream_push", "stream_stats")
+
+
+def percentile(samples: List[float], q: float) -> float:
+    """最近秩法百分位数，samples须已排序"""
+    rank = max(1, math.ceil(q / 100 * len(samples)))
+    return samples[rank - 1]
+
+
+def summarize(samples: List[float]) -> Dict[str, float]:
+    samples = sorted(samples)
+    return {
+        "rounds": len(samples),
+        "p50": percentile(samples, 50),
+        "p90": percentile(samples, 90),
+        "p99": percentile(samples, 99),
+        "mean": sum(samples) / len(samples),
+        "min": samples[0],
+    }
+
+
+async def measure(func: Callable[[], Any], min_time: float, min_rounds: int, max_rounds: int) -> Dict[str, float]:
+    """重复调用直到累计耗时达到min_time（至少min_rounds次，至多max_rounds次），func可返回协程"""
+    samples = []
+    total = 0.0
+    while len(samples) < max_rounds and (len(samples) < min_rounds or total < min_time):
+        start = time.perf_counter()
+        outcome = func()
+        if asyncio.iscoroutine(outcome):
+            await outcome
+        elapsed = time.perf_counter() - start
+        samples.append(elapsed)
+        total += elapsed
+    return summarize(samples)
+
+
+async def run_suite(
+    operations: List[str],
+    sizes: List[str],
+    layers: List[str],
+    min_time: float,
+    min_rounds: int,
+    max_rounds: int
+) -> Dict[str, Dict[str, Dict[str, Dict[str, float]]]]:
+    mcp = FastMCP(name="bench-suite")
+    registry = OperationRegistry(mcp, detail="full")
+    for module, class_name in OPERATIONS:
+        registry.register(import_component(module, class_name))
+
+    stream_id = None
+    if any(name in STREAM_OPERATIONS for name in operations):
+        stream_id = (await registry.execute("stream_open", {})).stream_id
+
+    results: Dict[str, Dict[str, Dict[str, Dict[str, float]]]] = {}
+    for name in operations:
+        operation = registry.get_operation(name)
+        adapter = input_adapter(operation.input_model)
+        wrapper = (await mcp.get_tool(name)).fn
+        results[name] = {}
+        for size in sizes:
+            arguments = CASES[name](size)
+            if name in STREAM_OPERATIONS:
+                arguments["stream_id"] = stream_id
+            try:
+                input_data = adapter.validate_python(arguments)
+            except ValidationError as e:
+                print(f"警告: {name}[{size}] 参数无效，已跳过: {e}", file=sys.stderr)
+                continue
+            check = await wrapper(**arguments)
+            if not check.success:
+                print(f"警告: {name}[{size}] 调用失败: {check.error_message}", file=sys.stderr)
+
+            layer_funcs = {
+                "validation": lambda: adapter.validate_python(arguments),
+                "execute": lambda: operation.execute(input_data),
+                "wrapper": lambda: wrapper(**arguments),
+            }
+            results[name][size] = {
+                layer: await measure(layer_funcs[layer], min_time, min_rounds, max_rounds)
+                for layer in layers
+            }
+            p50s = "  ".join(f"{layer} {results[name][size][layer]['p50'] * 1e6:12.1f} µs" for layer in layers)
+            print(f"{name:<20} {size:<7} {p50s}")
+    return results
+
+
+def compare(
+    results: Dict[str, Any],
+    baseline: Dict[str, Any],
+    threshold: float
+) -> List[str]:
+    """与基线比较p50，返回慢于基线超过threshold（比例）的项目"""
+    regressions = []
+    for name, by_size in results.items():
+        for size, by_layer in by_size.items():
+            for layer, stats in by_layer.items():
+                reference = baseline.get(name, {}).get(size, {}).get(layer)
+                if not reference or reference["p50"] <= 0:
+                    continue
+                ratio = stats["p50"] / reference["p50"]
+                if ratio > 1 + threshold:
+                    regressions.append(
+                        f"{name}[{size}] {layer}: p50 {reference['p50'] * 1e6:.1f} µs -> "
+                        f"{stats['p50'] * 1e6:.1f} µs (+{(ratio - 1) * 100:.0f}%)"
+                    )
+    return regressions
+
+
+def parse_list(value: Optional[str], choices, label: str) -> List[str]:
+    if not value:
+        return list(choices)
+    selected = [item.strip() for item in value.split(",") if item.strip()]
+    unknown = [item for item in selected if item not in choices]
+    if unknown:
+        raise SystemExit(f"未知的{label}: {', '.join(unknown)}")
+    return selected
+
+
+def main():
+    parser = argparse.ArgumentParser(description="运算微基准测试套件")
+    parser.add_argument("--output", type=Path, help="结果JSON的写入路径")
+    parser.add_argument("--baseline", type=Path, help="基线JSON路径，给出时与之比较")
+    parser.add_argument("--threshold", type=float, default=0.2, help="回归阈值，p50慢于基线的比例（默认0.2即20%%）")
+    parser.add_argument("--update-baseline", action="store_true", help="将本次结果写入--baseline指定的文件")
+    parser.add_argument("--operations", help="只测量这些运算（逗号分隔）")
+    parser.add_argument("--sizes", help=f"只测量这些规模（逗号分隔，可选 {','.join(SIZES)}）")
+    parser.add_argument("--layers", help=f"只测量这些层（逗号分隔，可选 {','.join(LAYERS)}）")
+    parser.add_argument("--min-time", type=float, default=0.2, help="每项测量的最短累计耗时（秒）")
+    parser.add_argument("--min-rounds", type=int, default=5, help="每项测量的最少次数")
+    parser.add_argument("--max-rounds", type=int, default=10_000, help="每项测量的最多次数")
+    args = parser.parse_args()
+
+    names = [import_component(module, class_name)().name for module, class_name in OPERATIONS]
+    for name in names:
+        if name not in CASES and name not in EXCLUDED:
+            print(f"警告: 运算 {name} 没有基准用例", file=sys.stderr)
+    operations = parse_list(args.operations, [name for name in names if name in CASES], "运算")
+    sizes = parse_list(args.sizes, SIZES, "规模")
+    layers = parse_list(args.layers, LAYERS, "层")
+    if args.threshold < 0:
+        raise SystemExit("--threshold 不能为负数")
+    if args.update_baseline and not args.baseline:
+        raise SystemExit("--update-baseline 需要同时给出 --baseline")
+
+    results = asyncio.run(run_suite(operations, sizes, layers, args.min_time, args.min_rounds, args.max_rounds))
+    report = {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "unit": "seconds",
+            "min_time": args.min_time,
+        },
+        "results": results,
+    }
+
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2, ensure_ascii=False), encoding="utf-8")
+        print(f"\n结果已写入 {args.output}")
+
+    if args.update_baseline:
+        args.baseline.write_text(json.dumps(report, indent=2, ensure_ascii=False), encoding="utf-8")
+        print(f"基线已更新: {args.baseline}")
+    elif args.baseline:
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))["results"]
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)}项慢于基线超过{args.threshold:.0%}:")
+            for line in regressions:
+                print(f"  {line}")
+            sys.exit(1)
+        print(f"\n没有慢于基线超过{args.threshold:.0%}的项目")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+大列表输入校验基准测试
+对比原先逐元素检查的字段校验器与单次校验路径在median和variance上的耗时，
+以及MCP工具调用时先由FastMCP按签名校验、再由注册器校验与只由注册器校验的耗时
+
+用法: uv run python benchmarks/bench_validation.py [--size N] [--repeat N]
+"""
+import argparse
+import asyncio
+import random
+import statistics
+import time
+from typing import List
+
+from fastmcp import FastMCP
+from fastmcp.tools import FunctionTool
+from pydantic import BaseModel, Field, field_validator
+
+from calculator_mcp.base.registry import OperationRegistry, input_adapter
+from calculator_mcp.operations.median import MedianInput, MedianOperation
+from calculator_mcp.operations.variance import VarianceInput, VarianceOperation
+
+
+class LegacyMedianInput(BaseModel):
+    """原先的中位数输入模型：字段校验器逐个检查元素类型"""
+    numbers: List[float] = Field(..., min_length=1)
+
+    @field_validator('numbers')
+    @classmethod
+    def validate_numbers(cls, v):
+        if len(v) == 0:
+            raise ValueError("数字列表不能为空")
+        for num in v:
+            if not isinstance(num, (int, float)):
+                raise ValueError(f"列表中包含非数字元素: {num}")
+        return v
+
+
+def measure(func, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples)
+
+
+def measure_async(coro_factory, repeat: int) -> float:
+    async def run():
+        samples = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            await coro_factory()
+            samples.append(time.perf_counter() - start)
+        return statistics.median(samples)
+    return asyncio.run(run())
+
+
+def report(label: str, seconds: float) -> None:
+    print(f"{label:<44} {seconds * 1000:10.2f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="大列表输入校验基准测试")
+    parser.add_argument("--size", type=int, default=1_000_000, help="输入列表长度")
+    parser.add_argument("--repeat", type=int, default=5, help="每项测量的重复次数")
+    args = parser.parse_args()
+
+    numbers = [random.uniform(-1000, 1000) for _ in range(args.size)]
+    median_args = {"numbers": numbers}
+    variance_args = {"numbers": numbers, "is_sample": True}
+
+    print(f"输入校验（{args.size}个元素）")
+    report("median 原逐元素字段校验器", measure(lambda: LegacyMedianInput(**median_args), args.repeat))
+    report("median 单次校验（预构建TypeAdapter）", measure(
+        lambda: input_adapter(MedianInput).validate_python(median_args), args.repeat))
+    report("variance 单次校验（预构建TypeAdapter）", measure(
+        lambda: input_adapter(VarianceInput).validate_python(variance_args), args.repeat))
+
+    mcp = FastMCP(name="bench-validation")
+    registry = OperationRegistry(mcp)
+    registry.register(MedianOperation)
+    registry.register(VarianceOperation)
+    # 只比较校验和执行，不把大列表交给执行后端
+    registry.offload = False
+
+    print(f"\n注册器调用（校验 + 执行，{args.size}个元素）")
+    report("median", measure_async(lambda: registry.execute("median", median_args), args.repeat))
+    report("variance", measure_async(lambda: registry.execute("variance", variance_args), args.repeat))
+
+    tool = asyncio.run(mcp.get_tool("median"))
+    # 与原先的注册方式相同的工具，FastMCP调用前先按签名校验参数
+    signature_tool = FunctionTool.from_function(tool.fn, description=tool.description)
+
+    print(f"\nMCP工具调用（median，{args.size}个元素）")
+    report("FastMCP按签名校验 + 注册器校验", measure_async(lambda: signature_tool.run(median_args), args.repeat))
+    report("只由注册器校验（OperationTool）", measure_async(lambda: tool.run(median_args), args.repeat))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,256 @@
+"""
+运算执行后端
+把计算量大的运算交给其他CPU核心：安装了Ray时作为Ray任务在本地Ray运行时或集群上执行，
+否则使用本机的进程池。两种后端接口相同，运算只需声明是否可以卸载以及卸载的输入规模阈值
+
+未达到卸载阈值、但运算认为输入CPU密集（cpu_bound）或输入规模达到线程阈值的调用在线程池中执行，
+不占用事件循环，其余小调用仍在事件循环中直接完成
+"""
+import asyncio
+import atexit
+import contextvars
+import importlib
+import logging
+import multiprocessing
+import os
+import threading
+from abc import ABC, abstractmethod
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from pydantic import BaseModel
+
+from .models import OperationResult
+from .operation import BaseOperation, detail_level
+
+logger = logging.getLogger(__name__)
+
+# 执行后端：auto(默认，安装了Ray时使用Ray，否则使用进程池)、ray 或 process
+EXECUTOR_ENV = "CALCULATOR_MCP_EXECUTOR"
+
+# 进程池的进程数，默认为CPU核数
+WORKERS_ENV = "CALCULATOR_MCP_WORKERS"
+
+# 设为0时注册器不卸载任何运算
+OFFLOAD_ENV = "CALCULATOR_MCP_OFFLOAD"
+
+# 输入规模达到该值时在线程池中执行，默认为THREAD_THRESHOLD
+THREAD_THRESHOLD_ENV = "CALCULATOR_MCP_THREAD_THRESHOLD"
+
+THREAD_THRESHOLD = 10_000
+
+# 连接的Ray集群地址，未设置时启动本地Ray运行时（与Ray自身的RAY_ADDRESS相同）
+RAY_ADDRESS_ENV = "RAY_ADDRESS"
+
+EXECUTOR_KINDS = ("auto", "ray", "process")
+
+
+class OperationExecutor(ABC):
+    """在其他进程中执行可序列化函数的后端"""
+
+    name: str = ""
+
+    @property
+    @abstractmethod
+    def workers(self) -> int:
+        """可并行执行的任务数，用于决定分块数量"""
+
+    @abstractmethod
+    async def submit(self, fn: Callable[..., Any], *args: Any) -> Any:
+        """执行fn(*args)并返回结果；fn必须是可按模块路径导入的函数，参数和返回值必须可序列化"""
+
+    async def map(self, fn: Callable[[Any], Any], items: Sequence[Any]) -> List[Any]:
+        """对每个元素并行执行fn，结果按输入顺序排列"""
+        return list(await asyncio.gather(*(self.submit(fn, item) for item in items)))
+
+    def shutdown(self) -> None:
+        """释放后端持有的进程或连接"""
+
+
+class ProcessExecutor(OperationExecutor):
+    """本机进程池，首次使用时创建，进程退出时关闭
+
+    进程池通常在线程池的工作线程中首次创建，此时进程已有多个线程，fork可能死锁，
+    因此工作进程由forkserver启动
+    """
+
+    name = "process"
+
+    def __init__(self, max_workers: Optional[int] = None):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    @property
+    def workers(self) -> int:
+        return self.max_workers
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context("forkserver")
+                )
+                atexit.register(self._pool.shutdown, cancel_futures=True)
+            return self._pool
+
+    async def submit(self, fn: Callable[..., Any], *args: Any) -> Any:
+        return await asyncio.get_running_loop().run_in_executor(self._get_pool(), fn, *args)
+
+    def shutdown(self) -> None:
+        with self._lock:
+            if self._pool is not None:
+                self._pool.shutdown(cancel_futures=True)
+                self._pool = None
+
+
+class RayExecutor(OperationExecutor):
+    """Ray任务，首次提交时连接address指定的集群或启动本地Ray运行时
+
+    未安装Ray时构造即抛出ImportError
+    """
+
+    name = "ray"
+
+    def __init__(self, address: Optional[str] = None):
+        self._ray = importlib.import_module("ray")
+        self.address = address
+        self._remote_functions: Dict[Callable[..., Any], Any] = {}
+        self._lock = threading.Lock()
+
+    def _ensure_initialized(self) -> None:
+        with self._lock:
+            if not self._ray.is_initialized():
+                self._ray.init(address=self.address, ignore_reinit_error=True, log_to_driver=False)
+
+    @property
+    def workers(self) -> int:
+        self._ensure_initialized()
+        return max(1, int(self._ray.cluster_resources().get("CPU", 1)))
+
+    def _remote(self, fn: Callable[..., Any]) -> Any:
+        with self._lock:
+            remote = self._remote_functions.get(fn)
+            if remote is None:
+                remote = self._remote_functions[fn] = self._ray.remote(fn)
+            return remote
+
+    async def submit(self, fn: Callable[..., Any], *args: Any) -> Any:
+        self._ensure_initialized()
+        # ObjectRef可以直接在asyncio中等待
+        return await self._remote(fn).remote(*args)
+
+    def shutdown(self) -> None:
+        if self._ray.is_initialized():
+            self._ray.shutdown()
+
+
+def create_executor(kind: Optional[str] = None) -> OperationExecutor:
+    """创建执行后端，kind默认读取CALCULATOR_MCP_EXECUTOR；请求Ray但未安装时回退到进程池"""
+    kind = (kind or os.environ.get(EXECUTOR_ENV) or "auto").strip().lower()
+    if kind not in EXECUTOR_KINDS:
+        raise ValueError(f"执行后端必须是 {'、'.join(EXECUTOR_KINDS)} 之一，当前为: {kind}")
+    if kind != "process":
+        try:
+            return RayExecutor(os.environ.get(RAY_ADDRESS_ENV))
+        except ImportError:
+            if kind == "ray":
+                logger.warning("未安装Ray，改用本机进程池执行")
+    workers = os.environ.get(WORKERS_ENV)
+    return ProcessExecutor(int(workers) if workers else None)
+
+
+_executor: Optional[OperationExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def get_executor() -> OperationExecutor:
+    """进程内共享的执行后端，首次使用时按环境变量创建"""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = create_executor()
+        return _executor
+
+
+def set_executor(executor: Optional[OperationExecutor]) -> None:
+    """替换共享的执行后端（None表示下次使用时重新创建），原后端会被关闭"""
+    global _executor
+    with _executor_lock:
+        previous, _executor = _executor, executor
+    if previous is not None and previous is not executor:
+        previous.shutdown()
+
+
+def offload_enabled() -> bool:
+    return os.environ.get(OFFLOAD_ENV, "1").strip() != "0"
+
+
+# 注册器为当前调用设置的 (执行后端, 是否卸载)，未设置时按环境变量使用共享后端
+_call_executor: ContextVar[Tuple[Optional[OperationExecutor], Optional[bool]]] = ContextVar(
+    "calculator_mcp_call_executor", default=(None, None)
+)
+
+
+@contextmanager
+def call_executor(executor: Optional[OperationExecutor], enabled: bool) -> Iterator[None]:
+    """在当前上下文中设置运算内部可用的执行后端，executor为None时使用共享后端"""
+    token = _call_executor.set((executor, enabled))
+    try:
+        yield
+    finally:
+        _call_executor.reset(token)
+
+
+def current_executor() -> Optional[OperationExecutor]:
+    """运算内部分块并行时使用的执行后端，不允许卸载时返回None"""
+    executor, enabled = _call_executor.get()
+    if enabled is None:
+        enabled = offload_enabled()
+    if not enabled:
+        return None
+    return executor or get_executor()
+
+
+def thread_threshold() -> int:
+    value = os.environ.get(THREAD_THRESHOLD_ENV)
+    return int(value) if value else THREAD_THRESHOLD
+
+
+_thread_pool: Optional[ThreadPoolExecutor] = None
+_thread_local = threading.local()
+
+
+def get_thread_pool() -> ThreadPoolExecutor:
+    """进程内共享的线程池，首次使用时创建"""
+    global _thread_pool
+    with _executor_lock:
+        if _thread_pool is None:
+            _thread_pool = ThreadPoolExecutor(thread_name_prefix="calculator-mcp")
+        return _thread_pool
+
+
+def _run_coroutine(execute: Callable[[BaseModel], Any], input_data: BaseModel) -> OperationResult:
+    # 每个工作线程复用自己的事件循环，避免每次调用都创建新循环
+    loop = getattr(_thread_local, "loop", None)
+    if loop is None:
+        loop = _thread_local.loop = asyncio.new_event_loop()
+    return loop.run_until_complete(execute(input_data))
+
+
+async def run_in_thread(operation: BaseOperation, input_data: BaseModel) -> OperationResult:
+    """在线程池中执行运算，当前上下文（元数据详细程度等）随调用传入工作线程"""
+    context = contextvars.copy_context()
+    return await asyncio.get_running_loop().run_in_executor(
+        get_thread_pool(), context.run, _run_coroutine, operation.execute, input_data
+    )
+
+
+def run_operation(module: str, class_name: str, input_data: BaseModel, detail: str) -> OperationResult:
+    """在工作进程中执行一次运算：按模块路径导入运算类，在detail指定的元数据详细程度下执行"""
+    operation = getattr(importlib.import_module(module), class_name)()
+    with detail_level(detail):
+        return asyncio.run(operation.execute(input_data))
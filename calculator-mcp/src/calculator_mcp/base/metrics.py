@@ -0,0 +1,258 @@
+"""
+工具调用指标
+按工具（及Prompt）统计调用次数、失败次数、输入规模和分阶段延迟直方图
+
+阶段为validation(参数校验)、execution(执行运算)和result(结果处理)，另有total为整次调用；
+数据可导出为JSON快照（metrics:// 资源）或Prometheus文本格式文件
+"""
+import asyncio
+import logging
+import math
+import os
+import threading
+import time
+from bisect import bisect_left
+from pathlib import Path
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+# 设为0时不记录指标
+METRICS_ENV = "CALCULATOR_MCP_METRICS"
+
+# Prometheus文本格式指标文件的写入路径，未设置时不写文件
+METRICS_FILE_ENV = "CALCULATOR_MCP_METRICS_FILE"
+
+# 指标文件的最短写入间隔（秒）
+METRICS_INTERVAL_ENV = "CALCULATOR_MCP_METRICS_INTERVAL"
+
+# 调用耗时的阶段
+PHASES = ("validation", "execution", "result", "total")
+
+# 延迟直方图的桶上界（秒）
+LATENCY_BUCKETS = (
+    0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01,
+    0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0
+)
+
+# 输入规模直方图的桶上界（数值个数）
+SIZE_BUCKETS = (1, 10, 100, 1_000, 10_000, 100_000, 1_000_000)
+
+# Prometheus指标名前缀
+PROMETHEUS_PREFIX = "calculator_mcp"
+
+
+def input_size(arguments: Mapping[str, Any]) -> int:
+    """输入规模：列表参数计其长度，其余参数各计1"""
+    return sum(
+        len(value) if isinstance(value, (list, tuple)) else 1
+        for value in arguments.values()
+    )
+
+
+class Histogram:
+    """固定桶的直方图，counts[i]为落入第i个桶（最后一个为+Inf）的次数"""
+
+    def __init__(self, bounds: Sequence[float]):
+        self.bounds = tuple(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        # 第一个不小于value的上界所在的桶
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def cumulative(self) -> List[Tuple[str, int]]:
+        """Prometheus风格的累计桶：(le, 小于等于上界的次数)"""
+        buckets = []
+        total = 0
+        for bound, count in zip(self.bounds, self.counts):
+            total += count
+            buckets.append((_format_bound(bound), total))
+        buckets.append(("+Inf", self.count))
+        return buckets
+
+    def quantile(self, q: float) -> Optional[float]:
+        """由桶计数线性插值估算分位数，与Prometheus的histogram_quantile相同；落在+Inf桶时返回最大有限上界"""
+        if self.count == 0:
+            return None
+        rank = q * self.count
+        total = 0
+        for i, count in enumerate(self.counts[:-1]):
+            if count and total + count >= rank:
+                lower = self.bounds[i - 1] if i > 0 else 0.0
+                return lower + (self.bounds[i] - lower) * (rank - total) / count
+            total += count
+        return self.bounds[-1]
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "sum": self.sum,
+            "p50": self.quantile(0.5),
+            "p95": self.quantile(0.95),
+            "p99": self.quantile(0.99),
+            "buckets": dict(self.cumulative()),
+        }
+
+
+def _format_bound(bound: float) -> str:
+    return str(int(bound)) if float(bound).is_integer() else repr(float(bound))
+
+
+class _ToolStats:
+    """单个工具或Prompt的指标"""
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.input_size = Histogram(SIZE_BUCKETS)
+        self.latency = {phase: Histogram(LATENCY_BUCKETS) for phase in PHASES}
+
+
+class Metrics:
+    """所有工具和Prompt的调用指标
+
+    kind区分tool和prompt。path给出时，记录调用后若距上次写入已超过interval秒，
+    就以Prometheus文本格式重写该文件（先写临时文件再替换，读取方不会读到半个文件）；
+    在事件循环中记录时文件在线程中写入，写入失败只记录日志，不影响调用结果
+    """
+
+    def __init__(self, path: Optional[Path] = None, interval: float = 10.0):
+        self.path = Path(path) if path else None
+        self.interval = interval
+        self._stats: Dict[Tuple[str, str], _ToolStats] = {}
+        self._lock = threading.Lock()
+        self._last_write = 0.0
+        # 同一时间只有一个线程写指标文件
+        self._write_lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls) -> Optional["Metrics"]:
+        """根据环境变量创建指标，CALCULATOR_MCP_METRICS为0时不记录"""
+        if os.environ.get(METRICS_ENV, "1").strip() == "0":
+            return None
+        path = os.environ.get(METRICS_FILE_ENV)
+        interval = os.environ.get(METRICS_INTERVAL_ENV)
+        return cls(path=Path(path) if path else None, interval=float(interval) if interval else 10.0)
+
+    def record(
+        self,
+        kind: str,
+        name: str,
+        phases: Mapping[str, float],
+        size: int,
+        error: bool
+    ) -> None:
+        """记录一次调用：phases为各阶段耗时（秒），未经历的阶段不记录"""
+        with self._lock:
+            stats = self._stats.get((kind, name))
+            if stats is None:
+                stats = self._stats[(kind, name)] = _ToolStats()
+            stats.calls += 1
+            if error:
+                stats.errors += 1
+            stats.input_size.observe(size)
+            for phase, seconds in phases.items():
+                stats.latency[phase].observe(seconds)
+            write = self.path is not None and time.monotonic() - self._last_write >= self.interval
+            if write:
+                self._last_write = time.monotonic()
+        if write:
+            try:
+                loop = asyncio.get_running_loop()
+            except RuntimeError:
+                self._export()
+            else:
+                loop.run_in_executor(None, self._export)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """全部指标的JSON快照，按 tools / prompts 分组"""
+        with self._lock:
+            groups: Dict[str, Dict[str, Any]] = {"tools": {}, "prompts": {}}
+            for (kind, name), stats in sorted(self._stats.items()):
+                groups[f"{kind}s"][name] = {
+                    "calls": stats.calls,
+                    "errors": stats.errors,
+                    "input_size": stats.input_size.snapshot(),
+                    "latency": {
+                        phase: histogram.snapshot()
+                        for phase, histogram in stats.latency.items()
+                        if histogram.count
+                    },
+                }
+            return groups
+
+    def to_prometheus(self) -> str:
+        """Prometheus文本格式（0.0.4）"""
+        with self._lock:
+            items = sorted(self._stats.items())
+            lines = []
+
+            def header(metric: str, kind: str, text: str) -> str:
+                lines.append(f"# HELP {PROMETHEUS_PREFIX}_{metric} {text}")
+                lines.append(f"# TYPE {PROMETHEUS_PREFIX}_{metric} {kind}")
+                return f"{PROMETHEUS_PREFIX}_{metric}"
+
+            metric = header("calls_total", "counter", "调用次数")
+            for (kind, name), stats in items:
+                lines.append(f"{metric}{_labels(kind=kind, name=name)} {stats.calls}")
+
+            metric = header("errors_total", "counter", "失败的调用次数")
+            for (kind, name), stats in items:
+                lines.append(f"{metric}{_labels(kind=kind, name=name)} {stats.errors}")
+
+            metric = header("input_size", "histogram", "每次调用的输入数值个数")
+            for (kind, name), stats in items:
+                _histogram_lines(lines, metric, stats.input_size, kind=kind, name=name)
+
+            metric = header("latency_seconds", "histogram", "各阶段耗时（秒）")
+            for (kind, name), stats in items:
+                for phase, histogram in stats.latency.items():
+                    if histogram.count:
+                        _histogram_lines(lines, metric, histogram, kind=kind, name=name, phase=phase)
+            return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path: Optional[Path] = None) -> None:
+        """将Prometheus文本格式写入path（默认为创建时指定的文件）"""
+        path = Path(path) if path else self.path
+        if path is None:
+            raise ValueError("没有指定指标文件路径")
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temporary = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        temporary.write_text(self.to_prometheus(), encoding="utf-8")
+        os.replace(temporary, path)
+
+    def _export(self) -> None:
+        """定期写入指标文件，失败时记录日志"""
+        with self._write_lock:
+            try:
+                self.write_prometheus()
+            except OSError as e:
+                logger.warning("写入指标文件%s失败: %s", self.path, e)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stats.clear()
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(**labels: str) -> str:
+    return "{" + ",".join(f'{key}="{_escape(str(value))}"' for key, value in labels.items()) + "}"
+
+
+def _histogram_lines(lines: List[str], metric: str, histogram: Histogram, **labels: str) -> None:
+    for bound, count in histogram.cumulative():
+        lines.append(f"{metric}_bucket{_labels(**labels, le=bound)} {count}")
+    lines.append(f"{metric}_sum{_labels(**labels)} {_format_value(histogram.sum)}")
+    lines.append(f"{metric}_count{_labels(**labels)} {histogram.count}")
+
+
+def _format_value(value: float) -> str:
+    return repr(float(value)) if math.isfinite(value) else str(value)
@@ -2,8 +2,12 @@
 数据模型定义
 定义所有输入输出模型和错误类型
 """
-from pydantic import BaseModel, Field
-from typing import Optional, List, Dict, Any
+from pydantic import BaseModel, Field, SerializeAsAny
+from typing import Optional, List, Dict, Any, Literal
+
+
+# 结果元数据详细程度：none不返回元数据，summary只返回固定大小的摘要，full返回全部元数据
+DetailLevel = Literal["none", "summary", "full"]
 
 
 class BinaryOperationInput(BaseModel):
@@ -28,6 +32,11 @@ class AverageInput(BaseModel):
     values: List[float] = Field(..., description="数值列表", min_length=1)
 
 
+class ArrayInput(BaseModel):
+    """数组运算输入模型"""
+    values: List[float] = Field(..., description="输入数值数组", min_length=1)
+
+
 class OperationResult(BaseModel):
     """运算结果模型"""
     success: bool = Field(..., description="运算是否成功")
@@ -37,6 +46,103 @@ class OperationResult(BaseModel):
     metadata: Optional[Dict[str, Any]] = Field(None, description="额外元数据")
 
 
+class ArrayOperationResult(OperationResult):
+    """数组运算结果模型"""
+    results: Optional[List[float]] = Field(None, description="与输入顺序一致的逐元素运算结果")
+
+
+class ExactIntegerResult(OperationResult):
+    """精确整数结果模型"""
+    exact: Optional[str] = Field(None, description="精确整数结果的十进制字符串")
+    resource_uri: Optional[str] = Field(None, description="结果过长时用于读取完整十进制字符串的资源URI")
+
+
+class MagnitudeResult(OperationResult):
+    """数量级结果模型：结果 ≈ mantissa × 10^exponent"""
+    digit_count: Optional[int] = Field(None, description="结果的十进制位数")
+    mantissa: Optional[float] = Field(None, description="科学计数法的尾数，1 ≤ mantissa < 10")
+    exponent: Optional[int] = Field(None, description="科学计数法的指数")
+
+
+class MagnitudeArrayResult(ArrayOperationResult):
+    """数组数量级结果模型，results为逐元素的log10"""
+    digit_counts: Optional[List[int]] = Field(None, description="逐元素的十进制位数")
+    mantissas: Optional[List[float]] = Field(None, description="逐元素科学计数法的尾数")
+    exponents: Optional[List[int]] = Field(None, description="逐元素科学计数法的指数")
+
+
+class FactorizationResult(OperationResult):
+    """质因数分解结果模型"""
+    factors: Optional[List[List[int]]] = Field(None, description="按质数升序排列的 [质数, 指数] 列表")
+
+
+class PrimeListResult(OperationResult):
+    """质数列表结果模型"""
+    primes: Optional[List[int]] = Field(None, description="按升序排列的质数")
+
+
+class StreamResult(OperationResult):
+    """流式统计运算结果模型"""
+    stream_id: Optional[str] = Field(None, description="数据流ID")
+
+
+class BatchOperationItem(BaseModel):
+    """批量执行中的单个运算"""
+    operation: str = Field(..., description="运算名称，如 multiply、add")
+    arguments: Dict[str, Any] = Field(default_factory=dict, description="运算参数，与对应工具的参数一致")
+    detail: Optional[DetailLevel] = Field(None, description="该运算结果的元数据详细程度，默认与批量调用一致")
+
+
+class BatchExecuteInput(BaseModel):
+    """批量执行输入模型"""
+    operations: List[BatchOperationItem] = Field(
+        ...,
+        description="按顺序执行的运算列表",
+        min_length=1,
+        max_length=1000
+    )
+
+
+class BatchResult(BaseModel):
+    """批量执行结果模型"""
+    success: bool = Field(..., description="所有运算是否都成功")
+    # 按各结果的实际类型序列化，保留exact、factors、primes等子类字段
+    results: List[SerializeAsAny[OperationResult]] = Field(default_factory=list, description="与输入顺序一致的运算结果")
+    succeeded: int = Field(0, description="成功的运算数量")
+    failed: int = Field(0, description="失败的运算数量")
+    error_message: Optional[str] = Field(None, description="整体错误信息")
+
+
+class ExpressionStep(BaseModel):
+    """表达式求值中的一个运算节点"""
+    expression: str = Field(..., description="该节点对应的表达式片段")
+    operation: str = Field(..., description="执行的运算名称")
+    arguments: Dict[str, Any] = Field(..., description="运算参数")
+    result: float = Field(..., description="该节点的值")
+
+
+class ExpressionResult(BaseModel):
+    """表达式求值结果模型"""
+    success: bool = Field(..., description="求值是否成功")
+    expression: str = Field(..., description="输入的表达式")
+    result: Optional[float] = Field(None, description="表达式的值")
+    operation_count: int = Field(0, description="执行的运算数量")
+    trace: Optional[List[ExpressionStep]] = Field(None, description="按执行顺序排列的每个运算节点")
+    error_message: Optional[str] = Field(None, description="错误信息")
+
+
+class ExpressionArrayResult(BaseModel):
+    """表达式整列求值结果模型"""
+    success: bool = Field(..., description="求值是否成功")
+    expression: str = Field(..., description="输入的表达式")
+    results: Optional[List[float]] = Field(None, description="逐行的表达式值")
+    count: int = Field(0, description="行数")
+    variables: Optional[List[str]] = Field(None, description="表达式中出现的变量")
+    compiled_from_cache: bool = Field(False, description="是否复用了缓存的编译结果")
+    error_message: Optional[str] = Field(None, description="错误信息")
+    invalid_rows: Optional[List[int]] = Field(None, description="超出运算定义域的行索引")
+
+
 class PromptResult(BaseModel):
     """Prompt结果模型"""
     success: bool = Field(..., description="生成是否成功")
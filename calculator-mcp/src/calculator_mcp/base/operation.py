@@ -3,14 +3,70 @@
 定义所有数学运算的统一接口
 """
 from abc import ABC, abstractmethod
-from typing import Any, Type
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Iterator, Type, get_args
 from pydantic import BaseModel
-from .models import OperationResult
+from .models import OperationResult, DetailLevel
+from .metrics import input_size
+
+# 可选的元数据详细程度
+DETAIL_LEVELS = get_args(DetailLevel)
+
+# 当前调用的元数据详细程度，由注册器在每次调用时设置
+_detail_level: ContextVar[str] = ContextVar("detail_level", default="full")
+
+
+@contextmanager
+def detail_level(level: str) -> Iterator[None]:
+    """在当前上下文中设置元数据详细程度"""
+    if level not in DETAIL_LEVELS:
+        raise ValueError(f"detail必须是 {'、'.join(DETAIL_LEVELS)} 之一")
+    token = _detail_level.set(level)
+    try:
+        yield
+    finally:
+        _detail_level.reset(token)
 
 
 class BaseOperation(ABC):
     """所有数学运算的基类"""
     
+    @property
+    def detail(self) -> str:
+        """当前调用的元数据详细程度，运算据此跳过不会返回的元数据计算"""
+        return _detail_level.get()
+    
+    @property
+    def cacheable(self) -> bool:
+        """结果是否只取决于输入，有状态的运算应返回False，不进入结果缓存"""
+        return True
+    
+    def cpu_bound(self, input_data: BaseModel) -> bool:
+        """对该输入执行时是否可能长时间占用CPU，为True时注册器在线程池中执行，不阻塞事件循环
+
+        用于耗时不随列表长度变化的输入（如大整数分解）；列表较长的输入由线程阈值统一处理
+        """
+        return False
+    
+    @property
+    def offloadable(self) -> bool:
+        """输入足够大时是否可交给执行后端在其他进程中执行，运算类和输入必须可序列化"""
+        return False
+    
+    @property
+    def offload_threshold(self) -> int:
+        """输入规模达到该值时卸载执行"""
+        return 0
+    
+    def offload_size(self, input_data: BaseModel) -> int:
+        """决定是否卸载的输入规模，默认与调用指标相同：列表参数计其长度，其余参数各计1"""
+        return input_size(dict(input_data))
+    
+    def should_offload(self, input_data: BaseModel) -> bool:
+        """本次调用是否交给执行后端"""
+        return self.offloadable and self.offload_size(input_data) >= self.offload_threshold
+    
     @property
     @abstractmethod
     def name(self) -> str:
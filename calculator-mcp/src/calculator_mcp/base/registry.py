@@ -2,89 +2,364 @@
 运算工具注册器
 负责将运算操作注册为MCP工具
 """
-from typing import Dict, Type, List
-from .operation import BaseOperation
-from .models import OperationResult
+import asyncio
+import importlib
+import inspect
+import os
+import time
+from functools import lru_cache
+from typing import Any, Awaitable, Callable, Dict, Type, List, Optional, Union
+from pydantic import BaseModel, TypeAdapter, ValidationError
+from .operation import BaseOperation, DETAIL_LEVELS, detail_level
+from .executor import (
+    OperationExecutor,
+    call_executor,
+    get_executor,
+    get_thread_pool,
+    offload_enabled,
+    run_in_thread,
+    run_operation,
+    thread_threshold,
+)
+from .metrics import Metrics, input_size
+from .result_cache import ResultCache
+from .tracing import Tracer
+from .models import OperationResult, BatchOperationItem, BatchExecuteInput, BatchResult, DetailLevel, ExpressionResult, ExpressionArrayResult
+from .signature import build_signature, build_tool_function, signature_from_parameters, with_detail_parameter
 from fastmcp import FastMCP
+from fastmcp.tools import FunctionTool
+
+# 服务器默认元数据详细程度的环境变量
+DETAIL_ENV = "CALCULATOR_MCP_DETAIL"
+
+
+@lru_cache(maxsize=None)
+def input_adapter(input_model: Type[BaseModel]) -> TypeAdapter:
+    """输入模型的校验器（按模型缓存，避免每次调用重新构建）"""
+    return TypeAdapter(input_model)
+
+
+class OperationTool(FunctionTool):
+    """运算工具
+
+    输入schema仍由生成的签名决定；执行时仍走FastMCP的run（依赖注入、函数体错误转换、超时等），
+    但执行的函数只接收任意关键字参数，FastMCP不再按签名校验，
+    参数原样交给注册器，由输入模型的校验器完成唯一一次校验（detail参数由detail_level检查）
+    """
+
+    @classmethod
+    def from_tool_function(cls, tool_function: Callable[..., Awaitable[Any]], description: str) -> "OperationTool":
+        """以tool_function的签名生成schema，执行时调用不带签名的同一函数"""
+
+        async def call(**arguments: Any) -> Any:
+            return await tool_function(**arguments)
+
+        tool = cls.from_function(tool_function, description=description)
+        return tool.model_copy(update={"fn": call})
 
 
 class OperationRegistry:
     """运算工具注册器"""
     
-    def __init__(self, mcp_server: FastMCP):
+    def __init__(
+        self,
+        mcp_server: FastMCP,
+        detail: Optional[str] = None,
+        result_cache: Optional[ResultCache] = None,
+        metrics: Optional[Metrics] = None,
+        tracer: Optional[Tracer] = None,
+        executor: Optional[OperationExecutor] = None
+    ):
         self.mcp_server = mcp_server
+        # 未单独指定detail的调用使用的元数据详细程度
+        self.detail = detail or os.environ.get(DETAIL_ENV) or "full"
+        if self.detail not in DETAIL_LEVELS:
+            raise ValueError(f"detail必须是 {'、'.join(DETAIL_LEVELS)} 之一，当前为: {self.detail}")
         self.operations: Dict[str, BaseOperation] = {}
+        # 可选的结果缓存，为None时每次调用都重新计算
+        self.result_cache = result_cache
+        # 可选的调用指标，为None时不记录
+        self.metrics = metrics
+        # 可选的调用追踪，为None时不生成span
+        self.tracer = tracer
+        # 可卸载运算及运算内部分块并行使用的执行后端，为None时使用进程内共享的后端
+        self.executor = executor
+        # CALCULATOR_MCP_OFFLOAD为0时所有运算都在事件循环中执行
+        self.offload = offload_enabled()
+        # 输入规模达到该值的运算在线程池中执行
+        self.thread_threshold = thread_threshold()
+        # 已注册但尚未导入的运算清单条目
+        self._pending: Dict[str, Dict[str, Any]] = {}
     
     def register(self, operation_class: Type[BaseOperation]) -> None:
         """注册一个运算操作"""
         operation = operation_class()
         self.operations[operation.name] = operation
         
-        # 获取输入模型的字段信息
-        input_model = operation.input_model
+        # 根据输入模型字段生成工具签名（按模型缓存，不再逐个exec编译）
+        self._register_tool(operation.name, operation.description, build_signature(operation.input_model))
+    
+    def register_entry(self, entry: Dict[str, Any]) -> None:
+        """根据清单条目注册运算，运算模块在首次调用时才导入"""
+        self._pending[entry["name"]] = entry
+        self._register_tool(entry["name"], entry["description"], signature_from_parameters(entry["parameters"]))
+    
+    def _register_tool(self, name: str, description: str, signature: inspect.Signature) -> None:
+        """以给定签名注册MCP工具，并追加可选的detail参数"""
+        
+        async def handler(kwargs: Dict[str, Any]) -> OperationResult:
+            detail = kwargs.pop("detail", None)
+            if self.metrics is None and self.tracer is None:
+                return await self._invoke(self.get_operation(name), kwargs, detail)
+            started = time.perf_counter()
+            phases: Dict[str, float] = {}
+            result = await self._invoke(self.get_operation(name), kwargs, detail, phases)
+            self._record(name, kwargs, result, started, phases)
+            return result
+        
+        tool_function = build_tool_function(name, with_detail_parameter(signature), handler)
         
-        # 使用 exec 动态创建具有明确参数的工具函数
-        def create_tool_function():
-            # 获取模型字段信息
-            fields = input_model.model_fields
-            field_names = list(fields.keys())
-            
-            # 创建参数列表
-            params = []
-            for field_name, field_info in fields.items():
-                # 获取类型注解
-                field_type = field_info.annotation
-                if hasattr(field_type, '__name__'):
-                    type_name = field_type.__name__
+        # 注册为MCP工具，参数只在_invoke中校验一次
+        self.mcp_server.add_tool(OperationTool.from_tool_function(tool_function, description))
+    
+    async def _invoke(
+        self,
+        operation: BaseOperation,
+        arguments: Union[Dict[str, Any], BaseModel],
+        detail: Optional[DetailLevel] = None,
+        phases: Optional[Dict[str, float]] = None
+    ) -> OperationResult:
+        """校验参数并执行运算，任何异常都转换为失败结果
+
+        每次调用只校验一次：运算工具的参数不经FastMCP校验（见OperationTool），
+        已是输入模型实例的参数直接使用，否则通过预先构建的校验器完成全部类型和字段校验。
+        运算在detail指定的元数据详细程度下执行（默认使用注册器设置），
+        detail为none时丢弃运算返回的全部元数据。
+        启用结果缓存时，可缓存运算的成功结果按输入和detail缓存。
+        输入规模达到阈值的可卸载运算交给执行后端，在其他进程中执行，
+        运算内部的分块并行也使用该后端（见executor.current_executor）；
+        CPU密集或输入规模达到线程阈值的无状态运算在线程池中执行，不阻塞事件循环。
+        phases给出时写入validation、execution（含缓存查找）和result各阶段的耗时（秒），
+        校验失败时只有validation
+        """
+        phases = {} if phases is None else phases
+        try:
+            level = detail or self.detail
+            with detail_level(level), call_executor(self.executor, self.offload):
+                started = time.perf_counter()
+                try:
+                    if isinstance(arguments, operation.input_model):
+                        input_data = arguments
+                    else:
+                        input_data = input_adapter(operation.input_model).validate_python(arguments)
+                finally:
+                    validated = time.perf_counter()
+                    phases["validation"] = validated - started
+                
+                cache_key = None
+                if self.result_cache is not None and operation.cacheable:
+                    cache_key = self.result_cache.key(operation.name, input_data, level)
+                    cached = self.result_cache.get(cache_key)
+                    if cached is not None:
+                        phases["execution"] = time.perf_counter() - validated
+                        return cached
+                
+                if self.offload and operation.should_offload(input_data):
+                    result = await self._offload(operation, input_data, level)
+                elif self.offload and self._runs_in_thread(operation, input_data):
+                    result = await run_in_thread(operation, input_data)
                 else:
-                    type_name = str(field_type)
-                params.append(f"{field_name}: {type_name}")
-            
-            params_str = ', '.join(params)
-            kwargs_str = ', '.join(f"'{name}': {name}" for name in field_names)
-            
-            # 动态创建函数代码
-            func_code = f"""
-async def operation_tool({params_str}):
-    try:
-        kwargs = {{{kwargs_str}}}
-        input_data = input_model(**kwargs)
-        return await operation.execute(input_data)
-    except Exception as e:
-        return OperationResult(
-            success=False,
-            error_message=str(e),
-            operation_name=operation.name
+                    result = await operation.execute(input_data)
+            executed = time.perf_counter()
+            phases["execution"] = executed - validated
+            if level == "none":
+                result.metadata = None
+            if cache_key is not None and result.success:
+                self.result_cache.put(cache_key, operation.name, result)
+            phases["result"] = time.perf_counter() - executed
+            return result
+        except Exception as e:
+            return OperationResult(
+                success=False,
+                error_message=str(e),
+                operation_name=operation.name
+            )
+    
+    def _runs_in_thread(self, operation: BaseOperation, input_data: BaseModel) -> bool:
+        """是否在线程池中执行：运算认为该输入CPU密集，或输入规模达到线程阈值；有状态的运算（不可缓存）始终留在事件循环中，保证同一数据流的调用依次执行"""
+        return operation.cacheable and (
+            operation.cpu_bound(input_data) or operation.offload_size(input_data) >= self.thread_threshold
         )
-"""
-            
-            # 执行代码创建函数
-            local_vars = {
-                'input_model': input_model,
-                'operation': operation,
-                'OperationResult': OperationResult,
-                'List': List
-            }
-            global_vars = {
-                'input_model': input_model,
-                'operation': operation,
-                'OperationResult': OperationResult,
-                'List': List
-            }
-            exec(func_code, global_vars, local_vars)
-            operation_tool = local_vars['operation_tool']
-            operation_tool.__name__ = operation.name
-            return operation_tool
+    
+    async def _offload(self, operation: BaseOperation, input_data: BaseModel, level: str) -> OperationResult:
+        """在执行后端的工作进程中执行运算，工作进程按模块路径重新创建运算实例"""
+        executor = self.executor or get_executor()
+        operation_class = type(operation)
+        return await executor.submit(
+            run_operation, operation_class.__module__, operation_class.__qualname__, input_data, level
+        )
+    
+    def _record(
+        self,
+        name: str,
+        arguments: Dict[str, Any],
+        result: Union[OperationResult, BatchResult, ExpressionResult, ExpressionArrayResult],
+        started: float,
+        phases: Optional[Dict[str, float]] = None
+    ) -> None:
+        """记录一次工具调用的指标和span，total为从started起的整次耗时"""
+        if self.metrics is None and self.tracer is None:
+            return
+        phases = dict(phases or {})
+        size = input_size(arguments)
+        if self.tracer is not None:
+            error = None if result.success else result.error_message or "调用失败"
+            self.tracer.record_call("tool", name, started, phases, size, error)
+        if self.metrics is not None:
+            phases["total"] = time.perf_counter() - started
+            self.metrics.record("tool", name, phases, size, not result.success)
+    
+    async def execute(
+        self,
+        name: str,
+        arguments: Union[Dict[str, Any], BaseModel],
+        detail: Optional[DetailLevel] = None
+    ) -> OperationResult:
+        """按名称执行一个已注册的运算"""
+        operation = self.get_operation(name)
+        if operation is None:
+            return OperationResult(
+                success=False,
+                error_message=f"未知运算: {name}",
+                operation_name=name
+            )
+        
+        return await self._invoke(operation, arguments, detail)
+    
+    async def execute_batch(
+        self,
+        items: List[BatchOperationItem],
+        detail: Optional[DetailLevel] = None
+    ) -> BatchResult:
+        """执行一批运算，结果与输入顺序一致，单个运算失败不影响其余运算
+
+        相邻的无状态运算并发执行（在线程池或执行后端中执行的运算因此可以重叠），
+        有状态的运算（如数据流）等之前的运算全部完成后按顺序单独执行。
+        detail为整批的元数据详细程度，单个运算可通过自身的detail覆盖
+        """
+        results: List[OperationResult] = []
+        concurrent = []
+        for item in items:
+            operation = self.get_operation(item.operation)
+            call = self.execute(item.operation, item.arguments, item.detail or detail)
+            if operation is None or operation.cacheable:
+                concurrent.append(call)
+            else:
+                results.extend(await asyncio.gather(*concurrent))
+                concurrent = []
+                results.append(await call)
+        results.extend(await asyncio.gather(*concurrent))
+        failed = sum(1 for result in results if not result.success)
+        
+        return BatchResult(
+            success=failed == 0,
+            results=results,
+            succeeded=len(results) - failed,
+            failed=failed
+        )
+    
+    def register_batch_tool(self) -> None:
+        """注册批量执行工具，一次调用执行多个运算"""
+        
+        async def batch_execute(operations: List[BatchOperationItem], detail: Optional[DetailLevel] = None):
+            started = time.perf_counter()
+            try:
+                input_data = BatchExecuteInput(operations=operations)
+            except ValidationError as e:
+                result = BatchResult(success=False, error_message=str(e))
+            else:
+                result = await self.execute_batch(input_data.operations, detail)
+            self._record("batch_execute", {"operations": operations}, result, started)
+            return result
+        
+        self.mcp_server.tool(
+            description=(
+                "批量执行多个运算：operations为 {operation, arguments, detail} 列表，无状态运算并发执行，有状态运算按顺序执行，"
+                "返回与输入顺序一致的运算结果，单个运算失败不影响其余运算；"
+                "detail为结果元数据详细程度(none/summary/full)"
+            )
+        )(batch_execute)
+    
+    async def evaluate(self, expression: str, trace: bool = False) -> ExpressionResult:
+        """解析并求值算术表达式，每个运算节点通过对应的已注册运算执行
+
+        节点运算的元数据不会返回，因此以detail=none执行
+        """
+        # 表达式模块只在首次求值时导入
+        from ..expression import evaluate_expression
+        
+        async def execute(name: str, arguments: Dict[str, Any]) -> OperationResult:
+            return await self.execute(name, arguments, "none")
+        
+        return await evaluate_expression(expression, execute, trace)
+    
+    def evaluate_array(self, expression: str, variables: Dict[str, Union[float, List[float]]]) -> ExpressionArrayResult:
+        """对整列变量绑定求值表达式，表达式编译为NumPy内核并按规范化文本缓存"""
+        from ..expression import evaluate_array
+        
+        return evaluate_array(expression, variables)
+    
+    def register_expression_tool(self) -> None:
+        """注册表达式求值工具：evaluate一次调用完成多步计算，evaluate_array对整列数据求值"""
+        
+        async def evaluate(expression: str, trace: bool = False) -> ExpressionResult:
+            started = time.perf_counter()
+            result = await self.evaluate(expression, trace)
+            self._record("evaluate", {"expression": expression}, result, started)
+            return result
+        
+        self.mcp_server.tool(
+            description=(
+                "计算算术表达式，如 sqrt(3^2+4^2) * sin(30deg) / gcd(12, 18)。"
+                "支持 + - * / % ^、n!、pi、e，以及函数 sqrt root square cube abs pow exp ln log mod "
+                "factorial comb perm gcd lcm avg mean median sin cos tan；"
+                "三角函数的参数默认为弧度，写作30deg时按角度计算；trace为true时返回每个运算节点的中间结果"
+            )
+        )(evaluate)
         
-        tool_function = create_tool_function()
+        async def evaluate_array(
+            expression: str,
+            variables: Dict[str, Union[float, List[float]]]
+        ) -> ExpressionArrayResult:
+            started = time.perf_counter()
+            if self.offload and input_size(variables) >= self.thread_threshold:
+                # NumPy内核计算时释放GIL，大数组在线程池中求值
+                result = await asyncio.get_running_loop().run_in_executor(
+                    get_thread_pool(), self.evaluate_array, expression, variables
+                )
+            else:
+                result = self.evaluate_array(expression, variables)
+            self._record("evaluate_array", variables, result, started)
+            return result
         
-        # 注册为MCP工具
-        self.mcp_server.tool(description=operation.description)(tool_function)
+        self.mcp_server.tool(
+            description=(
+                "对整列数据计算含变量的表达式，如 P*(1+r/n)^(n*t)：variables给出每个变量的数值数组"
+                "（各数组等长，每行求一个值；标量对所有行相同），语法与evaluate相同，"
+                "返回逐行结果，定义域错误会给出非法行索引"
+            )
+        )(evaluate_array)
     
     def get_operation(self, name: str) -> BaseOperation:
-        """获取指定的运算操作"""
-        return self.operations.get(name)
+        """获取指定的运算操作，清单注册的运算在此时导入"""
+        operation = self.operations.get(name)
+        if operation is None and name in self._pending:
+            entry = self._pending.pop(name)
+            operation_class = getattr(importlib.import_module(entry["module"]), entry["class"])
+            operation = operation_class()
+            self.operations[name] = operation
+        return operation
     
     def list_operations(self) -> list[str]:
         """列出所有已注册的运算"""
-        return list(self.operations.keys())
\ No newline at end of file
+        return list(self.operations.keys()) + list(self._pending.keys())
\ No newline at end of file
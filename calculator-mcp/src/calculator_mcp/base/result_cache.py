@@ -0,0 +1,136 @@
+"""
+运算结果缓存
+运算是其校验后输入的纯函数，相同的输入直接返回缓存的结果
+
+缓存键为运算名称、元数据详细程度和输入模型规范JSON的哈希；
+条目数和总字节数都有上限，按最久未使用淘汰，并可为每个运算设置过期时间
+"""
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, NamedTuple, Optional
+from pydantic import BaseModel
+from .models import OperationResult
+
+# 启用结果缓存的环境变量，值为最大条目数
+CACHE_ENV = "CALCULATOR_MCP_RESULT_CACHE"
+
+# 结果缓存默认过期时间（秒）的环境变量
+CACHE_TTL_ENV = "CALCULATOR_MCP_RESULT_CACHE_TTL"
+
+
+class _Entry(NamedTuple):
+    result: OperationResult
+    size: int
+    expires_at: Optional[float]
+
+
+class ResultCache:
+    """运算结果的LRU缓存
+
+    max_entries和max_bytes限制条目数和结果JSON的总字节数；
+    ttl为默认过期时间（秒，None表示不过期），ttls按运算名称覆盖。
+    存入和取出时都复制结果，调用方修改返回的结果不会影响缓存
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 4096,
+        max_bytes: int = 64 * 1024 * 1024,
+        ttl: Optional[float] = None,
+        ttls: Optional[Dict[str, Optional[float]]] = None
+    ):
+        if max_entries < 1 or max_bytes < 1:
+            raise ValueError("max_entries和max_bytes必须是正整数")
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.ttls = dict(ttls or {})
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    @classmethod
+    def from_env(cls) -> Optional["ResultCache"]:
+        """根据环境变量创建缓存，未设置CALCULATOR_MCP_RESULT_CACHE或其值为0时不启用"""
+        max_entries = int(os.environ.get(CACHE_ENV) or 0)
+        if max_entries <= 0:
+            return None
+        ttl = os.environ.get(CACHE_TTL_ENV)
+        return cls(max_entries=max_entries, ttl=float(ttl) if ttl else None)
+
+    @staticmethod
+    def key(operation_name: str, input_data: BaseModel, detail: str) -> str:
+        """缓存键：校验后的输入模型序列化为JSON，字段顺序固定，相同输入得到相同的键"""
+        payload = f"{operation_name}\0{detail}\0{input_data.model_dump_json()}"
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def ttl_for(self, operation_name: str) -> Optional[float]:
+        """运算结果的过期时间（秒）"""
+        return self.ttls.get(operation_name, self.ttl)
+
+    def get(self, key: str) -> Optional[OperationResult]:
+        """取出缓存的结果副本，未命中或已过期时返回None"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.expires_at is not None and entry.expires_at <= time.monotonic():
+                self._remove(key)
+                self.expirations += 1
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry.result.model_copy(deep=True)
+
+    def put(self, key: str, operation_name: str, result: OperationResult) -> None:
+        """存入结果副本，必要时淘汰最久未使用的条目；无法序列化或超过字节上限的结果不缓存"""
+        ttl = self.ttl_for(operation_name)
+        if ttl is not None and ttl <= 0:
+            return
+        try:
+            size = len(result.model_dump_json())
+        except Exception:
+            return
+        if size > self.max_bytes:
+            return
+        entry = _Entry(result.model_copy(deep=True), size, None if ttl is None else time.monotonic() + ttl)
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = entry
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def _remove(self, key: str) -> None:
+        self._bytes -= self._entries.pop(key).size
+
+    def clear(self) -> None:
+        """清空缓存（不重置计数器）"""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, int]:
+        """命中、未命中、淘汰和过期计数以及当前占用"""
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations
+            }
+
+    def __len__(self) -> int:
+        return len(self._entries)
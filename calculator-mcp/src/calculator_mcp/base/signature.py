@@ -0,0 +1,134 @@
+"""
+工具签名构建
+根据输入模型的字段生成FastMCP可识别的函数签名，替代逐个exec生成包装函数
+"""
+import inspect
+from functools import lru_cache
+from typing import Annotated, Any, Awaitable, Callable, Dict, List, Optional, Type, Union, get_args, get_origin
+from pydantic import BaseModel, Field
+from .models import DetailLevel
+
+
+def signature_annotation(annotation: Any) -> Any:
+    """将字段注解转换为签名注解
+
+    列表类型保持为不带元素类型的List，与原先生成的工具签名一致
+    """
+    origin = get_origin(annotation)
+    if origin is list:
+        return List
+    if origin is Union:
+        args = get_args(annotation)
+        if len(args) == 2 and type(None) in args:
+            inner_type = args[0] if args[1] is type(None) else args[1]
+            return Optional[signature_annotation(inner_type)]
+    return annotation
+
+
+# 清单中可出现的签名注解名称
+_ANNOTATIONS = {
+    "float": float,
+    "int": int,
+    "bool": bool,
+    "str": str,
+    "List": List,
+}
+
+
+def annotation_name(annotation: Any) -> str:
+    """签名注解的可序列化名称，如 float、List、Optional[int]"""
+    if get_origin(annotation) is Union:
+        inner_type = next(arg for arg in get_args(annotation) if arg is not type(None))
+        return f"Optional[{annotation_name(inner_type)}]"
+    for name, value in _ANNOTATIONS.items():
+        if annotation is value:
+            return name
+    raise ValueError(f"不支持的参数类型: {annotation}")
+
+
+def resolve_annotation(name: str) -> Any:
+    """annotation_name的逆操作"""
+    if name.startswith("Optional[") and name.endswith("]"):
+        return Optional[resolve_annotation(name[len("Optional["):-1])]
+    if name not in _ANNOTATIONS:
+        raise ValueError(f"不支持的参数类型: {name}")
+    return _ANNOTATIONS[name]
+
+
+def model_parameters(input_model: Type[BaseModel], with_defaults: bool = False) -> List[Dict[str, Any]]:
+    """将输入模型字段转换为可序列化的参数描述列表
+
+    with_defaults为False时，除默认值为None的可选字段外都是必需参数，与运算工具原有签名一致；
+    with_defaults为True时所有带默认值的字段都是可选参数
+    """
+    parameters = []
+    for field_name, field_info in input_model.model_fields.items():
+        if with_defaults:
+            required = field_info.is_required()
+        else:
+            required = field_info.is_required() or field_info.get_default() is not None
+        parameters.append({
+            "name": field_name,
+            "annotation": annotation_name(signature_annotation(field_info.annotation)),
+            "required": required,
+            "default": None if required else field_info.get_default(),
+            "description": field_info.description,
+        })
+    return parameters
+
+
+def signature_from_parameters(parameters: List[Dict[str, Any]]) -> inspect.Signature:
+    """根据参数描述列表构建函数签名"""
+    return inspect.Signature([
+        inspect.Parameter(
+            parameter["name"],
+            inspect.Parameter.POSITIONAL_OR_KEYWORD,
+            default=inspect.Parameter.empty if parameter["required"] else parameter["default"],
+            annotation=resolve_annotation(parameter["annotation"])
+        )
+        for parameter in parameters
+    ])
+
+
+@lru_cache(maxsize=None)
+def build_signature(input_model: Type[BaseModel], with_defaults: bool = False) -> inspect.Signature:
+    """根据输入模型字段构建函数签名（按模型缓存）"""
+    return signature_from_parameters(model_parameters(input_model, with_defaults))
+
+
+# 每个运算工具都附带的可选参数：结果元数据详细程度
+DETAIL_PARAMETER = inspect.Parameter(
+    "detail",
+    inspect.Parameter.KEYWORD_ONLY,
+    default=None,
+    annotation=Annotated[
+        Optional[DetailLevel],
+        Field(description="结果元数据详细程度: none(不返回)、summary(摘要)、full(全部)，默认使用服务器设置")
+    ]
+)
+
+
+def with_detail_parameter(signature: inspect.Signature) -> inspect.Signature:
+    """在签名末尾追加detail参数"""
+    return signature.replace(parameters=[*signature.parameters.values(), DETAIL_PARAMETER])
+
+
+def build_tool_function(
+    name: str,
+    signature: inspect.Signature,
+    handler: Callable[[Dict[str, Any]], Awaitable[Any]],
+    doc: Optional[str] = None
+) -> Callable[..., Awaitable[Any]]:
+    """创建具有指定签名的异步函数，调用时将关键字参数整体交给handler"""
+
+    async def tool_function(**kwargs):
+        return await handler(kwargs)
+
+    tool_function.__signature__ = signature
+    tool_function.__annotations__ = {
+        param.name: param.annotation for param in signature.parameters.values()
+    }
+    tool_function.__name__ = name
+    tool_function.__qualname__ = name
+    tool_function.__doc__ = doc
+    return tool_function
@@ -0,0 +1,286 @@
+"""
+调用追踪
+为每次工具和Prompt调用生成一组span，导出到内存环形缓冲区或JSONL文件
+
+一次工具调用的span结构：
+tool/<名称>          整次调用（由TracingMiddleware在FastMCP中开启）
+├── arguments        FastMCP分派调用（运算工具不再按签名解析参数，其余工具包含参数解析）
+├── validation       输入模型校验
+├── execute          BaseOperation.execute
+├── result           结果处理（裁剪元数据、写入缓存）
+└── serialization    FastMCP将结果模型转换为MCP响应内容
+
+不经过FastMCP直接调用工具函数时，根span由注册器生成，没有arguments和serialization
+"""
+import asyncio
+import json
+import logging
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Protocol, TextIO
+
+from fastmcp.server.middleware import Middleware, MiddlewareContext
+
+logger = logging.getLogger(__name__)
+
+# 追踪方式：memory为内存环形缓冲区；设置CALCULATOR_MCP_TRACE_FILE时写入JSONL文件
+TRACE_ENV = "CALCULATOR_MCP_TRACE"
+
+# JSONL追踪文件路径
+TRACE_FILE_ENV = "CALCULATOR_MCP_TRACE_FILE"
+
+# 内存环形缓冲区默认保留的span数
+DEFAULT_BUFFER_SIZE = 2048
+
+# 注册器记录的阶段 -> span名称，按执行顺序排列
+PHASE_SPANS = (("validation", "validation"), ("execution", "execute"), ("result", "result"))
+
+
+@dataclass
+class Span:
+    """一段计时区间，start为Unix时间戳（秒），duration为秒"""
+    name: str
+    trace_id: str
+    span_id: str
+    parent_id: Optional[str] = None
+    start: float = 0.0
+    duration: Optional[float] = None
+    attributes: Dict[str, Any] = field(default_factory=dict)
+    # 开始时的perf_counter读数，用于计算duration和子span的起点
+    started: float = field(default=0.0, repr=False)
+    # 注册器处理结束时的perf_counter读数，此后的时间为FastMCP序列化结果
+    handled: Optional[float] = field(default=None, repr=False)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "start": self.start,
+            "duration": self.duration,
+            "attributes": self.attributes,
+        }
+
+
+class SpanExporter(Protocol):
+    def export(self, span: Span) -> None: ...
+
+
+class RingBufferExporter:
+    """在内存中保留最近capacity个span"""
+
+    def __init__(self, capacity: int = DEFAULT_BUFFER_SIZE):
+        if capacity < 1:
+            raise ValueError("capacity必须是正整数")
+        self._spans: "deque[Span]" = deque(maxlen=capacity)
+        self._lock = threading.Lock()
+
+    def export(self, span: Span) -> None:
+        with self._lock:
+            self._spans.append(span)
+
+    def spans(self) -> List[Span]:
+        """按结束顺序排列的span"""
+        with self._lock:
+            return list(self._spans)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._spans.clear()
+
+
+class JsonlExporter:
+    """每个span追加为JSONL文件中的一行
+
+    span先放入缓冲区，根span结束（一次调用完成）时整批写入；在事件循环中导出时写入交给线程池执行。
+    文件只打开一次，写入由锁保护；写入失败时记录日志，丢弃这批span，不影响调用
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        # 同一时间只有一个线程写追踪文件
+        self._write_lock = threading.Lock()
+        self._buffer: List[str] = []
+        self._file: Optional[TextIO] = None
+
+    def export(self, span: Span) -> None:
+        line = json.dumps(span.to_dict(), ensure_ascii=False, default=str)
+        with self._lock:
+            self._buffer.append(line)
+        if span.parent_id is not None:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self.flush()
+        else:
+            loop.run_in_executor(None, self.flush)
+
+    def flush(self) -> None:
+        """把缓冲的span写入文件"""
+        with self._write_lock:
+            with self._lock:
+                lines, self._buffer = self._buffer, []
+            if not lines:
+                return
+            try:
+                if self._file is None:
+                    self._file = self.path.open("a", encoding="utf-8")
+                self._file.write("".join(line + "\n" for line in lines))
+                self._file.flush()
+            except OSError as e:
+                logger.warning("写入追踪文件%s失败: %s", self.path, e)
+                self._close_file()
+
+    def close(self) -> None:
+        """写入缓冲的span并关闭文件"""
+        self.flush()
+        with self._write_lock:
+            self._close_file()
+
+    def _close_file(self) -> None:
+        if self._file is None:
+            return
+        try:
+            self._file.close()
+        except OSError:
+            pass
+        self._file = None
+
+
+# 当前正在进行的span
+_current_span: ContextVar[Optional[Span]] = ContextVar("calculator_mcp_current_span", default=None)
+
+
+def current_span() -> Optional[Span]:
+    return _current_span.get()
+
+
+def _new_id(size: int) -> str:
+    return os.urandom(size).hex()
+
+
+class Tracer:
+    """创建span并交给导出器"""
+
+    def __init__(self, exporter: SpanExporter):
+        self.exporter = exporter
+
+    @classmethod
+    def from_env(cls) -> Optional["Tracer"]:
+        """根据环境变量创建追踪器，CALCULATOR_MCP_TRACE和CALCULATOR_MCP_TRACE_FILE都未设置时不追踪"""
+        mode = os.environ.get(TRACE_ENV, "").strip().lower()
+        path = os.environ.get(TRACE_FILE_ENV)
+        if mode == "memory":
+            return cls(RingBufferExporter())
+        if path:
+            return cls(JsonlExporter(Path(path)))
+        if mode in ("", "0", "off"):
+            return None
+        raise ValueError(f"{TRACE_ENV}必须是memory，写入JSONL文件时请设置{TRACE_FILE_ENV}")
+
+    @contextmanager
+    def span(self, name: str, **attributes: Any) -> Iterator[Span]:
+        """开启一个span，作为当前span的子span，代码块结束时导出"""
+        span = self._start(name, time.perf_counter(), attributes)
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.attributes["error"] = str(e) or type(e).__name__
+            raise
+        finally:
+            _current_span.reset(token)
+            self._finish(span, time.perf_counter())
+
+    def _start(self, name: str, started: float, attributes: Mapping[str, Any], parent: Optional[Span] = None) -> Span:
+        parent = parent or current_span()
+        return Span(
+            name=name,
+            trace_id=parent.trace_id if parent else _new_id(16),
+            span_id=_new_id(8),
+            parent_id=parent.span_id if parent else None,
+            start=time.time() - (time.perf_counter() - started),
+            attributes=dict(attributes),
+            started=started
+        )
+
+    def _finish(self, span: Span, ended: float) -> None:
+        span.duration = ended - span.started
+        self.exporter.export(span)
+
+    def record(self, name: str, started: float, ended: float, parent: Optional[Span] = None, **attributes: Any) -> Span:
+        """导出一个已结束的span，started和ended为perf_counter读数"""
+        span = self._start(name, started, attributes, parent)
+        self._finish(span, ended)
+        return span
+
+    def record_call(
+        self,
+        kind: str,
+        name: str,
+        started: float,
+        phases: Mapping[str, float],
+        size: int,
+        error: Optional[str] = None
+    ) -> None:
+        """记录注册器处理一次调用的各阶段
+
+        phases为各阶段耗时（秒），从started起依次相接。当前span是TracingMiddleware
+        为该调用开启的根span时挂在其下，否则生成一个独立的根span
+        """
+        ended = time.perf_counter()
+        attributes = {"operation": name, "input_size": size}
+        root = current_span()
+        own_root = root is None or root.name != f"{kind}/{name}"
+        if own_root:
+            root = self._start(f"{kind}/{name}", started, {"kind": kind}, parent=root)
+        else:
+            self.record("arguments", root.started, started, parent=root, **attributes)
+        root.attributes.update(attributes)
+        if error is not None:
+            root.attributes["error"] = error
+
+        offset = started
+        for phase, span_name in PHASE_SPANS:
+            if phase in phases:
+                self.record(span_name, offset, offset + phases[phase], parent=root, **attributes)
+                offset += phases[phase]
+
+        if own_root:
+            self._finish(root, ended)
+        else:
+            root.handled = ended
+
+
+class TracingMiddleware(Middleware):
+    """为每次工具和Prompt调用开启根span，并记录注册器返回后FastMCP序列化结果的耗时"""
+
+    def __init__(self, tracer: Tracer):
+        self.tracer = tracer
+
+    async def on_call_tool(self, context: MiddlewareContext, call_next):
+        return await self._traced("tool", context, call_next)
+
+    async def on_get_prompt(self, context: MiddlewareContext, call_next):
+        return await self._traced("prompt", context, call_next)
+
+    async def _traced(self, kind: str, context: MiddlewareContext, call_next):
+        name = context.message.name
+        with self.tracer.span(f"{kind}/{name}", kind=kind, operation=name) as span:
+            result = await call_next(context)
+            if span.handled is not None:
+                self.tracer.record(
+                    "serialization", span.handled, time.perf_counter(), parent=span,
+                    operation=name, input_size=span.attributes.get("input_size")
+                )
+            return result
@@ -0,0 +1,97 @@
+"""
+向量化运算基类
+使用NumPy在单个内核中对整个数组求值，定义域检查以掩码方式完成
+"""
+from abc import abstractmethod
+from typing import Optional
+import numpy as np
+from pydantic import BaseModel
+from .operation import BaseOperation
+from .models import ArrayOperationResult, OperationResult
+
+# 错误信息中最多列出的非法元素索引数量
+MAX_REPORTED_INDICES = 20
+
+
+def format_array(values: np.ndarray, precision: int = 10) -> np.ndarray:
+    """format_result的数组版本：四舍五入到指定精度，并将接近整数的值取整"""
+    rounded = np.round(values, precision)
+    nearest = np.round(rounded)
+    return np.where(np.abs(rounded - nearest) < 1e-10, nearest, rounded)
+
+
+class VectorizedOperation(BaseOperation):
+    """数组运算的基类，子类只需提供NumPy内核和定义域掩码"""
+
+    @property
+    def domain_error(self) -> str:
+        """定义域检查失败时的错误描述"""
+        return "输入超出定义域"
+
+    def domain_mask(self, values: np.ndarray, input_data: BaseModel) -> Optional[np.ndarray]:
+        """返回定义域之外元素的布尔掩码，None表示没有额外限制"""
+        return None
+
+    @abstractmethod
+    def kernel(self, values: np.ndarray, input_data: BaseModel) -> np.ndarray:
+        """对整个数组求值的NumPy内核"""
+        pass
+
+    def validate_input(self, input_data: BaseModel) -> bool:
+        """验证输入数据"""
+        return len(input_data.values) > 0
+
+    def _invalid_result(self, message: str, mask: np.ndarray) -> OperationResult:
+        """根据掩码生成包含非法元素索引的错误结果"""
+        indices = np.flatnonzero(mask)
+        shown = indices[:MAX_REPORTED_INDICES].tolist()
+        suffix = "..." if len(indices) > MAX_REPORTED_INDICES else ""
+        return OperationResult(
+            success=False,
+            error_message=f"{message}，非法元素索引: {shown}{suffix}",
+            operation_name=self.name,
+            metadata={
+                "invalid_indices": indices.tolist(),
+                "invalid_count": int(len(indices))
+            }
+        )
+
+    async def execute(self, input_data: BaseModel) -> OperationResult:
+        """执行数组运算"""
+        if not self.validate_input(input_data):
+            return OperationResult(
+                success=False,
+                error_message="错误：数值数组不能为空",
+                operation_name=self.name
+            )
+
+        try:
+            values = np.asarray(input_data.values, dtype=np.float64)
+
+            non_finite = ~np.isfinite(values)
+            if non_finite.any():
+                return self._invalid_result("输入包含无效数值（无穷大或NaN）", non_finite)
+
+            out_of_domain = self.domain_mask(values, input_data)
+            if out_of_domain is not None and out_of_domain.any():
+                return self._invalid_result(self.domain_error, out_of_domain)
+
+            with np.errstate(all="ignore"):
+                results = self.kernel(values, input_data)
+
+            overflow = ~np.isfinite(results)
+            if overflow.any():
+                return self._invalid_result("运算结果溢出", overflow)
+
+            return ArrayOperationResult(
+                success=True,
+                operation_name=self.name,
+                results=results.tolist(),
+                metadata={"count": int(len(values))}
+            )
+        except Exception as e:
+            return OperationResult(
+                success=False,
+                error_message=f"数组运算失败: {str(e)}",
+                operation_name=self.name
+            )
@@ -0,0 +1,17 @@
+"""
+表达式模块
+解析算术表达式并通过已注册的运算逐节点求值，或编译为NumPy内核对整列变量求值
+"""
+from .parser import ExpressionError, parse
+from .evaluator import FUNCTIONS, evaluate_expression
+from .compiler import CompiledExpression, compile_expression, evaluate_array
+
+__all__ = [
+    "ExpressionError",
+    "parse",
+    "FUNCTIONS",
+    "evaluate_expression",
+    "CompiledExpression",
+    "compile_expression",
+    "evaluate_array"
+]
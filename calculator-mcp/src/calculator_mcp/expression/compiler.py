@@ -0,0 +1,359 @@
+"""
+表达式编译
+将语法树编译为NumPy闭包链，对整列变量一次求值；编译结果按规范化文本缓存
+
+各运算的定义域检查与对应的运算一致（除数为零、负数开平方、阶乘的整数范围等），
+以掩码方式完成，失败时报告非法的行索引
+"""
+import math
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from ..base.models import ExpressionArrayResult
+from ..base.vector_operation import MAX_REPORTED_INDICES, format_array
+from .evaluator import BINARY_OPERATIONS, CONSTANT_VALUES, FUNCTIONS, TRIGONOMETRIC_FUNCTIONS
+from .parser import (
+    Binary,
+    Call,
+    Constant,
+    Degrees,
+    ExpressionError,
+    Factorial,
+    Node,
+    Number,
+    Unary,
+    Variable,
+    normalize,
+    parse,
+)
+
+# 缓存的编译结果数量上限
+COMPILED_CACHE_SIZE = 256
+
+# 单次整列求值的最大行数
+MAX_ROWS = 1_000_000
+
+# 浮点模式下阶乘、排列和组合支持的最大n，与对应运算一致
+MAX_FACTORIAL_N = 170
+
+# float64能精确表示全部整数的上界，gcd和lcm的参数不能超过
+MAX_EXACT_INTEGER = 2**53
+
+# 变量绑定 -> 整列结果
+Kernel = Callable[[Dict[str, np.ndarray]], np.ndarray]
+
+_FACTORIALS = np.array([float(math.factorial(i)) for i in range(MAX_FACTORIAL_N + 1)])
+
+_exact_combination = np.frompyfunc(lambda n, r: float(math.comb(int(n), int(r))), 2, 1)
+_exact_permutation = np.frompyfunc(lambda n, r: float(math.perm(int(n), int(r))), 2, 1)
+
+
+class ExpressionDomainError(ExpressionError):
+    """整列求值时部分行超出运算的定义域"""
+
+    def __init__(self, message: str, rows: np.ndarray, position: Optional[int] = None):
+        self.rows = rows.tolist()
+        shown = self.rows[:MAX_REPORTED_INDICES]
+        suffix = "..." if len(self.rows) > MAX_REPORTED_INDICES else ""
+        super().__init__(f"{message}，非法行索引: {shown}{suffix}", position)
+
+
+class CompiledExpression(NamedTuple):
+    """编译后的表达式"""
+    source: str
+    variables: Tuple[str, ...]
+    kernel: Kernel
+
+
+class _Compiler:
+    def __init__(self, source: str):
+        self.source = source
+        self.variables: List[str] = []
+
+    def text(self, node: Node) -> str:
+        return self.source[node.start:node.end]
+
+    def check(self, node: Node, mask: np.ndarray, message: str) -> None:
+        """mask中为True的行超出定义域时报错"""
+        if np.any(mask):
+            rows = np.flatnonzero(np.broadcast_to(mask, np.shape(mask) or (1,)))
+            raise ExpressionDomainError(f"'{self.text(node)}' 计算失败: {message}", rows, node.start)
+
+    def integers(self, node: Node, values: np.ndarray, what: str) -> None:
+        self.check(node, values != np.floor(values), f"{what}必须是整数")
+
+    def compile(self, node: Node) -> Kernel:
+        if isinstance(node, Number):
+            value = np.float64(node.value)
+            return lambda env: value
+        if isinstance(node, Constant):
+            value = np.float64(CONSTANT_VALUES[node.name])
+            return lambda env: value
+        if isinstance(node, Variable):
+            name = node.name
+            if name not in self.variables:
+                self.variables.append(name)
+            return lambda env: env[name]
+        if isinstance(node, Unary):
+            operand = self.compile(node.operand)
+            if node.operator == "+":
+                return operand
+            return lambda env: np.negative(operand(env))
+        if isinstance(node, Binary):
+            return self.binary(node, BINARY_OPERATIONS[node.operator][0], self.compile(node.left), self.compile(node.right))
+        if isinstance(node, Factorial):
+            return self.factorial(node, self.compile(node.operand))
+        if isinstance(node, Degrees):
+            operand = self.compile(node.operand)
+            return lambda env: np.radians(operand(env))
+        if isinstance(node, Call):
+            return self.call(node)
+        raise ExpressionError(f"无法编译的节点 '{self.text(node)}'", node.start)
+
+    def binary(self, node: Node, operation: str, left: Kernel, right: Kernel) -> Kernel:
+        if operation == "add":
+            return lambda env: np.add(left(env), right(env))
+        if operation == "subtract":
+            return lambda env: np.subtract(left(env), right(env))
+        if operation == "multiply":
+            return lambda env: np.multiply(left(env), right(env))
+        if operation == "divide":
+            def divide(env):
+                a, b = left(env), right(env)
+                self.check(node, b == 0, "除数不能为零")
+                return np.divide(a, b)
+            return divide
+        if operation == "modulo":
+            def modulo(env):
+                a, b = left(env), right(env)
+                self.check(node, b == 0, "除数不能为0")
+                # 与Python的%一致，结果与除数同号
+                return np.mod(a, b)
+            return modulo
+        return self.power(node, left, right)
+
+    def power(self, node: Node, base: Kernel, exponent: Kernel) -> Kernel:
+        def power(env):
+            a, b = base(env), exponent(env)
+            self.check(node, (a == 0) & (b < 0), "0的负数次方无定义")
+            self.check(node, (a < 0) & (b != np.floor(b)), "负数的非整数次方会产生复数，暂不支持")
+            return np.power(a, b)
+        return power
+
+    def factorial(self, node: Node, operand: Kernel) -> Kernel:
+        def factorial(env):
+            n = operand(env)
+            self.integers(node, n, "n")
+            self.check(node, (n < 0) | (n > MAX_FACTORIAL_N), f"n必须在0到{MAX_FACTORIAL_N}之间")
+            return _FACTORIALS[np.asarray(n, dtype=np.int64)]
+        return factorial
+
+    def call(self, node: Call) -> Kernel:
+        function = node.function
+        if function in TRIGONOMETRIC_FUNCTIONS:
+            if len(node.args) != 1:
+                raise ExpressionError(f"函数 {function} 需要1个参数，实际为{len(node.args)}个", node.start)
+            return self.trigonometric(node, function, self.compile(node.args[0]))
+        if function not in FUNCTIONS:
+            raise ExpressionError(f"未知的函数 '{function}'", node.start)
+
+        operation, minimum, maximum, _ = FUNCTIONS[function]
+        count = len(node.args)
+        if count < minimum or (maximum is not None and count > maximum):
+            raise ExpressionError(f"函数 {function} 的参数个数不正确（{count}个）", node.start)
+        args = [self.compile(argument) for argument in node.args]
+
+        if operation == "square_root":
+            def square_root(env):
+                x = args[0](env)
+                self.check(node, x < 0, "不能计算负数的平方根")
+                return np.sqrt(x)
+            return square_root
+        if operation == "nth_root":
+            def nth_root(env):
+                x, n = args[0](env), args[1](env)
+                self.check(node, n == 0, "根的次数不能为零")
+                odd = np.mod(n, 2) == 1
+                self.check(node, (x < 0) & ~odd, "不能计算负数的偶数次根")
+                return np.sign(x) * np.power(np.abs(x), 1 / n)
+            return nth_root
+        if operation == "square":
+            return lambda env: np.square(args[0](env))
+        if operation == "cube":
+            return lambda env: np.power(args[0](env), 3)
+        if operation == "absolute":
+            return lambda env: np.abs(args[0](env))
+        if operation == "power":
+            if function == "exp":
+                return self.power(node, lambda env: np.float64(math.e), args[0])
+            return self.power(node, args[0], args[1])
+        if operation == "logarithm":
+            return self.logarithm(node, function, args)
+        if operation == "modulo":
+            return self.binary(node, "modulo", args[0], args[1])
+        if operation == "factorial":
+            return self.factorial(node, args[0])
+        if operation in ("combination", "permutation"):
+            exact = _exact_combination if operation == "combination" else _exact_permutation
+            def combinatorics(env):
+                n, r = args[0](env), args[1](env)
+                self.integers(node, n, "n和r")
+                self.integers(node, r, "n和r")
+                self.check(node, (r < 0) | (r > n), "选取数r必须满足 0 ≤ r ≤ n")
+                self.check(node, n > MAX_FACTORIAL_N, f"数值过大(n > {MAX_FACTORIAL_N})")
+                return np.asarray(exact(n, r), dtype=np.float64)
+            return combinatorics
+        if operation in ("gcd", "lcm"):
+            def integer_reduce(env):
+                values = np.stack(np.broadcast_arrays(*[arg(env) for arg in args]))
+                self.integers(node, values, "参数")
+                self.check(
+                    node, np.any(np.abs(values) > MAX_EXACT_INTEGER, axis=0),
+                    "参数的绝对值不能超过2^53（更大的浮点数不是精确整数）"
+                )
+                values = np.abs(values.astype(np.int64))
+                if operation == "gcd":
+                    self.check(node, np.all(values == 0, axis=0), "参数不能全部为0")
+                    return np.gcd.reduce(values, axis=0).astype(np.float64)
+                self.check(node, np.any(values == 0, axis=0), "参数不能包含0")
+                # 逐个累乘，结果超过2^53的行报错，避免int64溢出后得到错误的值
+                result = values[0]
+                too_large = np.zeros(result.shape, dtype=bool)
+                for value in values[1:]:
+                    step = result // np.gcd(result, value)
+                    too_large |= step.astype(np.float64) * value > MAX_EXACT_INTEGER
+                    result = np.where(too_large, 1, step * value)
+                self.check(node, too_large, "最小公倍数超过2^53，无法精确表示")
+                return result.astype(np.float64)
+            return integer_reduce
+        if operation == "average":
+            return lambda env: np.mean(np.stack(np.broadcast_arrays(*[arg(env) for arg in args])), axis=0)
+        if operation == "median":
+            return lambda env: np.median(np.stack(np.broadcast_arrays(*[arg(env) for arg in args])), axis=0)
+        raise ExpressionError(f"函数 {function} 不支持整列求值", node.start)
+
+    def logarithm(self, node: Node, function: str, args: List[Kernel]) -> Kernel:
+        def logarithm(env):
+            x = args[0](env)
+            self.check(node, x <= 0, "对数只定义在正数上")
+            if function == "ln":
+                return np.log(x)
+            if len(args) == 1:
+                return np.log10(x)
+            base = args[1](env)
+            self.check(node, (base <= 0) | (base == 1), "对数底数必须是不等于1的正数")
+            return np.log(x) / np.log(base)
+        return logarithm
+
+    def trigonometric(self, node: Node, function: str, angle: Kernel) -> Kernel:
+        ufunc = {"sin": np.sin, "cos": np.cos, "tan": np.tan}[function]
+
+        def trigonometric(env):
+            radians = angle(env)
+            if function == "tan":
+                normalized = np.mod(radians, 2 * np.pi)
+                undefined = (np.abs(normalized - np.pi / 2) < 1e-10) | (np.abs(normalized - 3 * np.pi / 2) < 1e-10)
+                self.check(node, undefined, "正切值在90°和270°(或π/2和3π/2)处无定义")
+            result = ufunc(radians)
+            # 与三角函数运算一致，把接近0的结果记为0
+            return np.where(np.abs(result) < 1e-10, 0.0, result)
+        return trigonometric
+
+
+# 规范化文本 -> 编译结果，按最近使用顺序排列
+_cache: "OrderedDict[str, CompiledExpression]" = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def _compile_normalized(source: str) -> CompiledExpression:
+    compiler = _Compiler(source)
+    kernel = compiler.compile(parse(source, allow_variables=True))
+    return CompiledExpression(source, tuple(compiler.variables), kernel)
+
+
+def compile_expression(source: str) -> Tuple[CompiledExpression, bool]:
+    """编译表达式，返回 (编译结果, 是否来自缓存)
+
+    空白不同但含义相同的表达式共用同一个编译结果；是否命中由本次查找直接给出，
+    多个线程同时求值时也不会互相影响
+    """
+    normalized = normalize(source)
+    with _cache_lock:
+        compiled = _cache.get(normalized)
+        if compiled is not None:
+            _cache.move_to_end(normalized)
+            return compiled, True
+    compiled = _compile_normalized(normalized)
+    with _cache_lock:
+        _cache[normalized] = compiled
+        while len(_cache) > COMPILED_CACHE_SIZE:
+            _cache.popitem(last=False)
+    return compiled, False
+
+
+def clear_cache() -> None:
+    """清空编译缓存"""
+    with _cache_lock:
+        _cache.clear()
+
+
+def _bind(compiled: CompiledExpression, variables: Dict[str, Union[float, Sequence[float]]]) -> Tuple[Dict[str, np.ndarray], int]:
+    """把变量绑定转换为float64数组，标量按行广播；返回表达式用到的绑定和行数
+
+    行数由所有数组绑定决定（包括表达式没有用到的列），各数组必须等长
+    """
+    missing = [name for name in compiled.variables if name not in variables]
+    if missing:
+        raise ExpressionError(f"缺少变量: {', '.join(missing)}")
+
+    env: Dict[str, np.ndarray] = {}
+    rows = None
+    for name, bound in variables.items():
+        values = np.asarray(bound, dtype=np.float64)
+        if values.ndim > 1:
+            raise ExpressionError(f"变量 {name} 必须是数值或一维数值数组")
+        if values.ndim == 1:
+            if rows is not None and len(values) != rows:
+                raise ExpressionError(f"变量 {name} 的长度为{len(values)}，与其他变量的长度{rows}不一致")
+            rows = len(values)
+        if name not in compiled.variables:
+            continue
+        non_finite = ~np.isfinite(np.atleast_1d(values))
+        if non_finite.any():
+            raise ExpressionDomainError(f"变量 {name} 包含无效数值（无穷大或NaN）", np.flatnonzero(non_finite))
+        env[name] = values
+    rows = 1 if rows is None else rows
+    if rows > MAX_ROWS:
+        raise ExpressionError(f"行数过多（最多{MAX_ROWS:,}行）")
+    return env, rows
+
+
+def evaluate_array(
+    source: str,
+    variables: Dict[str, Union[float, Sequence[float]]]
+) -> ExpressionArrayResult:
+    """对变量的整列绑定求值表达式，每行对应各数组变量的同一位置，标量变量对所有行相同"""
+    try:
+        compiled, cached = compile_expression(source)
+        env, rows = _bind(compiled, variables)
+        with np.errstate(all="ignore"):
+            results = np.broadcast_to(compiled.kernel(env), (rows,)).astype(np.float64)
+        overflow = ~np.isfinite(results)
+        if overflow.any():
+            raise ExpressionDomainError("运算结果溢出", np.flatnonzero(overflow))
+    except ExpressionDomainError as e:
+        return ExpressionArrayResult(success=False, expression=source, error_message=str(e), invalid_rows=e.rows)
+    except ExpressionError as e:
+        return ExpressionArrayResult(success=False, expression=source, error_message=str(e))
+
+    return ExpressionArrayResult(
+        success=True,
+        expression=source,
+        results=format_array(results).tolist(),
+        count=rows,
+        variables=list(compiled.variables),
+        compiled_from_cache=cached
+    )
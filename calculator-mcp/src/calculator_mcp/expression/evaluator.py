@@ -0,0 +1,167 @@
+"""
+表达式求值
+语法树的每个运算节点都交给对应的已注册运算执行，沿用其参数校验和计算语义
+"""
+import math
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from ..base.models import ExpressionResult, ExpressionStep, OperationResult
+from .parser import (
+    Binary,
+    Call,
+    Constant,
+    Degrees,
+    ExpressionError,
+    Factorial,
+    Node,
+    Number,
+    Unary,
+    parse,
+)
+
+# 执行单个运算的回调：(运算名称, 参数) -> 运算结果
+Execute = Callable[[str, Dict[str, Any]], Awaitable[OperationResult]]
+
+# 二元运算符 -> (运算名称, 左操作数参数名, 右操作数参数名)
+BINARY_OPERATIONS: Dict[str, Tuple[str, str, str]] = {
+    "+": ("add", "a", "b"),
+    "-": ("subtract", "a", "b"),
+    "*": ("multiply", "a", "b"),
+    "/": ("divide", "a", "b"),
+    "%": ("modulo", "dividend", "divisor"),
+    "^": ("power", "base", "exponent"),
+}
+
+CONSTANT_VALUES = {"pi": math.pi, "e": math.e}
+
+# 三角函数 -> 运算名称；参数写作 30deg 时按角度计算，否则按弧度计算
+TRIGONOMETRIC_FUNCTIONS = {"sin": "sine", "cos": "cosine", "tan": "tangent"}
+
+
+def _single(name: str) -> Callable[[List[float]], Dict[str, Any]]:
+    return lambda args: {name: args[0]}
+
+
+def _pair(first: str, second: str) -> Callable[[List[float]], Dict[str, Any]]:
+    return lambda args: {first: args[0], second: args[1]}
+
+
+def _listed(name: str) -> Callable[[List[float]], Dict[str, Any]]:
+    return lambda args: {name: list(args)}
+
+
+# 函数名 -> (运算名称, 最少参数个数, 最多参数个数（None为不限）, 参数构造)
+FUNCTIONS: Dict[str, Tuple[str, int, Optional[int], Callable[[List[float]], Dict[str, Any]]]] = {
+    "sqrt": ("square_root", 1, 1, _single("value")),
+    "root": ("nth_root", 2, 2, _pair("value", "n")),
+    "square": ("square", 1, 1, _single("value")),
+    "cube": ("cube", 1, 1, _single("value")),
+    "abs": ("absolute", 1, 1, _single("number")),
+    "pow": ("power", 2, 2, _pair("base", "exponent")),
+    "exp": ("power", 1, 1, lambda args: {"base": math.e, "exponent": args[0]}),
+    "ln": ("logarithm", 1, 1, lambda args: {"number": args[0], "base": math.e}),
+    "log": ("logarithm", 1, 2, lambda args: {"number": args[0], "base": args[1] if len(args) > 1 else 10}),
+    "mod": ("modulo", 2, 2, _pair("dividend", "divisor")),
+    "factorial": ("factorial", 1, 1, _single("n")),
+    "comb": ("combination", 2, 2, _pair("n", "r")),
+    "perm": ("permutation", 2, 2, _pair("n", "r")),
+    "gcd": ("gcd", 2, None, _listed("numbers")),
+    "lcm": ("lcm", 2, None, _listed("numbers")),
+    "avg": ("average", 1, None, _listed("values")),
+    "mean": ("average", 1, None, _listed("values")),
+    "median": ("median", 1, None, _listed("numbers")),
+}
+
+
+class Evaluator:
+    """对语法树求值，按执行顺序记录每个运算节点"""
+
+    def __init__(self, source: str, execute: Execute):
+        self.source = source
+        self.execute = execute
+        self.steps: List[ExpressionStep] = []
+
+    def text(self, node: Node) -> str:
+        return self.source[node.start:node.end]
+
+    async def evaluate(self, node: Node) -> float:
+        if isinstance(node, Number):
+            return node.value
+        if isinstance(node, Constant):
+            return CONSTANT_VALUES[node.name]
+        if isinstance(node, Unary):
+            value = await self.evaluate(node.operand)
+            if node.operator == "+":
+                return value
+            return await self.apply(node, "multiply", {"a": -1, "b": value})
+        if isinstance(node, Binary):
+            operation, left_name, right_name = BINARY_OPERATIONS[node.operator]
+            left = await self.evaluate(node.left)
+            right = await self.evaluate(node.right)
+            return await self.apply(node, operation, {left_name: left, right_name: right})
+        if isinstance(node, Factorial):
+            return await self.apply(node, "factorial", {"n": await self.evaluate(node.operand)})
+        if isinstance(node, Degrees):
+            value = await self.evaluate(node.operand)
+            return await self.apply(node, "multiply", {"a": value, "b": math.pi / 180})
+        if isinstance(node, Call):
+            return await self.call(node)
+        raise ExpressionError(f"无法求值的节点 '{self.text(node)}'", node.start)
+
+    async def call(self, node: Call) -> float:
+        if node.function in TRIGONOMETRIC_FUNCTIONS:
+            self.check_arity(node, 1, 1)
+            (argument,) = node.args
+            if isinstance(argument, Degrees):
+                arguments = {"angle": await self.evaluate(argument.operand), "unit": "degree"}
+            else:
+                arguments = {"angle": await self.evaluate(argument), "unit": "radian"}
+            return await self.apply(node, TRIGONOMETRIC_FUNCTIONS[node.function], arguments)
+
+        if node.function not in FUNCTIONS:
+            raise ExpressionError(f"未知的函数 '{node.function}'", node.start)
+        operation, minimum, maximum, build = FUNCTIONS[node.function]
+        self.check_arity(node, minimum, maximum)
+        args = [await self.evaluate(argument) for argument in node.args]
+        return await self.apply(node, operation, build(args))
+
+    def check_arity(self, node: Call, minimum: int, maximum: Optional[int]) -> None:
+        count = len(node.args)
+        if count < minimum or (maximum is not None and count > maximum):
+            if maximum == minimum:
+                expected = f"{minimum}个"
+            elif maximum is None:
+                expected = f"至少{minimum}个"
+            else:
+                expected = f"{minimum}到{maximum}个"
+            raise ExpressionError(f"函数 {node.function} 需要{expected}参数，实际为{count}个", node.start)
+
+    async def apply(self, node: Node, operation: str, arguments: Dict[str, Any]) -> float:
+        """执行一个运算节点，失败时报告该节点在表达式中的位置"""
+        result = await self.execute(operation, arguments)
+        if not result.success or result.result is None:
+            raise ExpressionError(f"'{self.text(node)}' 计算失败: {result.error_message}", node.start)
+        self.steps.append(ExpressionStep(
+            expression=self.text(node),
+            operation=operation,
+            arguments=arguments,
+            result=result.result
+        ))
+        return result.result
+
+
+async def evaluate_expression(source: str, execute: Execute, trace: bool = False) -> ExpressionResult:
+    """解析并求值表达式，trace为True时返回按执行顺序排列的每个运算节点"""
+    try:
+        evaluator = Evaluator(source, execute)
+        value = await evaluator.evaluate(parse(source))
+    except ExpressionError as e:
+        return ExpressionResult(success=False, expression=source, error_message=str(e))
+
+    return ExpressionResult(
+        success=True,
+        expression=source,
+        result=float(value),
+        operation_count=len(evaluator.steps),
+        trace=evaluator.steps if trace else None
+    )
@@ -0,0 +1,252 @@
+"""
+表达式解析
+将算术表达式字符串解析为语法树，使用Pratt（运算符优先级）解析
+
+支持的语法：
+- 数字：12、3.5、.5、1e-3
+- 二元运算：+ - * / %，^ 或 ** 为乘方（右结合）
+- 一元正负号：-x、+x（优先级低于乘方，-2^2 = -4）
+- 后缀运算：n! 为阶乘，30deg 表示角度
+- 函数调用：sqrt(x)、gcd(a, b, ...) 等，常量 pi、e
+- 变量：允许变量时，其余名称（如 P、rate）解析为变量
+"""
+import math
+import re
+from dataclasses import dataclass, replace
+from typing import List, Optional, Tuple, Union
+
+# 表达式的最大长度
+MAX_EXPRESSION_LENGTH = 2000
+
+# 表达式的最大词法单元数，同时限制了语法树的高度
+MAX_TOKENS = 256
+
+# 括号、函数调用和一元运算的最大嵌套深度
+MAX_DEPTH = 64
+
+# 常量
+CONSTANTS = ("pi", "e")
+
+_TOKEN_PATTERN = re.compile(
+    r"\s*(?:"
+    r"(?P<number>(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?)"
+    r"|(?P<name>[A-Za-z_]\w*)"
+    r"|(?P<operator>\*\*|[-+*/%^(),!])"
+    r")"
+)
+
+# 中缀和后缀运算的左结合力，数值越大优先级越高
+_BINDING_POWER = {
+    "+": 10, "-": 10,
+    "*": 20, "/": 20, "%": 20,
+    "^": 40,
+    "!": 50, "deg": 50,
+}
+
+# 一元正负号作用于其右侧结合力高于该值的部分
+_PREFIX_BINDING_POWER = 30
+
+
+class ExpressionError(ValueError):
+    """表达式语法错误或求值失败"""
+
+    def __init__(self, message: str, position: Optional[int] = None):
+        self.position = position
+        if position is not None:
+            message = f"{message}（位置 {position}）"
+        super().__init__(message)
+
+
+@dataclass(frozen=True)
+class Node:
+    """语法树节点，start和end为节点在表达式字符串中的范围"""
+    start: int
+    end: int
+
+
+@dataclass(frozen=True)
+class Number(Node):
+    value: Union[int, float]
+
+
+@dataclass(frozen=True)
+class Constant(Node):
+    name: str
+
+
+@dataclass(frozen=True)
+class Variable(Node):
+    name: str
+
+
+@dataclass(frozen=True)
+class Unary(Node):
+    operator: str
+    operand: Node
+
+
+@dataclass(frozen=True)
+class Binary(Node):
+    operator: str
+    left: Node
+    right: Node
+
+
+@dataclass(frozen=True)
+class Factorial(Node):
+    operand: Node
+
+
+@dataclass(frozen=True)
+class Degrees(Node):
+    operand: Node
+
+
+@dataclass(frozen=True)
+class Call(Node):
+    function: str
+    args: Tuple[Node, ...]
+
+
+@dataclass(frozen=True)
+class Token:
+    kind: str
+    text: str
+    start: int
+    end: int
+
+
+def tokenize(source: str) -> List[Token]:
+    """词法分析，末尾追加一个end标记"""
+    tokens = []
+    position = 0
+    while True:
+        match = _TOKEN_PATTERN.match(source, position)
+        if match is None or match.end() == position:
+            if source[position:].strip():
+                raise ExpressionError(f"无法识别的字符 '{source[position:].lstrip()[0]}'", position)
+            break
+        if len(tokens) >= MAX_TOKENS:
+            raise ExpressionError(f"表达式过长（最多{MAX_TOKENS}个数字、名称和运算符）", position)
+        kind = match.lastgroup
+        text = match.group(kind)
+        tokens.append(Token(kind, "^" if text == "**" else text, match.start(kind), match.end()))
+        position = match.end()
+    tokens.append(Token("end", "", len(source), len(source)))
+    return tokens
+
+
+def normalize(source: str) -> str:
+    """去掉不影响含义的空白，作为表达式的规范文本"""
+    parts = []
+    previous = None
+    for token in tokenize(source)[:-1]:
+        # 相邻的数字和名称之间保留一个空格，避免 "1 2" 变成 "12"
+        if previous is not None and previous.kind != "operator" and token.kind != "operator":
+            parts.append(" ")
+        parts.append(token.text)
+        previous = token
+    return "".join(parts)
+
+
+class _Parser:
+    def __init__(self, source: str, allow_variables: bool):
+        self.source = source
+        self.allow_variables = allow_variables
+        self.tokens = tokenize(source)
+        self.index = 0
+        self.depth = 0
+
+    def peek(self) -> Token:
+        return self.tokens[self.index]
+
+    def advance(self) -> Token:
+        token = self.tokens[self.index]
+        self.index += 1
+        return token
+
+    def expect(self, text: str) -> Token:
+        token = self.advance()
+        if token.text != text:
+            found = f"'{token.text}'" if token.kind != "end" else "表达式结尾"
+            raise ExpressionError(f"缺少 '{text}'，遇到{found}", token.start)
+        return token
+
+    def binding_power(self, token: Token) -> int:
+        if token.kind == "operator" or (token.kind == "name" and token.text == "deg"):
+            return _BINDING_POWER.get(token.text, 0)
+        return 0
+
+    def parse(self, right_binding_power: int = 0) -> Node:
+        self.depth += 1
+        if self.depth > MAX_DEPTH:
+            raise ExpressionError(f"表达式嵌套过深（最多{MAX_DEPTH}层）", self.peek().start)
+        left = self.prefix(self.advance())
+        while right_binding_power < self.binding_power(self.peek()):
+            left = self.infix(self.advance(), left)
+        self.depth -= 1
+        return left
+
+    def prefix(self, token: Token) -> Node:
+        if token.kind == "number":
+            value = float(token.text) if any(c in token.text for c in ".eE") else int(token.text)
+            if isinstance(value, float) and not math.isfinite(value):
+                raise ExpressionError(f"数字 '{token.text}' 超出浮点数范围", token.start)
+            return Number(token.start, token.end, value)
+        if token.text in ("-", "+") and token.kind == "operator":
+            operand = self.parse(_PREFIX_BINDING_POWER)
+            return Unary(token.start, operand.end, token.text, operand)
+        if token.text == "(":
+            inner = self.parse()
+            close = self.expect(")")
+            # 括号内的节点范围扩展到包括括号
+            return replace(inner, start=token.start, end=close.end)
+        if token.kind == "name":
+            if self.peek().text == "(":
+                return self.call(token)
+            return self.name(token)
+        if token.kind == "end":
+            raise ExpressionError("表达式不完整", token.start)
+        raise ExpressionError(f"意外的 '{token.text}'", token.start)
+
+    def name(self, token: Token) -> Node:
+        if token.text in CONSTANTS:
+            return Constant(token.start, token.end, token.text)
+        if self.allow_variables:
+            return Variable(token.start, token.end, token.text)
+        raise ExpressionError(f"未知的名称 '{token.text}'", token.start)
+
+    def call(self, token: Token) -> Node:
+        self.advance()
+        args = []
+        if self.peek().text != ")":
+            args.append(self.parse())
+            while self.peek().text == ",":
+                self.advance()
+                args.append(self.parse())
+        close = self.expect(")")
+        return Call(token.start, close.end, token.text, tuple(args))
+
+    def infix(self, token: Token, left: Node) -> Node:
+        if token.text == "!":
+            return Factorial(left.start, token.end, left)
+        if token.text == "deg":
+            return Degrees(left.start, token.end, left)
+        # 乘方右结合，其余二元运算左结合
+        power = _BINDING_POWER[token.text]
+        right = self.parse(power - 1 if token.text == "^" else power)
+        return Binary(left.start, right.end, token.text, left, right)
+
+
+def parse(source: str, allow_variables: bool = False) -> Node:
+    """将表达式字符串解析为语法树，allow_variables为False时未知名称视为语法错误"""
+    if len(source) > MAX_EXPRESSION_LENGTH:
+        raise ExpressionError(f"表达式过长（最多{MAX_EXPRESSION_LENGTH}个字符）")
+    parser = _Parser(source, allow_variables)
+    if parser.peek().kind == "end":
+        raise ExpressionError("表达式不能为空")
+    node = parser.parse()
+    token = parser.peek()
+    if token.kind != "end":
+        raise ExpressionError(f"意外的 '{token.text}'", token.start)
+    return node
@@ -0,0 +1,194 @@
+"""
+注册清单
+记录所有运算和Prompt的名称、描述、参数及所在模块，
+服务器据此注册工具，具体模块在首次调用时才导入
+
+清单带有运算和Prompt源码的哈希：打包的清单与源码一致时直接使用，
+否则读取缓存目录中的清单，仍不一致时重新生成并写回缓存目录
+
+重新生成打包的清单: uv run calculator-mcp-manifest
+输出为构建产物: uv run calculator-mcp-manifest --output dist/manifest.json
+"""
+import argparse
+import hashlib
+import importlib
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from .base.signature import model_parameters
+
+PACKAGE_DIR = Path(__file__).parent
+
+# 打包的清单文件
+MANIFEST_FILE = PACKAGE_DIR / "manifest.json"
+
+# 清单缓存目录的环境变量
+CACHE_DIR_ENV = "CALCULATOR_MCP_CACHE_DIR"
+
+# 参与源码哈希的子包：生成清单时导入的全部子包，清单内容只取决于这些源码
+# （工具描述中引用了utils中的常量，如MAX_MAGNITUDE_N、MAX_EXACT_N）
+SOURCE_PACKAGES = ("base", "operations", "prompts", "utils")
+
+# 运算模块及类名，按注册顺序排列
+OPERATIONS: List[Tuple[str, str]] = [
+    ("calculator_mcp.operations.addition", "AdditionOperation"),
+    ("calculator_mcp.operations.subtraction", "SubtractionOperation"),
+    ("calculator_mcp.operations.multiplication", "MultiplicationOperation"),
+    ("calculator_mcp.operations.division", "DivisionOperation"),
+    ("calculator_mcp.operations.square", "SquareOperation"),
+    ("calculator_mcp.operations.square_root", "SquareRootOperation"),
+    ("calculator_mcp.operations.nth_root", "NthRootOperation"),
+    ("calculator_mcp.operations.cube", "CubeOperation"),
+    ("calculator_mcp.operations.average", "AverageOperation"),
+    ("calculator_mcp.operations.power", "PowerOperation"),
+    ("calculator_mcp.operations.logarithm", "LogarithmOperation"),
+    ("calculator_mcp.operations.absolute", "AbsoluteOperation"),
+    ("calculator_mcp.operations.percentage", "PercentageOperation"),
+    ("calculator_mcp.operations.median", "MedianOperation"),
+    ("calculator_mcp.operations.standard_deviation", "StandardDeviationOperation"),
+    ("calculator_mcp.operations.variance", "VarianceOperation"),
+    ("calculator_mcp.operations.modulo", "ModuloOperation"),
+    ("calculator_mcp.operations.gcd", "GCDOperation"),
+    ("calculator_mcp.operations.lcm", "LCMOperation"),
+    ("calculator_mcp.operations.sine", "SineOperation"),
+    ("calculator_mcp.operations.cosine", "CosineOperation"),
+    ("calculator_mcp.operations.tangent", "TangentOperation"),
+    ("calculator_mcp.operations.simple_interest", "SimpleInterestOperation"),
+    ("calculator_mcp.operations.compound_interest", "CompoundInterestOperation"),
+    ("calculator_mcp.operations.discount", "DiscountOperation"),
+    ("calculator_mcp.operations.factorial", "FactorialOperation"),
+    ("calculator_mcp.operations.permutation", "PermutationOperation"),
+    ("calculator_mcp.operations.combination", "CombinationOperation"),
+    ("calculator_mcp.operations.prime_check", "PrimeCheckOperation"),
+    ("calculator_mcp.operations.vectorized", "SquareArrayOperation"),
+    ("calculator_mcp.operations.vectorized", "CubeArrayOperation"),
+    ("calculator_mcp.operations.vectorized", "SquareRootArrayOperation"),
+    ("calculator_mcp.operations.vectorized", "AbsoluteArrayOperation"),
+    ("calculator_mcp.operations.vectorized", "LogarithmArrayOperation"),
+    ("calculator_mcp.operations.vectorized", "SineArrayOperation"),
+    ("calculator_mcp.operations.vectorized", "CosineArrayOperation"),
+    ("calculator_mcp.operations.vectorized", "TangentArrayOperation"),
+    ("calculator_mcp.operations.stream_statistics", "StreamOpenOperation"),
+    ("calculator_mcp.operations.stream_statistics", "StreamPushOperation"),
+    ("calculator_mcp.operations.stream_statistics", "StreamStatsOperation"),
+    ("calculator_mcp.operations.stream_statistics", "StreamCloseOperation"),
+    ("calculator_mcp.operations.factorize", "FactorizeOperation"),
+    ("calculator_mcp.operations.prime_range", "PrimesInRangeOperation"),
+    ("calculator_mcp.operations.prime_range", "CountPrimesOperation"),
+    ("calculator_mcp.operations.magnitude_array", "MagnitudeArrayOperation"),
+]
+
+# Prompt模块及类名，按注册顺序排列
+PROMPTS: List[Tuple[str, str]] = [
+    ("calculator_mcp.prompts.multiplication_table", "MultiplicationTablePrompt"),
+    ("calculator_mcp.prompts.health_metrics", "HealthMetricsPrompt"),
+    ("calculator_mcp.prompts.nutrition_planner", "NutritionPlannerPrompt"),
+]
+
+
+def import_component(module: str, class_name: str) -> Any:
+    """导入模块并返回其中的运算或Prompt类"""
+    return getattr(importlib.import_module(module), class_name)
+
+
+def compute_source_hash() -> str:
+    """计算运算、Prompt及其依赖的注册、工具函数源码的哈希"""
+    paths = [PACKAGE_DIR / "manifest.py"]
+    for package in SOURCE_PACKAGES:
+        paths.extend(sorted((PACKAGE_DIR / package).glob("*.py")))
+    
+    digest = hashlib.sha256()
+    for path in paths:
+        digest.update(path.relative_to(PACKAGE_DIR).as_posix().encode("utf-8"))
+        digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
+def default_cache_dir() -> Path:
+    """清单缓存目录：优先使用环境变量，其次为用户缓存目录"""
+    if os.environ.get(CACHE_DIR_ENV):
+        return Path(os.environ[CACHE_DIR_ENV])
+    cache_home = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(cache_home) / "calculator-mcp"
+
+
+def build_manifest() -> Dict[str, Any]:
+    """导入所有运算和Prompt模块，生成注册清单"""
+    operations = []
+    for module, class_name in OPERATIONS:
+        operation = import_component(module, class_name)()
+        operations.append({
+            "name": operation.name,
+            "description": operation.description,
+            "module": module,
+            "class": class_name,
+            "parameters": model_parameters(operation.input_model),
+        })
+
+    prompts = []
+    for module, class_name in PROMPTS:
+        prompt = import_component(module, class_name)()
+        prompts.append({
+            "name": prompt.name,
+            "description": prompt.description,
+            "module": module,
+            "class": class_name,
+            "parameters": model_parameters(prompt.arguments_schema, with_defaults=True),
+        })
+
+    return {"source_hash": compute_source_hash(), "operations": operations, "prompts": prompts}
+
+
+def write_manifest(manifest: Dict[str, Any], path: Path) -> None:
+    """将清单写入JSON文件（先写临时文件再替换，避免并发启动读到半个文件）"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    temp_path.write_text(json.dumps(manifest, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
+    os.replace(temp_path, path)
+
+
+def read_manifest(path: Path) -> Optional[Dict[str, Any]]:
+    """读取清单文件，文件不存在或损坏时返回None"""
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+
+
+def load_manifest(cache_dir: Optional[Path] = None) -> Dict[str, Any]:
+    """读取与当前源码哈希一致的清单
+
+    依次尝试打包的清单和缓存目录中的清单，都不一致时重新生成并写入缓存目录
+    """
+    source_hash = compute_source_hash()
+    cache_file = (cache_dir or default_cache_dir()) / "manifest.json"
+    
+    for path in (MANIFEST_FILE, cache_file):
+        manifest = read_manifest(path)
+        if manifest is not None and manifest.get("source_hash") == source_hash:
+            return manifest
+    
+    manifest = build_manifest()
+    try:
+        write_manifest(manifest, cache_file)
+    except OSError:
+        # 缓存目录不可写时仅跳过缓存
+        pass
+    return manifest
+
+
+def main():
+    """重新生成清单文件"""
+    parser = argparse.ArgumentParser(description="生成运算和Prompt注册清单")
+    parser.add_argument("--output", type=Path, default=MANIFEST_FILE, help="清单输出路径")
+    args = parser.parse_args()
+
+    manifest = build_manifest()
+    write_manifest(manifest, args.output)
+    print(f"已写入 {len(manifest['operations'])} 个运算和 {len(manifest['prompts'])} 个Prompt到 {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,35 +1,56 @@
 """
 运算操作模块
 """
-from .addition import AdditionOperation
-from .subtraction import SubtractionOperation
-from .multiplication import MultiplicationOperation
-from .division import DivisionOperation
-from .square import SquareOperation
-from .square_root import SquareRootOperation
-from .nth_root import NthRootOperation
-from .cube import CubeOperation
-from .average import AverageOperation
-from .power import PowerOperation
-from .logarithm import LogarithmOperation
-from .absolute import AbsoluteOperation
-from .percentage import PercentageOperation
-from .median import MedianOperation
-from .standard_deviation import StandardDeviationOperation
-from .variance import VarianceOperation
-from .modulo import ModuloOperation
-from .gcd import GCDOperation
-from .lcm import LCMOperation
-from .sine import SineOperation
-from .cosine import CosineOperation
-from .tangent import TangentOperation
-from .simple_interest import SimpleInterestOperation
-from .compound_interest import CompoundInterestOperation
-from .discount import DiscountOperation
-from .factorial import FactorialOperation
-from .permutation import PermutationOperation
-from .combination import CombinationOperation
-from .prime_check import PrimeCheckOperation
+import importlib
+
+# 类名到所在子模块的映射，子模块在首次访问时才导入
+_MODULES = {
+    "AdditionOperation": "addition",
+    "SubtractionOperation": "subtraction",
+    "MultiplicationOperation": "multiplication",
+    "DivisionOperation": "division",
+    "SquareOperation": "square",
+    "SquareRootOperation": "square_root",
+    "NthRootOperation": "nth_root",
+    "CubeOperation": "cube",
+    "AverageOperation": "average",
+    "PowerOperation": "power",
+    "LogarithmOperation": "logarithm",
+    "AbsoluteOperation": "absolute",
+    "PercentageOperation": "percentage",
+    "MedianOperation": "median",
+    "StandardDeviationOperation": "standard_deviation",
+    "VarianceOperation": "variance",
+    "ModuloOperation": "modulo",
+    "GCDOperation": "gcd",
+    "LCMOperation": "lcm",
+    "SineOperation": "sine",
+    "CosineOperation": "cosine",
+    "TangentOperation": "tangent",
+    "SimpleInterestOperation": "simple_interest",
+    "CompoundInterestOperation": "compound_interest",
+    "DiscountOperation": "discount",
+    "FactorialOperation": "factorial",
+    "PermutationOperation": "permutation",
+    "CombinationOperation": "combination",
+    "PrimeCheckOperation": "prime_check",
+    "SquareArrayOperation": "vectorized",
+    "CubeArrayOperation": "vectorized",
+    "SquareRootArrayOperation": "vectorized",
+    "AbsoluteArrayOperation": "vectorized",
+    "LogarithmArrayOperation": "vectorized",
+    "SineArrayOperation": "vectorized",
+    "CosineArrayOperation": "vectorized",
+    "TangentArrayOperation": "vectorized",
+    "StreamOpenOperation": "stream_statistics",
+    "StreamPushOperation": "stream_statistics",
+    "StreamStatsOperation": "stream_statistics",
+    "StreamCloseOperation": "stream_statistics",
+    "FactorizeOperation": "factorize",
+    "PrimesInRangeOperation": "prime_range",
+    "CountPrimesOperation": "prime_range",
+    "MagnitudeArrayOperation": "magnitude_array",
+}
 
 __all__ = [
     "AdditionOperation",
@@ -60,5 +81,28 @@ __all__ = [
     "FactorialOperation",
     "PermutationOperation",
     "CombinationOperation",
-    "PrimeCheckOperation"
-]
\ No newline at end of file
+    "PrimeCheckOperation",
+    "SquareArrayOperation",
+    "CubeArrayOperation",
+    "SquareRootArrayOperation",
+    "AbsoluteArrayOperation",
+    "LogarithmArrayOperation",
+    "SineArrayOperation",
+    "CosineArrayOperation",
+    "TangentArrayOperation",
+    "StreamOpenOperation",
+    "StreamPushOperation",
+    "StreamStatsOperation",
+    "StreamCloseOperation",
+    "FactorizeOperation",
+    "PrimesInRangeOperation",
+    "CountPrimesOperation",
+    "MagnitudeArrayOperation"
+]
+
+
+def __getattr__(name):
+    if name in _MODULES:
+        module = importlib.import_module(f".{_MODULES[name]}", __name__)
+        return getattr(module, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
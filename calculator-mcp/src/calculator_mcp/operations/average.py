@@ -9,6 +9,9 @@ from ..base.models import AverageInput, OperationResult
 from ..utils.validators import validate_finite_number
 from ..utils.formatters import format_result
 
+# 数值个数达到该值时交给执行后端在其他进程中计算
+OFFLOAD_THRESHOLD = 200_000
+
 
 class AverageOperation(BaseOperation):
     """平均数运算实现"""
@@ -25,6 +28,14 @@ class AverageOperation(BaseOperation):
     def input_model(self) -> Type[BaseModel]:
         return AverageInput
     
+    @property
+    def offloadable(self) -> bool:
+        return True
+    
+    @property
+    def offload_threshold(self) -> int:
+        return OFFLOAD_THRESHOLD
+    
     def validate_input(self, input_data: AverageInput) -> bool:
         """验证输入数据"""
         if not input_data.values:
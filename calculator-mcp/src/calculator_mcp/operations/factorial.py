@@ -3,14 +3,58 @@
 计算 n! = n × (n-1) × ... × 2 × 1
 """
 import math
-from typing import Type
-from pydantic import BaseModel, Field
+from typing import Optional, Type
+from pydantic import BaseModel, Field, field_validator
+from ..base.executor import OperationExecutor
 from ..base.operation import BaseOperation
-from ..base.models import OperationResult
+from ..base.models import ExactIntegerResult, MagnitudeResult, OperationResult
+from ..utils.factorials import MAX_EXACT_N, cache_factorial, cached_factorial, exact_factorial, to_decimal_string
+from ..utils.magnitude import MAX_MAGNITUDE_N, factorial_magnitude, format_scientific
+
+# 精确模式下直接返回十进制字符串的最大位数，更长的结果通过资源读取
+EXACT_INLINE_DIGITS = 10_000
+
+# 阶乘精确结果的资源URI
+RESOURCE_URI = "factorial://{n}"
+
+# 读取精确结果资源时n达到该值则交给执行后端在其他进程中计算
+EXACT_OFFLOAD_THRESHOLD = 50_000
 
 
 class FactorialInput(BaseModel):
     n: int = Field(..., description="非负整数", ge=0)
+    mode: Optional[str] = Field(
+        None,
+        description=(
+            f"计算模式: float(默认，n ≤ 170)、exact(精确整数，n ≤ {MAX_EXACT_N:,}) "
+            f"或 magnitude(只求log10、位数和科学计数法，n ≤ {MAX_MAGNITUDE_N:,})"
+        )
+    )
+    
+    @field_validator('mode')
+    @classmethod
+    def validate_mode(cls, v):
+        if v is not None and v not in ['float', 'exact', 'magnitude']:
+            raise ValueError("mode必须是 'float'、'exact' 或 'magnitude'")
+        return v
+
+
+def read_factorial(n: int) -> str:
+    """阶乘精确结果资源：n!的完整十进制字符串"""
+    return to_decimal_string(exact_factorial(n))
+
+
+async def load_factorial(n: int, executor: Optional[OperationExecutor] = None) -> str:
+    """读取阶乘精确结果资源
+
+    给出执行后端时，本进程未缓存的大n交给执行后端计算，结果写入本进程的缓存，
+    重复读取不会在不同的工作进程中重新计算
+    """
+    value = cached_factorial(n)
+    if value is None and executor is not None and n >= EXACT_OFFLOAD_THRESHOLD:
+        value = await executor.submit(exact_factorial, n)
+        cache_factorial(n, value)
+    return to_decimal_string(value) if value is not None else read_factorial(n)
 
 
 class FactorialOperation(BaseOperation):
@@ -21,7 +65,11 @@ class FactorialOperation(BaseOperation):
     
     @property
     def description(self) -> str:
-        return "计算阶乘: n! = n × (n-1) × ... × 2 × 1, 其中0! = 1"
+        return (
+            "计算阶乘: n! = n × (n-1) × ... × 2 × 1, 其中0! = 1；"
+            f"mode='exact'时返回精确整数（十进制字符串，超过{EXACT_INLINE_DIGITS:,}位时给出资源URI）；"
+            "mode='magnitude'时返回log10、位数和科学计数法"
+        )
     
     @property
     def input_model(self) -> Type[BaseModel]:
@@ -30,6 +78,10 @@ class FactorialOperation(BaseOperation):
     def validate_input(self, input_data: FactorialInput) -> bool:
         if input_data.n < 0:
             return False
+        if input_data.mode == "exact":
+            return input_data.n <= MAX_EXACT_N
+        if input_data.mode == "magnitude":
+            return input_data.n <= MAX_MAGNITUDE_N
         if input_data.n > 170:
             return False
         return True
@@ -38,8 +90,12 @@ class FactorialOperation(BaseOperation):
         if not self.validate_input(input_data):
             if input_data.n < 0:
                 error_msg = "阶乘只定义在非负整数上"
+            elif input_data.mode == "exact":
+                error_msg = f"数值过大(精确模式最大支持n = {MAX_EXACT_N:,})"
+            elif input_data.mode == "magnitude":
+                error_msg = f"数值过大(数量级模式最大支持n = {MAX_MAGNITUDE_N:,})"
             else:
-                error_msg = "数值过大(n > 170会导致溢出), 请使用更小的值"
+                error_msg = "数值过大(n > 170会导致溢出), 请使用更小的值，或使用mode='exact'获取精确整数"
             
             return OperationResult(
                 success=False,
@@ -49,10 +105,12 @@ class FactorialOperation(BaseOperation):
             )
         
         try:
-            result = math.factorial(input_data.n)
+            if input_data.mode == "exact":
+                return self._execute_exact(input_data.n)
+            if input_data.mode == "magnitude":
+                return self._execute_magnitude(input_data.n)
             
-            result_str = str(result)
-            digit_count = len(result_str)
+            result = math.factorial(input_data.n)
             
             return OperationResult(
                 success=True,
@@ -61,7 +119,7 @@ class FactorialOperation(BaseOperation):
                 metadata={
                     "n": input_data.n,
                     "result_integer": result,
-                    "digit_count": digit_count,
+                    "digit_count": factorial_magnitude(input_data.n).digit_count,
                     "formula": f"{input_data.n}!" if input_data.n <= 10 else f"{input_data.n}!",
                     "calculation": " × ".join([str(i) for i in range(input_data.n, 0, -1)]) if input_data.n <= 6 else f"{input_data.n} × {input_data.n-1} × ... × 2 × 1"
                 }
@@ -73,4 +131,54 @@ class FactorialOperation(BaseOperation):
                 result=0,
                 error_message=f"阶乘计算失败: {str(e)}",
                 operation_name=self.name
-            )
\ No newline at end of file
+            )
+    
+    def _execute_exact(self, n: int) -> OperationResult:
+        """精确模式：结果为十进制字符串，过长时给出资源URI
+
+        位数由数量级得出，过长的结果不在此计算，读取资源时才求出精确值
+        """
+        digits = factorial_magnitude(n).digit_count
+        inline = digits <= EXACT_INLINE_DIGITS
+        value = exact_factorial(n) if inline else None
+        
+        metadata = None
+        if self.detail != "none":
+            metadata = {
+                "n": n,
+                "digit_count": digits,
+                "formula": f"{n}!",
+                "inline": inline
+            }
+        
+        return ExactIntegerResult(
+            success=True,
+            result=float(value) if n <= 170 else None,
+            operation_name=self.name,
+            exact=to_decimal_string(value) if inline else None,
+            resource_uri=None if inline else RESOURCE_URI.format(n=n),
+            metadata=metadata
+        )
+    
+    def _execute_magnitude(self, n: int) -> OperationResult:
+        """数量级模式：结果为log10(n!)"""
+        magnitude = factorial_magnitude(n)
+        
+        metadata = None
+        if self.detail != "none":
+            metadata = {
+                "n": n,
+                "log10": str(magnitude.log10),
+                "scientific": format_scientific(magnitude),
+                "formula": f"log10({n}!)"
+            }
+        
+        return MagnitudeResult(
+            success=True,
+            result=float(magnitude.log10),
+            operation_name=self.name,
+            digit_count=magnitude.digit_count,
+            mantissa=magnitude.mantissa,
+            exponent=magnitude.exponent,
+            metadata=metadata
+        )
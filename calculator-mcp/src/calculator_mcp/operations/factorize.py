@@ -0,0 +1,72 @@
+"""
+质因数分解操作
+结合小质数试除、Pollard–Brent rho和Miller–Rabin检验分解整数
+"""
+from typing import Type
+from pydantic import BaseModel, Field
+from ..base.operation import BaseOperation
+from ..base.models import FactorizationResult, OperationResult
+from ..utils.number_theory import FactorizationError, factorize, format_factorization
+
+# 达到该值的数在线程池中分解（2^40以上的半素数分解耗时超过1毫秒）
+THREAD_MIN_NUMBER = 2**40
+
+
+class FactorizeInput(BaseModel):
+    """质因数分解输入模型"""
+    number: int = Field(..., description="待分解的整数", gt=1)
+
+
+class FactorizeOperation(BaseOperation):
+    """质因数分解操作"""
+    
+    @property
+    def name(self) -> str:
+        return "factorize"
+    
+    @property
+    def description(self) -> str:
+        return "将大于1的整数分解为质因数的乘积，返回 [质数, 指数] 列表"
+    
+    @property
+    def input_model(self) -> Type[BaseModel]:
+        return FactorizeInput
+    
+    def cpu_bound(self, input_data: FactorizeInput) -> bool:
+        # 两个质因数都很大时rho会用满迭代预算，耗时约1秒；较小的数在事件循环中直接分解
+        return input_data.number >= THREAD_MIN_NUMBER
+    
+    def validate_input(self, input_data: FactorizeInput) -> bool:
+        return input_data.number > 1
+    
+    async def execute(self, input_data: FactorizeInput) -> OperationResult:
+        if not self.validate_input(input_data):
+            return OperationResult(
+                success=False,
+                error_message="质因数分解只适用于大于1的整数",
+                operation_name=self.name
+            )
+        
+        try:
+            factorization = factorize(input_data.number)
+        except FactorizationError as e:
+            return OperationResult(success=False, error_message=str(e), operation_name=self.name)
+        
+        factors = [[prime, exponent] for prime, exponent in factorization]
+        divisor_count = 1
+        for _, exponent in factorization:
+            divisor_count *= exponent + 1
+        
+        return FactorizationResult(
+            success=True,
+            operation_name=self.name,
+            factors=factors,
+            metadata={
+                "number": input_data.number,
+                "is_prime": factors == [[input_data.number, 1]],
+                "distinct_prime_count": len(factors),
+                "prime_factor_count": sum(exponent for _, exponent in factorization),
+                "divisor_count": divisor_count,
+                "expression": f"{input_data.number} = {format_factorization(factorization)}"
+            }
+        )
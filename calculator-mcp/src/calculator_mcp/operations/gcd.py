@@ -7,6 +7,7 @@ from typing import Type, List
 from pydantic import BaseModel, Field, field_validator
 from ..base.operation import BaseOperation
 from ..base.models import OperationResult
+from ..utils.number_theory import METADATA_RHO_BUDGET, FactorizationError, factorize
 
 
 class GCDInput(BaseModel):
@@ -16,13 +17,11 @@ class GCDInput(BaseModel):
     @field_validator('numbers')
     @classmethod
     def validate_numbers(cls, v):
+        # 元素类型已由List[int]在pydantic-core中校验，这里不再逐个检查
         if len(v) < 2:
             raise ValueError("计算最大公约数至少需要2个整数")
-        for num in v:
-            if not isinstance(num, int):
-                raise ValueError(f"列表中包含非整数元素: {num}")
         # 至少有一个非零数
-        if all(n == 0 for n in v):
+        if not any(v):
             raise ValueError("不能全部为0")
         return v
 
@@ -47,7 +46,7 @@ class GCDOperation(BaseOperation):
         if len(input_data.numbers) < 2:
             return False
         # 不能全部为0
-        if all(n == 0 for n in input_data.numbers):
+        if not any(input_data.numbers):
             return False
         return True
     
@@ -74,24 +73,38 @@ class GCDOperation(BaseOperation):
                     # 如果已经是1，可以提前结束
                     break
             
+            if self.detail == "none":
+                return OperationResult(success=True, result=result, operation_name=self.name)
+            
             # 判断是否互质
             is_coprime = (result == 1)
             
-            # 计算每个数除以GCD的结果（化简后的数）
-            reduced_numbers = [n // result for n in abs_numbers] if result != 0 else abs_numbers
+            metadata = {
+                "count": len(input_data.numbers),
+                "is_coprime": is_coprime
+            }
+            if self.detail == "full":
+                # 计算每个数除以GCD的结果（化简后的数）
+                reduced_numbers = [n // result for n in abs_numbers] if result != 0 else abs_numbers
+                metadata.update({
+                    "original_numbers": input_data.numbers,
+                    "absolute_numbers": abs_numbers,
+                    "reduced_numbers": reduced_numbers,
+                    "gcd_notation": f"GCD({', '.join(map(str, input_data.numbers))})"
+                })
+                try:
+                    # 与prime_check、lcm、factorize共用因数分解缓存；只用元数据的分解预算，不长时间占用事件循环
+                    factorization = factorize(result, METADATA_RHO_BUDGET)
+                    metadata["prime_factorization"] = [list(pair) for pair in factorization]
+                    metadata["factorization_complete"] = True
+                except FactorizationError:
+                    metadata["factorization_complete"] = False
             
             return OperationResult(
                 success=True,
                 result=result,
                 operation_name=self.name,
-                metadata={
-                    "count": len(input_data.numbers),
-                    "original_numbers": input_data.numbers,
-                    "absolute_numbers": abs_numbers,
-                    "is_coprime": is_coprime,
-                    "reduced_numbers": reduced_numbers,
-                    "gcd_notation": f"GCD({', '.join(map(str, input_data.numbers))})"
-                }
+                metadata=metadata
             )
             
         except Exception as e:
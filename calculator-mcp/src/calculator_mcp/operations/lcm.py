@@ -7,6 +7,10 @@ from typing import Type, List
 from pydantic import BaseModel, Field, field_validator
 from ..base.operation import BaseOperation
 from ..base.models import OperationResult
+from ..utils.number_theory import METADATA_RHO_BUDGET, FactorizationError, factorize, merge_factorizations
+
+# 元数据中给出质因数分解时最多分解的整数个数
+MAX_FACTORIZED_NUMBERS = 32
 
 
 class LCMInput(BaseModel):
@@ -16,11 +20,9 @@ class LCMInput(BaseModel):
     @field_validator('numbers')
     @classmethod
     def validate_numbers(cls, v):
+        # 元素类型已由List[int]在pydantic-core中校验，这里不再逐个检查
         if len(v) < 2:
             raise ValueError("计算最小公倍数至少需要2个整数")
-        for num in v:
-            if not isinstance(num, int):
-                raise ValueError(f"列表中包含非整数元素: {num}")
         # 不能包含0
         if 0 in v:
             raise ValueError("包含0无法计算最小公倍数")
@@ -72,29 +74,40 @@ class LCMOperation(BaseOperation):
                 gcd_val = math.gcd(result, num)
                 result = (result * num) // gcd_val
             
+            if self.detail == "none":
+                return OperationResult(success=True, result=result, operation_name=self.name)
+            
             # 计算GCD用于验证
-            gcd_result = abs_numbers[0]
-            for num in abs_numbers[1:]:
-                gcd_result = math.gcd(gcd_result, num)
+            gcd_result = math.gcd(*abs_numbers)
             
-            # 验证LCM和GCD的关系
-            # 对于两个数：a * b = GCD(a,b) * LCM(a,b)
-            product = 1
-            for num in abs_numbers:
-                product *= num
+            metadata = {
+                "count": len(input_data.numbers),
+                "gcd": gcd_result,
+                "relationship": f"每个数都是LCM的因子，LCM是每个数的倍数"
+            }
+            if self.detail == "full":
+                metadata.update({
+                    "original_numbers": input_data.numbers,
+                    "absolute_numbers": abs_numbers,
+                    "lcm_notation": f"LCM({', '.join(map(str, input_data.numbers))})"
+                })
+                if len(abs_numbers) <= MAX_FACTORIZED_NUMBERS:
+                    try:
+                        # 由各数的质因数分解取最高指数得到，分解结果与prime_check、gcd、factorize共用缓存；
+                        # 每个数只用元数据的分解预算，任一个数超出预算即停止
+                        factorization = merge_factorizations(
+                            factorize(n, METADATA_RHO_BUDGET) for n in abs_numbers
+                        )
+                        metadata["prime_factorization"] = [list(pair) for pair in factorization]
+                        metadata["factorization_complete"] = True
+                    except FactorizationError:
+                        metadata["factorization_complete"] = False
             
             return OperationResult(
                 success=True,
                 result=result,
                 operation_name=self.name,
-                metadata={
-                    "count": len(input_data.numbers),
-                    "original_numbers": input_data.numbers,
-                    "absolute_numbers": abs_numbers,
-                    "gcd": gcd_result,
-                    "lcm_notation": f"LCM({', '.join(map(str, input_data.numbers))})",
-                    "relationship": f"每个数都是LCM的因子，LCM是每个数的倍数"
-                }
+                metadata=metadata
             )
             
         except Exception as e:
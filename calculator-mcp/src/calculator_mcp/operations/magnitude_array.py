@@ -0,0 +1,149 @@
+"""
+数组数量级运算操作
+对一组 (n, r) 计算阶乘、排列数或组合数的log10、位数和科学计数法
+"""
+from typing import List, Optional, Type
+from pydantic import BaseModel, Field, field_validator
+from ..base.operation import BaseOperation
+from ..base.models import MagnitudeArrayResult, OperationResult
+from ..base.vector_operation import MAX_REPORTED_INDICES
+from ..utils.magnitude import (
+    MAX_MAGNITUDE_N,
+    combination_magnitude,
+    factorial_magnitude,
+    permutation_magnitude,
+)
+
+# 单次调用最多处理的元素个数
+MAX_BATCH_SIZE = 10_000
+
+# 每个元素约0.4毫秒，卸载与直接计算耗时相同，只有规模足以摊销进程池启动（约2秒）时才交给执行后端
+OFFLOAD_THRESHOLD = 5_000
+
+# 元素个数达到该值（约20毫秒）时在线程池中计算，不阻塞事件循环
+THREAD_MIN_SIZE = 50
+
+_KINDS = {
+    "factorial": lambda n, r: factorial_magnitude(n),
+    "permutation": permutation_magnitude,
+    "combination": combination_magnitude,
+}
+
+
+class MagnitudeArrayInput(BaseModel):
+    kind: str = Field(..., description="函数: factorial(n!)、permutation(P(n,r)) 或 combination(C(n,r))")
+    n_values: List[int] = Field(
+        ...,
+        description=f"n的数组，0 ≤ n ≤ {MAX_MAGNITUDE_N:,}",
+        min_length=1,
+        max_length=MAX_BATCH_SIZE
+    )
+    r_values: Optional[List[int]] = Field(
+        None,
+        description="r的数组，与n_values等长，permutation和combination必填"
+    )
+
+    @field_validator('kind')
+    @classmethod
+    def validate_kind(cls, v):
+        if v not in _KINDS:
+            raise ValueError("kind必须是 'factorial'、'permutation' 或 'combination'")
+        return v
+
+
+class MagnitudeArrayOperation(BaseOperation):
+
+    @property
+    def name(self) -> str:
+        return "magnitude_array"
+
+    @property
+    def description(self) -> str:
+        return (
+            "数组数量级：对一组 (n, r) 计算 n!、P(n,r) 或 C(n,r) 的log10、位数和科学计数法，"
+            f"n最大{MAX_MAGNITUDE_N:,}，每个元素的耗时与n无关"
+        )
+
+    @property
+    def input_model(self) -> Type[BaseModel]:
+        return MagnitudeArrayInput
+
+    @property
+    def offloadable(self) -> bool:
+        return True
+
+    @property
+    def offload_threshold(self) -> int:
+        return OFFLOAD_THRESHOLD
+
+    def offload_size(self, input_data: MagnitudeArrayInput) -> int:
+        return len(input_data.n_values)
+
+    def cpu_bound(self, input_data: MagnitudeArrayInput) -> bool:
+        return len(input_data.n_values) >= THREAD_MIN_SIZE
+
+    def validate_input(self, input_data: MagnitudeArrayInput) -> bool:
+        if input_data.kind == "factorial":
+            return input_data.r_values is None or len(input_data.r_values) == len(input_data.n_values)
+        return input_data.r_values is not None and len(input_data.r_values) == len(input_data.n_values)
+
+    def _invalid_indices(self, input_data: MagnitudeArrayInput) -> List[int]:
+        """超出定义域的元素索引"""
+        if input_data.kind == "factorial":
+            return [i for i, n in enumerate(input_data.n_values) if not 0 <= n <= MAX_MAGNITUDE_N]
+        return [
+            i for i, (n, r) in enumerate(zip(input_data.n_values, input_data.r_values))
+            if not 0 <= r <= n <= MAX_MAGNITUDE_N
+        ]
+
+    async def execute(self, input_data: MagnitudeArrayInput) -> OperationResult:
+        if not self.validate_input(input_data):
+            return OperationResult(
+                success=False,
+                error_message="r_values必须与n_values等长（permutation和combination必须提供r_values）",
+                operation_name=self.name
+            )
+
+        invalid = self._invalid_indices(input_data)
+        if invalid:
+            shown = invalid[:MAX_REPORTED_INDICES]
+            suffix = "..." if len(invalid) > MAX_REPORTED_INDICES else ""
+            return OperationResult(
+                success=False,
+                error_message=f"n和r必须满足 0 ≤ r ≤ n ≤ {MAX_MAGNITUDE_N:,}，非法元素索引: {shown}{suffix}",
+                operation_name=self.name,
+                metadata={
+                    "invalid_indices": invalid,
+                    "invalid_count": len(invalid)
+                }
+            )
+
+        try:
+            compute = _KINDS[input_data.kind]
+            r_values = input_data.r_values or [0] * len(input_data.n_values)
+            magnitudes = [compute(n, r) for n, r in zip(input_data.n_values, r_values)]
+
+            metadata = None
+            if self.detail != "none":
+                metadata = {
+                    "kind": input_data.kind,
+                    "count": len(magnitudes)
+                }
+                if self.detail == "full":
+                    metadata["max_digit_count"] = max(m.digit_count for m in magnitudes)
+
+            return MagnitudeArrayResult(
+                success=True,
+                operation_name=self.name,
+                results=[float(m.log10) for m in magnitudes],
+                digit_counts=[m.digit_count for m in magnitudes],
+                mantissas=[m.mantissa for m in magnitudes],
+                exponents=[m.exponent for m in magnitudes],
+                metadata=metadata
+            )
+        except Exception as e:
+            return OperationResult(
+                success=False,
+                error_message=f"数量级计算失败: {str(e)}",
+                operation_name=self.name
+            )
@@ -1,12 +1,20 @@
 """
 中位数运算操作
-计算数列的中位数
+计算数列的中位数和精确四分位数，大列表使用线性时间选择，不返回排序结果
 """
-from typing import Type, List
+import math
+from typing import Callable, Type, List, Tuple
+import numpy as np
 from pydantic import BaseModel, Field, field_validator
 from ..base.operation import BaseOperation
 from ..base.models import OperationResult
 
+# 达到该长度时使用选择算法代替整体排序，完整元数据也不再附带排序结果
+SELECTION_THRESHOLD = 2048
+
+# 数值个数达到该值时交给执行后端在其他进程中计算
+OFFLOAD_THRESHOLD = 200_000
+
 
 class MedianInput(BaseModel):
     """中位数运算输入模型"""
@@ -15,11 +23,9 @@ class MedianInput(BaseModel):
     @field_validator('numbers')
     @classmethod
     def validate_numbers(cls, v):
+        # 元素类型已由List[float]在pydantic-core中校验，这里不再逐个检查
         if len(v) == 0:
             raise ValueError("数字列表不能为空")
-        for num in v:
-            if not isinstance(num, (int, float)):
-                raise ValueError(f"列表中包含非数字元素: {num}")
         return v
 
 
@@ -38,10 +44,49 @@ class MedianOperation(BaseOperation):
     def input_model(self) -> Type[BaseModel]:
         return MedianInput
     
+    @property
+    def offloadable(self) -> bool:
+        return True
+    
+    @property
+    def offload_threshold(self) -> int:
+        return OFFLOAD_THRESHOLD
+    
     def validate_input(self, input_data: MedianInput) -> bool:
         """验证输入数据"""
         return len(input_data.numbers) > 0
     
+    @staticmethod
+    def _quantile_ranks(n: int, q: float) -> Tuple[int, int, float]:
+        """线性插值分位数所用的两个排序位置及插值权重（与numpy.quantile默认方法一致）"""
+        position = (n - 1) * q
+        lower = math.floor(position)
+        return lower, min(lower + 1, n - 1), position - lower
+    
+    def _needed_ranks(self, n: int) -> List[int]:
+        """计算中位数、四分位数和最值需要的全部排序位置"""
+        ranks = {0, n - 1, n // 2, max(n // 2 - 1, 0), n // 4, min(3 * n // 4, n - 1)}
+        for q in (0.25, 0.75):
+            lower, upper, _ = self._quantile_ranks(n, q)
+            ranks.update((lower, upper))
+        return sorted(ranks)
+    
+    def _quantile(self, order_stat: Callable[[int], float], n: int, q: float) -> float:
+        """由顺序统计量计算精确分位数"""
+        lower, upper, weight = self._quantile_ranks(n, q)
+        low_value = order_stat(lower)
+        return low_value + (order_stat(upper) - low_value) * weight
+    
+    def _order_statistics(self, numbers: List[float], ranks: List[int]) -> Callable[[int], float]:
+        """返回按排序位置取值的函数，只保证ranks中的位置可用
+
+        小列表直接排序；大列表用numpy.partition（introselect）一次选出所有需要的位置，期望O(n)
+        """
+        if len(numbers) < SELECTION_THRESHOLD:
+            return sorted(numbers).__getitem__
+        partitioned = np.partition(np.asarray(numbers, dtype=float), ranks)
+        return lambda rank: float(partitioned[rank])
+    
     async def execute(self, input_data: MedianInput) -> OperationResult:
         """执行中位数运算"""
         if not self.validate_input(input_data):
@@ -53,40 +98,54 @@ class MedianOperation(BaseOperation):
             )
         
         try:
-            # 排序数列
-            sorted_numbers = sorted(input_data.numbers)
-            n = len(sorted_numbers)
+            n = len(input_data.numbers)
+            
+            sorted_numbers = None
+            if self.detail == "full" and n < SELECTION_THRESHOLD:
+                # 小列表的完整元数据附带排序结果，直接整体排序
+                sorted_numbers = sorted(input_data.numbers)
+                order_stat = sorted_numbers.__getitem__
+            else:
+                order_stat = self._order_statistics(input_data.numbers, self._needed_ranks(n))
             
             # 计算中位数
             if n % 2 == 1:
                 # 奇数个元素，取中间值
-                median_index = n // 2
-                result = sorted_numbers[median_index]
+                result = order_stat(n // 2)
                 calculation_method = "奇数个元素，取中间值"
             else:
                 # 偶数个元素，取中间两个数的平均值
-                mid_index1 = n // 2 - 1
-                mid_index2 = n // 2
-                result = (sorted_numbers[mid_index1] + sorted_numbers[mid_index2]) / 2
+                result = (order_stat(n // 2 - 1) + order_stat(n // 2)) / 2
                 calculation_method = "偶数个元素，取中间两个数的平均值"
             
+            if self.detail == "none":
+                return OperationResult(success=True, result=result, operation_name=self.name)
+            
             # 计算四分位数（额外信息）
             q1_index = n // 4
             q3_index = 3 * n // 4
             
+            metadata = {
+                "count": n,
+                "calculation_method": calculation_method,
+                "min": order_stat(0),
+                "max": order_stat(n - 1),
+                "q1": self._quantile(order_stat, n, 0.25),
+                "q3": self._quantile(order_stat, n, 0.75),
+                "q1_approx": order_stat(q1_index) if n > 1 else result,
+                "q3_approx": order_stat(min(q3_index, n-1)) if n > 1 else result
+            }
+            if sorted_numbers is not None:
+                metadata["sorted_numbers"] = sorted_numbers
+            elif self.detail == "full":
+                # 大列表的排序结果与输入同样大，为它排序会抵消选择算法的收益
+                metadata["sorted_numbers_omitted"] = True
+            
             return OperationResult(
                 success=True,
                 result=result,
                 operation_name=self.name,
-                metadata={
-                    "count": n,
-                    "sorted_numbers": sorted_numbers,
-                    "calculation_method": calculation_method,
-                    "min": sorted_numbers[0],
-                    "max": sorted_numbers[-1],
-                    "q1_approx": sorted_numbers[q1_index] if n > 1 else result,
-                    "q3_approx": sorted_numbers[min(q3_index, n-1)] if n > 1 else result
-                }
+                metadata=metadata
             )
             
         except Exception as e:
@@ -3,15 +3,33 @@
 计算 P(n,r) = n!/(n-r)!
 """
 import math
-from typing import Type
-from pydantic import BaseModel, Field
+from typing import Optional, Type
+from pydantic import BaseModel, Field, field_validator
 from ..base.operation import BaseOperation
-from ..base.models import OperationResult
+from ..base.models import MagnitudeResult, OperationResult
+from ..utils.magnitude import MAX_MAGNITUDE_N, format_scientific, permutation_magnitude
+from ..utils.modular import MAX_MODULUS, permutation_mod, modulus_error
 
 
 class PermutationInput(BaseModel):
     n: int = Field(..., description="总数", ge=0)
     r: int = Field(..., description="选取数", ge=0)
+    mode: Optional[str] = Field(
+        None,
+        description=f"计算模式: float(默认，n ≤ 170) 或 magnitude(只求log10、位数和科学计数法，n ≤ {MAX_MAGNITUDE_N:,})"
+    )
+    modulus: Optional[int] = Field(
+        None,
+        description=f"质数模数p（≤ {MAX_MODULUS:,}），给出时计算 P(n,r) mod p，n不受大小限制",
+        ge=2
+    )
+    
+    @field_validator('mode')
+    @classmethod
+    def validate_mode(cls, v):
+        if v is not None and v not in ['float', 'magnitude']:
+            raise ValueError("mode必须是 'float' 或 'magnitude'")
+        return v
 
 
 class PermutationOperation(BaseOperation):
@@ -22,7 +40,7 @@ class PermutationOperation(BaseOperation):
     
     @property
     def description(self) -> str:
-        return "计算排列数: P(n,r) = n!/(n-r)!, 从n个元素中选取r个元素的排列数"
+        return "计算排列数: P(n,r) = n!/(n-r)!, 从n个元素中选取r个元素的排列数；mode='magnitude'时返回log10、位数和科学计数法；给出质数modulus时返回模p的值"
     
     @property
     def input_model(self) -> Type[BaseModel]:
@@ -33,6 +51,10 @@ class PermutationOperation(BaseOperation):
             return False
         if input_data.r > input_data.n:
             return False
+        if input_data.modulus is not None:
+            return self._modulus_error(input_data) is None
+        if input_data.mode == "magnitude":
+            return input_data.n <= MAX_MAGNITUDE_N
         if input_data.n > 170:
             return False
         return True
@@ -43,8 +65,12 @@ class PermutationOperation(BaseOperation):
                 error_msg = "n和r必须是非负整数"
             elif input_data.r > input_data.n:
                 error_msg = "选取数r不能大于总数n"
+            elif input_data.modulus is not None:
+                error_msg = self._modulus_error(input_data)
+            elif input_data.mode == "magnitude":
+                error_msg = f"数值过大(数量级模式最大支持n = {MAX_MAGNITUDE_N:,})"
             else:
-                error_msg = "数值过大(n > 170), 请使用更小的值"
+                error_msg = "数值过大(n > 170), 请使用更小的值，或使用mode='magnitude'只求数量级"
             
             return OperationResult(
                 success=False,
@@ -54,6 +80,11 @@ class PermutationOperation(BaseOperation):
             )
         
         try:
+            if input_data.modulus is not None:
+                return self._execute_modular(input_data.n, input_data.r, input_data.modulus)
+            if input_data.mode == "magnitude":
+                return self._execute_magnitude(input_data.n, input_data.r)
+            
             result = math.perm(input_data.n, input_data.r)
             
             return OperationResult(
@@ -76,4 +107,55 @@ class PermutationOperation(BaseOperation):
                 result=0,
                 error_message=f"排列计算失败: {str(e)}",
                 operation_name=self.name
-            )
\ No newline at end of file
+            )
+    
+    def _execute_magnitude(self, n: int, r: int) -> OperationResult:
+        """数量级模式：结果为log10(P(n,r))"""
+        magnitude = permutation_magnitude(n, r)
+        
+        metadata = None
+        if self.detail != "none":
+            metadata = {
+                "n": n,
+                "r": r,
+                "log10": str(magnitude.log10),
+                "scientific": format_scientific(magnitude),
+                "formula": f"log10(P({n},{r}))"
+            }
+        
+        return MagnitudeResult(
+            success=True,
+            result=float(magnitude.log10),
+            operation_name=self.name,
+            digit_count=magnitude.digit_count,
+            mantissa=magnitude.mantissa,
+            exponent=magnitude.exponent,
+            metadata=metadata
+        )
+    
+    def _modulus_error(self, input_data: PermutationInput) -> Optional[str]:
+        if input_data.mode == "magnitude":
+            return "modulus不能与mode='magnitude'同时使用"
+        return modulus_error(input_data.modulus)
+    
+    def _execute_modular(self, n: int, r: int, modulus: int) -> OperationResult:
+        """模p模式：查模p的阶乘表和阶乘逆元表"""
+        result = permutation_mod(n, r, modulus)
+        
+        metadata = None
+        if self.detail != "none":
+            metadata = {
+                "n": n,
+                "r": r,
+                "modulus": modulus,
+                "result_integer": result,
+                "formula": f"P({n},{r}) mod {modulus}",
+                "method": "table"
+            }
+        
+        return OperationResult(
+            success=True,
+            result=float(result),
+            operation_name=self.name,
+            metadata=metadata
+        )
@@ -1,16 +1,73 @@
 """
 质数判断操作
-判断一个数是否为质数
+判断一个数是否为质数，或批量判断整数列表、整数区间中的每个数
 """
-import math
-from typing import Type
-from pydantic import BaseModel, Field
+import base64
+from typing import List, Optional, Tuple, Type
+from pydantic import BaseModel, Field, model_validator
+from ..base.executor import current_executor
 from ..base.operation import BaseOperation
-from ..base.models import OperationResult
+from ..base.models import OperationResult, PrimeListResult
+from ..utils import number_theory
+
+# 单次批量判断的整数个数上限
+MAX_BATCH_SIZE = 10**6
+
+# 因数元数据只做试除和短暂的rho尝试，两个质因数都很大时放弃分解（约10毫秒）
+FACTOR_RHO_BUDGET = number_theory.METADATA_RHO_BUDGET
+
+# 单个数达到该值时在线程池中判断（2^40以上的合数分解元数据耗时超过1毫秒）
+THREAD_MIN_NUMBER = 2**40
+
+# 批量判断的整数个数达到该值时分块交给执行后端，否则在当前进程内完成
+PARALLEL_THRESHOLD = 4096
 
 
 class PrimeCheckInput(BaseModel):
-    number: int = Field(..., description="待判断的整数", gt=1)
+    number: Optional[int] = Field(None, description="待判断的整数", gt=1)
+    numbers: Optional[List[int]] = Field(
+        None,
+        description="批量判断的整数列表（与number、start/stop三选一）",
+        min_length=1,
+        max_length=MAX_BATCH_SIZE
+    )
+    start: Optional[int] = Field(None, description="批量判断区间的起点（包含）", ge=0)
+    stop: Optional[int] = Field(None, description="批量判断区间的终点（包含）", ge=0)
+    
+    @model_validator(mode='after')
+    def validate_mode(self):
+        has_range = self.start is not None or self.stop is not None
+        modes = sum([self.number is not None, self.numbers is not None, has_range])
+        if modes != 1:
+            raise ValueError("number、numbers和start/stop必须且只能提供一种")
+        if has_range:
+            if self.start is None or self.stop is None:
+                raise ValueError("区间判断需要同时提供start和stop")
+            if self.stop < self.start:
+                raise ValueError("区间终点不能小于起点")
+            if self.stop - self.start >= MAX_BATCH_SIZE:
+                raise ValueError(f"区间长度不能超过{MAX_BATCH_SIZE:,}")
+        return self
+
+
+async def check_many(numbers: List[int]) -> bytes:
+    """批量素性检验，返回number_theory.prime_bits格式的位图
+
+    数量较多时把列表切成连续的块分给执行后端（Ray或进程池）的每个工作进程，
+    块长为8的倍数，各进程传回的位图可以直接按顺序拼接；
+    注册器关闭了卸载（CALCULATOR_MCP_OFFLOAD=0）时在当前进程内完成
+    """
+    executor = current_executor() if len(numbers) >= PARALLEL_THRESHOLD else None
+    if executor is None:
+        return number_theory.prime_bits(numbers)
+    
+    chunk_size = -(-len(numbers) // executor.workers)
+    chunk_size += -chunk_size % 8
+    chunks = await executor.map(
+        number_theory.prime_bits,
+        [numbers[i:i + chunk_size] for i in range(0, len(numbers), chunk_size)]
+    )
+    return b"".join(chunks)
 
 
 class PrimeCheckOperation(BaseOperation):
@@ -21,64 +78,74 @@ class PrimeCheckOperation(BaseOperation):
     
     @property
     def description(self) -> str:
-        return "判断一个整数是否为质数(素数)"
+        return (
+            "判断一个整数是否为质数(素数)，使用Miller–Rabin检验，64位以内结果确定，更大的整数为概率性检验；"
+            "也可用numbers传入整数列表或用start/stop指定区间批量判断，返回其中的质数"
+        )
     
     @property
     def input_model(self) -> Type[BaseModel]:
         return PrimeCheckInput
     
+    def cpu_bound(self, input_data: PrimeCheckInput) -> bool:
+        # 合数的因数元数据需要rho分解，受FACTOR_RHO_BUDGET限制最多约10毫秒
+        return input_data.number is not None and input_data.number >= THREAD_MIN_NUMBER
+    
+    def offload_size(self, input_data: PrimeCheckInput) -> int:
+        # 批量判断的规模为整数个数，达到线程阈值时在线程池中执行
+        if input_data.numbers is not None:
+            return len(input_data.numbers)
+        if input_data.start is not None:
+            return input_data.stop - input_data.start + 1
+        return 1
+    
     def validate_input(self, input_data: PrimeCheckInput) -> bool:
-        if input_data.number <= 1:
-            return False
-        if input_data.number > 10**15:
-            return False
-        return True
+        if input_data.number is None:
+            return input_data.numbers is not None or input_data.start is not None
+        return input_data.number > 1
     
     def _is_prime(self, n: int) -> bool:
-        if n <= 1:
-            return False
-        if n <= 3:
-            return True
-        if n % 2 == 0 or n % 3 == 0:
-            return False
-        
-        i = 5
-        while i * i <= n:
-            if n % i == 0 or n % (i + 2) == 0:
-                return False
-            i += 6
-        
-        return True
+        return number_theory.is_prime(n)
     
-    def _find_factors(self, n: int, max_factors: int = 10) -> list:
-        factors = []
-        for i in range(2, min(int(math.sqrt(n)) + 1, 10000)):
-            if n % i == 0:
-                factors.append(i)
-                if len(factors) >= max_factors:
-                    break
-        return factors
+    def _find_factors(self, n: int, max_factors: int = 10) -> Tuple[list, list, bool]:
+        """返回 (不同质因数, [质数, 指数]列表, 是否完整分解)
+
+        元数据只使用FACTOR_RHO_BUDGET的分解预算，超出时只返回试除得到的小质因数；
+        结果（包括失败）随因数分解缓存，重复判断同一个数不再重复计算
+        """
+        try:
+            factorization = number_theory.factorize(n, FACTOR_RHO_BUDGET)
+        except number_theory.FactorizationError:
+            small = [p for p in number_theory.TRIAL_PRIMES if n % p == 0]
+            return small[:max_factors], [], False
+        return [p for p, _ in factorization], [[p, e] for p, e in factorization], True
     
     async def execute(self, input_data: PrimeCheckInput) -> OperationResult:
         if not self.validate_input(input_data):
-            if input_data.number <= 1:
-                error_msg = "质数判断只适用于大于1的整数"
-            else:
-                error_msg = "数值过大(最大支持10^15), 请使用更小的值"
-            
             return OperationResult(
                 success=False,
                 result=0,
-                error_message=error_msg,
+                error_message="质数判断只适用于大于1的整数",
                 operation_name=self.name
             )
         
         try:
+            if input_data.number is None:
+                return await self._execute_batch(input_data)
+            
             is_prime = self._is_prime(input_data.number)
             
-            factors = []
+            if self.detail == "none":
+                return OperationResult(
+                    success=True,
+                    result=1.0 if is_prime else 0.0,
+                    operation_name=self.name
+                )
+            
+            deterministic = number_theory.is_deterministic(input_data.number)
+            factors, factorization, complete = [], [[input_data.number, 1]], True
             if not is_prime:
-                factors = self._find_factors(input_data.number, max_factors=10)
+                factors, factorization, complete = self._find_factors(input_data.number)
             
             return OperationResult(
                 success=True,
@@ -90,7 +157,12 @@ class PrimeCheckOperation(BaseOperation):
                     "result_text": "是质数" if is_prime else "不是质数",
                     "factors": factors if not is_prime else [],
                     "factor_count": len(factors) if not is_prime else 0,
-                    "explanation": f"{input_data.number}是质数" if is_prime else f"{input_data.number}不是质数, 因数包括: {factors[:5]}" + ("..." if len(factors) > 5 else "")
+                    "prime_factorization": factorization,
+                    "factorization_complete": complete,
+                    "deterministic": deterministic,
+                    "method": "Miller–Rabin（确定性底数）" if deterministic
+                              else f"Miller–Rabin（概率性，误判概率 ≤ 4^-{number_theory.DEFAULT_ROUNDS}）",
+                    "explanation": f"{input_data.number}是质数" if is_prime else f"{input_data.number}不是质数, 质因数包括: {factors[:5]}" + ("..." if len(factors) > 5 else "")
                 }
             )
             
@@ -100,4 +172,49 @@ class PrimeCheckOperation(BaseOperation):
                 result=0,
                 error_message=f"质数判断失败: {str(e)}",
                 operation_name=self.name
-            )
\ No newline at end of file
+            )
+    
+    async def _execute_batch(self, input_data: PrimeCheckInput) -> OperationResult:
+        """批量判断整数列表或区间，结果为其中的质数"""
+        if input_data.numbers is not None:
+            numbers = input_data.numbers
+            bits = await check_many(numbers)
+            primes = [n for n, flag in zip(numbers, number_theory.iter_bits(bits, len(numbers))) if flag]
+        else:
+            numbers = range(input_data.start, input_data.stop + 1)
+            primes = await self._primes_in_range(input_data.start, input_data.stop)
+            if self.detail == "full":
+                bits = bytearray((len(numbers) + 7) // 8)
+                for p in primes:
+                    i = p - input_data.start
+                    bits[i >> 3] |= 1 << (i & 7)
+        
+        if self.detail == "none":
+            return PrimeListResult(success=True, result=len(primes), operation_name=self.name, primes=primes)
+        
+        metadata = {
+            "checked": len(numbers),
+            "prime_count": len(primes),
+            "composite_count": len(numbers) - len(primes)
+        }
+        if self.detail == "full":
+            # 第i位（按字节从低位起）对应第i个整数，base64编码
+            metadata["bitmap"] = base64.b64encode(bytes(bits)).decode("ascii")
+        
+        return PrimeListResult(
+            success=True,
+            result=len(primes),
+            operation_name=self.name,
+            primes=primes,
+            metadata=metadata
+        )
+    
+    async def _primes_in_range(self, start: int, stop: int) -> List[int]:
+        """区间在筛法支持范围内时直接筛分，否则逐个检验"""
+        # 筛法模块导入时会预计算质数表，只在区间判断时才导入
+        from ..utils import sieve
+        if stop <= sieve.SIEVE_LIMIT:
+            return sieve.primes_in_range(start, stop)
+        numbers = list(range(start, stop + 1))
+        bits = await check_many(numbers)
+        return [n for n, flag in zip(numbers, number_theory.iter_bits(bits, len(numbers))) if flag]
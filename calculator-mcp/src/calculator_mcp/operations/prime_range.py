@@ -0,0 +1,130 @@
+"""
+质数区间操作
+使用分段筛法列出或统计区间内的质数
+"""
+from typing import Type
+from pydantic import BaseModel, Field, model_validator
+from ..base.operation import BaseOperation
+from ..base.models import OperationResult, PrimeListResult
+from ..utils.sieve import SIEVE_LIMIT, count_primes, primes_in_range
+
+# 单次调用允许的区间长度上限
+MAX_LIST_RANGE = 10**6
+MAX_COUNT_RANGE = 10**8
+
+# 区间长度达到该值时交给执行后端在其他进程中筛选
+LIST_OFFLOAD_THRESHOLD = 500_000
+COUNT_OFFLOAD_THRESHOLD = 5 * 10**6
+
+
+class PrimeRangeInput(BaseModel):
+    """质数区间输入模型"""
+    start: int = Field(..., description="区间起点（包含）", ge=0, le=SIEVE_LIMIT)
+    stop: int = Field(..., description="区间终点（包含）", ge=0, le=SIEVE_LIMIT)
+    
+    @model_validator(mode='after')
+    def validate_range(self):
+        if self.stop < self.start:
+            raise ValueError("区间终点不能小于起点")
+        return self
+
+
+class PrimesInRangeOperation(BaseOperation):
+    """列出区间内的质数"""
+    
+    @property
+    def name(self) -> str:
+        return "primes_in_range"
+    
+    @property
+    def description(self) -> str:
+        return f"列出 start ≤ n ≤ stop 中的全部质数（分段筛法，stop最大10^12，区间长度最大{MAX_LIST_RANGE:,}）"
+    
+    @property
+    def input_model(self) -> Type[BaseModel]:
+        return PrimeRangeInput
+    
+    @property
+    def offloadable(self) -> bool:
+        return True
+    
+    @property
+    def offload_threshold(self) -> int:
+        return LIST_OFFLOAD_THRESHOLD
+    
+    def offload_size(self, input_data: PrimeRangeInput) -> int:
+        return input_data.stop - input_data.start + 1
+    
+    def validate_input(self, input_data: PrimeRangeInput) -> bool:
+        return input_data.stop - input_data.start < MAX_LIST_RANGE
+    
+    async def execute(self, input_data: PrimeRangeInput) -> OperationResult:
+        if not self.validate_input(input_data):
+            return OperationResult(
+                success=False,
+                error_message=f"区间长度不能超过{MAX_LIST_RANGE:,}，只需数量时请使用count_primes",
+                operation_name=self.name
+            )
+        
+        primes = primes_in_range(input_data.start, input_data.stop)
+        return PrimeListResult(
+            success=True,
+            result=len(primes),
+            operation_name=self.name,
+            primes=primes,
+            metadata={
+                "start": input_data.start,
+                "stop": input_data.stop,
+                "count": len(primes)
+            }
+        )
+
+
+class CountPrimesOperation(BaseOperation):
+    """统计区间内的质数个数"""
+    
+    @property
+    def name(self) -> str:
+        return "count_primes"
+    
+    @property
+    def description(self) -> str:
+        return f"统计 start ≤ n ≤ stop 中的质数个数（分段筛法，stop最大10^12，区间长度最大{MAX_COUNT_RANGE:,}）"
+    
+    @property
+    def input_model(self) -> Type[BaseModel]:
+        return PrimeRangeInput
+    
+    @property
+    def offloadable(self) -> bool:
+        return True
+    
+    @property
+    def offload_threshold(self) -> int:
+        return COUNT_OFFLOAD_THRESHOLD
+    
+    def offload_size(self, input_data: PrimeRangeInput) -> int:
+        return input_data.stop - input_data.start + 1
+    
+    def validate_input(self, input_data: PrimeRangeInput) -> bool:
+        return input_data.stop - input_data.start < MAX_COUNT_RANGE
+    
+    async def execute(self, input_data: PrimeRangeInput) -> OperationResult:
+        if not self.validate_input(input_data):
+            return OperationResult(
+                success=False,
+                error_message=f"区间长度不能超过{MAX_COUNT_RANGE:,}",
+                operation_name=self.name
+            )
+        
+        count = count_primes(input_data.start, input_data.stop)
+        return OperationResult(
+            success=True,
+            result=count,
+            operation_name=self.name,
+            metadata={
+                "start": input_data.start,
+                "stop": input_data.stop,
+                "density": count / (input_data.stop - input_data.start + 1)
+            }
+        )
@@ -8,6 +8,9 @@ from pydantic import BaseModel, Field, field_validator
 from ..base.operation import BaseOperation
 from ..base.models import OperationResult
 
+# 数值个数达到该值时交给执行后端在其他进程中计算
+OFFLOAD_THRESHOLD = 200_000
+
 
 class StandardDeviationInput(BaseModel):
     """标准差运算输入模型"""
@@ -39,6 +42,14 @@ class StandardDeviationOperation(BaseOperation):
     def input_model(self) -> Type[BaseModel]:
         return StandardDeviationInput
     
+    @property
+    def offloadable(self) -> bool:
+        return True
+    
+    @property
+    def offload_threshold(self) -> int:
+        return OFFLOAD_THRESHOLD
+    
     def validate_input(self, input_data: StandardDeviationInput) -> bool:
         """验证输入数据"""
         return len(input_data.numbers) >= 2
@@ -81,6 +92,9 @@ class StandardDeviationOperation(BaseOperation):
             # 计算变异系数（标准差相对于平均值的比例）
             coefficient_of_variation = (result / abs(mean) * 100) if mean != 0 else None
             
+            if self.detail == "none":
+                return OperationResult(success=True, result=result, operation_name=self.name)
+            
             return OperationResult(
                 success=True,
                 result=result,
@@ -0,0 +1,222 @@
+"""
+流式统计运算操作
+打开数据流后分批追加数值，随时读取均值、方差、标准差、最值和计数，无需重发历史数据
+数据流属于打开它的MCP会话，长时间未使用时自动清理
+"""
+from typing import List, Type
+from fastmcp.server.dependencies import get_context
+from mcp_types.version import HANDSHAKE_PROTOCOL_VERSIONS
+from pydantic import BaseModel, Field
+from ..base.operation import BaseOperation
+from ..base.models import OperationResult, StreamResult
+from ..utils.streaming import RunningStatistics, stream_store
+from ..utils.validators import validate_finite_number
+
+
+class StreamOpenInput(BaseModel):
+    """打开数据流输入模型"""
+    pass
+
+
+class StreamPushInput(BaseModel):
+    """追加数据输入模型"""
+    stream_id: str = Field(..., description="stream_open返回的数据流ID")
+    numbers: List[float] = Field(..., description="本批追加的数字列表", min_length=1)
+
+
+class StreamStatsInput(BaseModel):
+    """读取统计量输入模型"""
+    stream_id: str = Field(..., description="stream_open返回的数据流ID")
+    is_sample: bool = Field(True, description="方差和标准差按样本（True）还是总体（False）计算")
+
+
+class StreamCloseInput(BaseModel):
+    """关闭数据流输入模型"""
+    stream_id: str = Field(..., description="stream_open返回的数据流ID")
+
+
+# 没有会话的调用（直接通过注册器或运算对象调用、无会话的MCP协议版本）共用的会话ID
+LOCAL_SESSION = "local"
+
+def current_session() -> str:
+    """当前调用所属的MCP会话ID
+
+    握手协议的连接在整个会话期间保持，按会话ID隔离数据流；每个请求独立的连接
+    （2026及之后的无会话协议）没有会话，与非MCP调用共用LOCAL_SESSION。
+    FastMCP没有公开的会话结束钩子，数据流统一按空闲时间清理
+    """
+    try:
+        context = get_context()
+        protocol_version = context.session.protocol_version
+    except RuntimeError:
+        return LOCAL_SESSION
+    if protocol_version not in HANDSHAKE_PROTOCOL_VERSIONS:
+        return LOCAL_SESSION
+    return context.session_id
+
+
+def _unknown_stream(operation_name: str, stream_id: str) -> OperationResult:
+    return OperationResult(
+        success=False,
+        error_message=f"未知数据流: {stream_id}（可能已关闭、因长时间未使用被清理或不属于当前会话）",
+        operation_name=operation_name
+    )
+
+
+def _stats_result(
+    operation_name: str,
+    stream_id: str,
+    statistics: RunningStatistics,
+    is_sample: bool
+) -> StreamResult:
+    snapshot = statistics.snapshot(is_sample)
+    snapshot["variance_type"] = "样本" if is_sample else "总体"
+    return StreamResult(
+        success=True,
+        result=snapshot["mean"],
+        operation_name=operation_name,
+        stream_id=stream_id,
+        metadata=snapshot
+    )
+
+
+class StreamOpenOperation(BaseOperation):
+    """打开数据流"""
+
+    @property
+    def name(self) -> str:
+        return "stream_open"
+
+    @property
+    def description(self) -> str:
+        return "打开一个流式统计数据流，返回数据流ID(stream_id)，之后用stream_push分批追加数值；数据流只在当前会话中有效"
+
+    @property
+    def input_model(self) -> Type[BaseModel]:
+        return StreamOpenInput
+
+    @property
+    def cacheable(self) -> bool:
+        # 结果取决于数据流的当前状态
+        return False
+
+    def validate_input(self, input_data: StreamOpenInput) -> bool:
+        return True
+
+    async def execute(self, input_data: StreamOpenInput) -> OperationResult:
+        try:
+            stream_id = stream_store.open(current_session())
+        except ValueError as e:
+            return OperationResult(success=False, error_message=str(e), operation_name=self.name)
+
+        return StreamResult(success=True, operation_name=self.name, stream_id=stream_id)
+
+
+class StreamPushOperation(BaseOperation):
+    """向数据流追加数值"""
+
+    @property
+    def name(self) -> str:
+        return "stream_push"
+
+    @property
+    def description(self) -> str:
+        return "向数据流追加一批数值，使用在线算法更新统计量，返回累计数量"
+
+    @property
+    def input_model(self) -> Type[BaseModel]:
+        return StreamPushInput
+
+    @property
+    def cacheable(self) -> bool:
+        # 结果取决于数据流的当前状态
+        return False
+
+    def validate_input(self, input_data: StreamPushInput) -> bool:
+        return all(validate_finite_number(x) for x in input_data.numbers)
+
+    async def execute(self, input_data: StreamPushInput) -> OperationResult:
+        if not self.validate_input(input_data):
+            return OperationResult(
+                success=False,
+                error_message="数字列表中包含无穷大或NaN",
+                operation_name=self.name
+            )
+
+        try:
+            statistics = stream_store.get(current_session(), input_data.stream_id)
+        except KeyError:
+            return _unknown_stream(self.name, input_data.stream_id)
+
+        statistics.push(input_data.numbers)
+        return StreamResult(
+            success=True,
+            result=statistics.count,
+            operation_name=self.name,
+            stream_id=input_data.stream_id,
+            metadata={"pushed": len(input_data.numbers)}
+        )
+
+
+class StreamStatsOperation(BaseOperation):
+    """读取数据流统计量"""
+
+    @property
+    def name(self) -> str:
+        return "stream_stats"
+
+    @property
+    def description(self) -> str:
+        return "读取数据流当前的均值、方差、标准差、最小值、最大值和数量，结果值为均值"
+
+    @property
+    def input_model(self) -> Type[BaseModel]:
+        return StreamStatsInput
+
+    @property
+    def cacheable(self) -> bool:
+        # 结果取决于数据流的当前状态
+        return False
+
+    def validate_input(self, input_data: StreamStatsInput) -> bool:
+        return bool(input_data.stream_id)
+
+    async def execute(self, input_data: StreamStatsInput) -> OperationResult:
+        try:
+            statistics = stream_store.get(current_session(), input_data.stream_id)
+        except KeyError:
+            return _unknown_stream(self.name, input_data.stream_id)
+
+        return _stats_result(self.name, input_data.stream_id, statistics, input_data.is_sample)
+
+
+class StreamCloseOperation(BaseOperation):
+    """关闭数据流"""
+
+    @property
+    def name(self) -> str:
+        return "stream_close"
+
+    @property
+    def description(self) -> str:
+        return "关闭数据流并返回最终统计量（按样本计算方差），关闭后数据流ID失效"
+
+    @property
+    def input_model(self) -> Type[BaseModel]:
+        return StreamCloseInput
+
+    @property
+    def cacheable(self) -> bool:
+        # 结果取决于数据流的当前状态
+        return False
+
+    def validate_input(self, input_data: StreamCloseInput) -> bool:
+        return bool(input_data.stream_id)
+
+    async def execute(self, input_data: StreamCloseInput) -> OperationResult:
+        try:
+            statistics = stream_store.close(current_session(), input_data.stream_id)
+        except KeyError:
+            return _unknown_stream(self.name, input_data.stream_id)
+
+        return _stats_result(self.name, input_data.stream_id, statistics, True)
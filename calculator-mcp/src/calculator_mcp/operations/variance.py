@@ -7,6 +7,9 @@ from pydantic import BaseModel, Field, field_validator
 from ..base.operation import BaseOperation
 from ..base.models import OperationResult
 
+# 数值个数达到该值时交给执行后端在其他进程中计算
+OFFLOAD_THRESHOLD = 200_000
+
 
 class VarianceInput(BaseModel):
     """方差运算输入模型"""
@@ -38,6 +41,14 @@ class VarianceOperation(BaseOperation):
     def input_model(self) -> Type[BaseModel]:
         return VarianceInput
     
+    @property
+    def offloadable(self) -> bool:
+        return True
+    
+    @property
+    def offload_threshold(self) -> int:
+        return OFFLOAD_THRESHOLD
+    
     def validate_input(self, input_data: VarianceInput) -> bool:
         """验证输入数据"""
         return len(input_data.numbers) >= 2
@@ -78,6 +89,9 @@ class VarianceOperation(BaseOperation):
             import math
             standard_deviation = math.sqrt(result)
             
+            if self.detail == "none":
+                return OperationResult(success=True, result=result, operation_name=self.name)
+            
             return OperationResult(
                 success=True,
                 result=result,
@@ -0,0 +1,219 @@
+"""
+数组一元运算操作
+对整个数组执行平方、立方、平方根、绝对值、对数和三角函数运算
+"""
+import math
+from typing import Type
+import numpy as np
+from pydantic import BaseModel, Field, field_validator
+from ..base.models import ArrayInput
+from ..base.vector_operation import VectorizedOperation, format_array
+
+
+class ArrayLogarithmInput(ArrayInput):
+    """数组对数运算输入模型"""
+    base: float = Field(
+        math.e,
+        description="对数底数（默认e为自然对数，10为常用对数）",
+        gt=0
+    )
+
+    @field_validator('base')
+    @classmethod
+    def validate_base(cls, v):
+        if v == 1:
+            raise ValueError("对数底数不能为1")
+        return v
+
+
+class ArrayAngleInput(ArrayInput):
+    """数组三角函数运算输入模型"""
+    unit: str = Field("degree", description="单位: 'degree'(角度) 或 'radian'(弧度)")
+
+    @field_validator('unit')
+    @classmethod
+    def validate_unit(cls, v: str) -> str:
+        if v not in ['degree', 'radian']:
+            raise ValueError("单位必须是 'degree' 或 'radian'")
+        return v
+
+
+def _to_radians(values: np.ndarray, input_data: ArrayAngleInput) -> np.ndarray:
+    return np.radians(values) if input_data.unit == "degree" else values
+
+
+def _snap_zero(values: np.ndarray) -> np.ndarray:
+    return np.where(np.abs(values) < 1e-10, 0.0, values)
+
+
+class SquareArrayOperation(VectorizedOperation):
+
+    @property
+    def name(self) -> str:
+        return "square_array"
+
+    @property
+    def description(self) -> str:
+        return "数组平方：对数组中每个元素计算平方 (value²)，一次调用处理整个数组"
+
+    @property
+    def input_model(self) -> Type[BaseModel]:
+        return ArrayInput
+
+    def kernel(self, values: np.ndarray, input_data: ArrayInput) -> np.ndarray:
+        return format_array(np.square(values))
+
+
+class CubeArrayOperation(VectorizedOperation):
+
+    @property
+    def name(self) -> str:
+        return "cube_array"
+
+    @property
+    def description(self) -> str:
+        return "数组立方：对数组中每个元素计算立方 (value³)，一次调用处理整个数组"
+
+    @property
+    def input_model(self) -> Type[BaseModel]:
+        return ArrayInput
+
+    def kernel(self, values: np.ndarray, input_data: ArrayInput) -> np.ndarray:
+        return format_array(np.power(values, 3))
+
+
+class SquareRootArrayOperation(VectorizedOperation):
+
+    @property
+    def name(self) -> str:
+        return "square_root_array"
+
+    @property
+    def description(self) -> str:
+        return "数组平方根：对数组中每个元素计算平方根 (√value)，负数元素会以索引形式报告"
+
+    @property
+    def input_model(self) -> Type[BaseModel]:
+        return ArrayInput
+
+    @property
+    def domain_error(self) -> str:
+        return "错误：不能计算负数的平方根"
+
+    def domain_mask(self, values: np.ndarray, input_data: ArrayInput) -> np.ndarray:
+        return values < 0
+
+    def kernel(self, values: np.ndarray, input_data: ArrayInput) -> np.ndarray:
+        return format_array(np.sqrt(values))
+
+
+class AbsoluteArrayOperation(VectorizedOperation):
+
+    @property
+    def name(self) -> str:
+        return "absolute_array"
+
+    @property
+    def description(self) -> str:
+        return "数组绝对值：对数组中每个元素计算绝对值 |x|"
+
+    @property
+    def input_model(self) -> Type[BaseModel]:
+        return ArrayInput
+
+    def kernel(self, values: np.ndarray, input_data: ArrayInput) -> np.ndarray:
+        return np.abs(values)
+
+
+class LogarithmArrayOperation(VectorizedOperation):
+
+    @property
+    def name(self) -> str:
+        return "logarithm_array"
+
+    @property
+    def description(self) -> str:
+        return "数组对数：对数组中每个元素计算指定底数的对数，非正数元素会以索引形式报告"
+
+    @property
+    def input_model(self) -> Type[BaseModel]:
+        return ArrayLogarithmInput
+
+    @property
+    def domain_error(self) -> str:
+        return "错误：对数只定义在正数上"
+
+    def domain_mask(self, values: np.ndarray, input_data: ArrayLogarithmInput) -> np.ndarray:
+        return values <= 0
+
+    def kernel(self, values: np.ndarray, input_data: ArrayLogarithmInput) -> np.ndarray:
+        if input_data.base == math.e:
+            return np.log(values)
+        if input_data.base == 10:
+            return np.log10(values)
+        return np.log(values) / math.log(input_data.base)
+
+
+class SineArrayOperation(VectorizedOperation):
+
+    @property
+    def name(self) -> str:
+        return "sine_array"
+
+    @property
+    def description(self) -> str:
+        return "数组正弦：对数组中每个角度计算正弦值，支持角度(degree)和弧度(radian)两种单位"
+
+    @property
+    def input_model(self) -> Type[BaseModel]:
+        return ArrayAngleInput
+
+    def kernel(self, values: np.ndarray, input_data: ArrayAngleInput) -> np.ndarray:
+        return _snap_zero(np.sin(_to_radians(values, input_data)))
+
+
+class CosineArrayOperation(VectorizedOperation):
+
+    @property
+    def name(self) -> str:
+        return "cosine_array"
+
+    @property
+    def description(self) -> str:
+        return "数组余弦：对数组中每个角度计算余弦值，支持角度(degree)和弧度(radian)两种单位"
+
+    @property
+    def input_model(self) -> Type[BaseModel]:
+        return ArrayAngleInput
+
+    def kernel(self, values: np.ndarray, input_data: ArrayAngleInput) -> np.ndarray:
+        return _snap_zero(np.cos(_to_radians(values, input_data)))
+
+
+class TangentArrayOperation(VectorizedOperation):
+
+    @property
+    def name(self) -> str:
+        return "tangent_array"
+
+    @property
+    def description(self) -> str:
+        return "数组正切：对数组中每个角度计算正切值，90°和270°(或π/2和3π/2)处的元素会以索引形式报告"
+
+    @property
+    def input_model(self) -> Type[BaseModel]:
+        return ArrayAngleInput
+
+    @property
+    def domain_error(self) -> str:
+        return "正切值在90°和270°(或π/2和3π/2)处无定义"
+
+    def domain_mask(self, values: np.ndarray, input_data: ArrayAngleInput) -> np.ndarray:
+        if input_data.unit == "degree":
+            normalized = np.mod(values, 360)
+            return (np.abs(normalized - 90) < 1e-10) | (np.abs(normalized - 270) < 1e-10)
+        normalized = np.mod(values, 2 * math.pi)
+        return (np.abs(normalized - math.pi / 2) < 1e-10) | (np.abs(normalized - 3 * math.pi / 2) < 1e-10)
+
+    def kernel(self, values: np.ndarray, input_data: ArrayAngleInput) -> np.ndarray:
+        return _snap_zero(np.tan(_to_radians(values, input_data)))
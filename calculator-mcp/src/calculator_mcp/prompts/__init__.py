@@ -2,10 +2,18 @@
 Prompt模块导出
 导出所有Prompt相关的类和接口
 """
-from .base_prompt import BasePrompt
-from .multiplication_table import MultiplicationTablePrompt, MultiplicationTableArguments
-from .health_metrics import HealthMetricsPrompt, HealthMetricsArguments
-from .nutrition_planner import NutritionPlannerPrompt, NutritionPlannerArguments
+import importlib
+
+# 类名到所在子模块的映射，子模块在首次访问时才导入
+_MODULES = {
+    "BasePrompt": "base_prompt",
+    "MultiplicationTablePrompt": "multiplication_table",
+    "MultiplicationTableArguments": "multiplication_table",
+    "HealthMetricsPrompt": "health_metrics",
+    "HealthMetricsArguments": "health_metrics",
+    "NutritionPlannerPrompt": "nutrition_planner",
+    "NutritionPlannerArguments": "nutrition_planner",
+}
 
 __all__ = [
     "BasePrompt",
@@ -15,4 +23,11 @@ __all__ = [
     "HealthMetricsArguments",
     "NutritionPlannerPrompt",
     "NutritionPlannerArguments",
-]
\ No newline at end of file
+]
+
+
+def __getattr__(name):
+    if name in _MODULES:
+        module = importlib.import_module(f".{_MODULES[name]}", __name__)
+        return getattr(module, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
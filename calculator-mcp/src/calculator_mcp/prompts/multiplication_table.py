@@ -151,7 +151,7 @@ Args:
         
         prompt += f"""
 
-请使用multiplication工具逐个计算每个乘法运算，确保结果准确。总共需要计算{args.size * args.size}个乘法运算。"""
+请使用batch_execute工具在一次调用中提交全部乘法运算（每项的operation为multiply，arguments为a和b），确保结果准确。总共需要计算{args.size * args.size}个乘法运算。"""
         
         return prompt
     
@@ -182,6 +182,6 @@ Output format requirements:
         
         prompt += f"""
 
-Please use the multiplication tool to calculate each multiplication operation individually to ensure accurate results. Total of {args.size * args.size} multiplication operations needed."""
+Please use the batch_execute tool to submit all multiplication operations in a single call (each item with operation "multiply" and arguments a and b) to ensure accurate results. Total of {args.size * args.size} multiplication operations needed."""
         
         return prompt
\ No newline at end of file
@@ -1,51 +1,38 @@
 """
 计算器MCP服务器主入口
-组装所有运算模块并启动服务器
+根据注册清单组装所有运算模块并启动服务器
 """
-import asyncio
+import json
+from pathlib import Path
+from typing import Optional
 from fastmcp import FastMCP
+from .base.executor import OperationExecutor, get_executor
+from .base.metrics import Metrics
 from .base.registry import OperationRegistry
+from .base.result_cache import ResultCache
+from .base.tracing import RingBufferExporter, Tracer, TracingMiddleware
 from .base.prompt_registry import PromptRegistry
-from .operations import (
-    AdditionOperation,
-    SubtractionOperation,
-    MultiplicationOperation,
-    DivisionOperation,
-    SquareOperation,
-    SquareRootOperation,
-    NthRootOperation,
-    CubeOperation,
-    AverageOperation,
-    PowerOperation,
-    LogarithmOperation,
-    AbsoluteOperation,
-    PercentageOperation,
-    MedianOperation,
-    StandardDeviationOperation,
-    VarianceOperation,
-    ModuloOperation,
-    GCDOperation,
-    LCMOperation,
-    SineOperation,
-    CosineOperation,
-    TangentOperation,
-    SimpleInterestOperation,
-    CompoundInterestOperation,
-    DiscountOperation,
-    FactorialOperation,
-    PermutationOperation,
-    CombinationOperation,
-    PrimeCheckOperation,
-)
-from .prompts import (
-    MultiplicationTablePrompt,
-    HealthMetricsPrompt,
-    NutritionPlannerPrompt,
-)
+from .manifest import load_manifest
 
 
-def create_calculator_server() -> FastMCP:
-    """创建计算器MCP服务器"""
+def create_calculator_server(
+    cache_dir: Optional[Path] = None,
+    detail: Optional[str] = None,
+    result_cache: Optional[ResultCache] = None,
+    metrics: Optional[Metrics] = None,
+    tracer: Optional[Tracer] = None,
+    executor: Optional[OperationExecutor] = None
+) -> FastMCP:
+    """创建计算器MCP服务器
+
+    cache_dir为注册清单缓存目录，默认读取CALCULATOR_MCP_CACHE_DIR或用户缓存目录；
+    detail为运算结果元数据的默认详细程度(none/summary/full)，默认读取CALCULATOR_MCP_DETAIL，未设置时为full；
+    result_cache为运算结果缓存，默认仅在设置了CALCULATOR_MCP_RESULT_CACHE（最大条目数）时启用；
+    metrics为工具和Prompt的调用指标，默认启用（CALCULATOR_MCP_METRICS=0时关闭），
+    设置CALCULATOR_MCP_METRICS_FILE时定期写出Prometheus文本格式文件；
+    tracer为调用追踪，默认仅在设置了CALCULATOR_MCP_TRACE=memory或CALCULATOR_MCP_TRACE_FILE时启用；
+    executor为大输入运算的执行后端，默认按CALCULATOR_MCP_EXECUTOR选择Ray或本机进程池
+    """
     # 初始化FastMCP服务器
     mcp = FastMCP(
         name="calculator-mcp",
@@ -53,57 +40,51 @@ def create_calculator_server() -> FastMCP:
         instructions="Modular calculator MCP server with comprehensive math operations and interactive prompts"
     )
     
-    # 创建运算注册器
-    registry = OperationRegistry(mcp)
+    # 读取注册清单，工具名称、描述和参数均来自清单，运算和Prompt模块在首次调用时才导入
+    manifest = load_manifest(cache_dir)
+    
+    # 创建运算注册器并注册所有运算操作
+    metrics = metrics or Metrics.from_env()
+    tracer = tracer or Tracer.from_env()
+    if tracer is not None:
+        mcp.add_middleware(TracingMiddleware(tracer))
+    registry = OperationRegistry(mcp, detail, result_cache or ResultCache.from_env(), metrics, tracer, executor)
+    for entry in manifest["operations"]:
+        registry.register_entry(entry)
+    
+    # 注册批量执行工具
+    registry.register_batch_tool()
     
-    # 注册所有运算操作
-    operations = [
-        AdditionOperation,
-        SubtractionOperation,
-        MultiplicationOperation,
-        DivisionOperation,
-        SquareOperation,
-        SquareRootOperation,
-        NthRootOperation,
-        CubeOperation,
-        AverageOperation,
-        PowerOperation,
-        LogarithmOperation,
-        AbsoluteOperation,
-        PercentageOperation,
-        MedianOperation,
-        StandardDeviationOperation,
-        VarianceOperation,
-        ModuloOperation,
-        GCDOperation,
-        LCMOperation,
-        SineOperation,
-        CosineOperation,
-        TangentOperation,
-        SimpleInterestOperation,
-        CompoundInterestOperation,
-        DiscountOperation,
-        FactorialOperation,
-        PermutationOperation,
-        CombinationOperation,
-        PrimeCheckOperation,
-    ]
+    # 注册表达式求值工具
+    registry.register_expression_tool()
     
-    for operation_class in operations:
-        registry.register(operation_class)
+    # 注册过长的精确阶乘结果资源，阶乘模块在首次读取时才导入；
+    # 阶乘工具只返回位数和URI，精确值在读取时计算，n较大时在执行后端中计算
+    @mcp.resource("factorial://{n}", description="n!的完整十进制字符串", mime_type="text/plain")
+    async def factorial_resource(n: int) -> str:
+        from .operations.factorial import load_factorial
+        return await load_factorial(n, (registry.executor or get_executor()) if registry.offload else None)
     
-    # 创建Prompt注册器
-    prompt_registry = PromptRegistry(mcp)
+    # 创建Prompt注册器并注册所有Prompt操作
+    prompt_registry = PromptRegistry(mcp, metrics, tracer)
+    for entry in manifest["prompts"]:
+        prompt_registry.register_entry(entry)
     
-    # 注册所有Prompt操作
-    prompts = [
-        MultiplicationTablePrompt,
-        HealthMetricsPrompt,
-        NutritionPlannerPrompt,
-    ]
+    # 注册调用指标资源
+    if metrics is not None:
+        @mcp.resource("metrics://calls", description="每个工具和Prompt的调用次数、失败次数、输入规模和分阶段延迟直方图", mime_type="application/json")
+        def metrics_resource() -> str:
+            return json.dumps(metrics.snapshot(), ensure_ascii=False)
+        
+        @mcp.resource("metrics://prometheus", description="Prometheus文本格式的调用指标", mime_type="text/plain")
+        def prometheus_resource() -> str:
+            return metrics.to_prometheus()
     
-    for prompt_class in prompts:
-        prompt_registry.register(prompt_class)
+    # 追踪到内存时，最近的span可通过资源读取
+    if tracer is not None and isinstance(tracer.exporter, RingBufferExporter):
+        @mcp.resource("traces://recent", description="最近的调用span（按结束顺序）", mime_type="application/json")
+        def traces_resource() -> str:
+            return json.dumps([span.to_dict() for span in tracer.exporter.spans()], ensure_ascii=False, default=str)
     
     return mcp
 
@@ -115,4 +96,4 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
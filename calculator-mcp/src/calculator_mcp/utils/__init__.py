@@ -20,6 +20,11 @@ from .errors import (
     create_error_response,
     validate_and_format_error
 )
+from .streaming import (
+    RunningStatistics,
+    StreamStore
+)
+from .number_theory import is_prime
 
 __all__ = [
     "validate_finite_number",
@@ -34,5 +39,8 @@ __all__ = [
     "ValidationError",
     "CalculationError",
     "create_error_response",
-    "validate_and_format_error"
+    "validate_and_format_error",
+    "RunningStatistics",
+    "StreamStore",
+    "is_prime"
 ]
\ No newline at end of file
@@ -0,0 +1,150 @@
+"""
+精确阶乘
+用质因数分解和二分乘积在decimal中计算任意大的阶乘，并缓存最近的结果
+
+decimal的大数乘法使用数论变换，远快于int的Karatsuba乘法；
+结果本身就是十进制，转换为字符串只需线性时间，不受int转字符串的位数限制
+"""
+import decimal
+import math
+import threading
+from collections import OrderedDict
+from decimal import Decimal
+from typing import Optional, Sequence, Tuple
+
+from .number_theory import primes_up_to
+
+# 精确模式支持的最大n
+MAX_EXACT_N = 10**6
+
+# 缓存的阶乘总位数上限（约合20MB内存）
+CACHE_MAX_DIGITS = 50_000_000
+
+# 不超过该值时直接用math.factorial计算后转换
+_DIRECT_LIMIT = 1000
+
+# 最近的缓存值m满足 n - m ≤ n / _EXTEND_RATIO 时从m!继续乘，否则重新计算
+_EXTEND_RATIO = 4
+
+# 二分乘积中直接用int相乘的最大元素个数
+_LEAF_SIZE = 32
+
+# 精度不受限的decimal上下文，保证乘法精确
+_CONTEXT = decimal.Context(prec=decimal.MAX_PREC, Emax=decimal.MAX_EMAX, Emin=decimal.MIN_EMIN)
+
+_cache: "OrderedDict[int, Decimal]" = OrderedDict()
+_cached_digits = 0
+_lock = threading.Lock()
+
+
+def digit_count(value: Decimal) -> int:
+    """整数值的十进制位数"""
+    return value.adjusted() + 1
+
+
+def _product(values: Sequence[int], lo: int, hi: int) -> Decimal:
+    """二分乘积 values[lo:hi]"""
+    if hi - lo <= _LEAF_SIZE:
+        result = 1
+        for i in range(lo, hi):
+            result *= values[i]
+        return _CONTEXT.create_decimal(result)
+    mid = (lo + hi) // 2
+    return _CONTEXT.multiply(_product(values, lo, mid), _product(values, mid, hi))
+
+
+def _factorial_by_primes(n: int) -> Decimal:
+    """n! = ∏ p^e(p)，按指数的二进制位分组，自高位起平方再乘以该位为1的质数之积"""
+    primes = primes_up_to(n)
+    exponents = []
+    for p in primes:
+        # Legendre公式
+        exponent, q = 0, n
+        while q:
+            q //= p
+            exponent += q
+        exponents.append(exponent)
+
+    result = _CONTEXT.create_decimal(1)
+    for bit in range(max(exponents).bit_length() - 1, -1, -1):
+        result = _CONTEXT.multiply(result, result)
+        group = [p for p, exponent in zip(primes, exponents) if exponent >> bit & 1]
+        if group:
+            result = _CONTEXT.multiply(result, _product(group, 0, len(group)))
+    return result
+
+
+def _nearest_cached(n: int) -> Optional[Tuple[int, Decimal]]:
+    with _lock:
+        below = [m for m in _cache if m <= n]
+        if not below:
+            return None
+        m = max(below)
+        _cache.move_to_end(m)
+        return m, _cache[m]
+
+
+def cached_factorial(n: int) -> Optional[Decimal]:
+    """缓存中的n!，未缓存时返回None"""
+    with _lock:
+        value = _cache.get(n)
+        if value is not None:
+            _cache.move_to_end(n)
+        return value
+
+
+def cache_factorial(n: int, value: Decimal) -> None:
+    """把在其他进程中算出的n!写入本进程的缓存"""
+    _store(n, value)
+
+
+def _store(n: int, value: Decimal) -> None:
+    global _cached_digits
+    digits = digit_count(value)
+    if digits > CACHE_MAX_DIGITS:
+        return
+    with _lock:
+        if n in _cache:
+            return
+        _cache[n] = value
+        _cached_digits += digits
+        while _cached_digits > CACHE_MAX_DIGITS:
+            _, evicted = _cache.popitem(last=False)
+            _cached_digits -= digit_count(evicted)
+
+
+def exact_factorial(n: int) -> Decimal:
+    """精确计算n!，结果为整数值的Decimal
+
+    若缓存中有不大于n且足够接近的m!，只需再乘上 (m+1)…n；计算结果写入LRU缓存
+    """
+    if n < 0:
+        raise ValueError("阶乘只定义在非负整数上")
+    if n > MAX_EXACT_N:
+        raise ValueError(f"精确阶乘最大支持n = {MAX_EXACT_N:,}")
+    if n <= _DIRECT_LIMIT:
+        return _CONTEXT.create_decimal(math.factorial(n))
+
+    nearest = _nearest_cached(n)
+    if nearest is not None and nearest[0] == n:
+        return nearest[1]
+    if nearest is not None and (n - nearest[0]) * _EXTEND_RATIO <= n:
+        m, cached = nearest
+        value = _CONTEXT.multiply(cached, _product(range(m + 1, n + 1), 0, n - m))
+    else:
+        value = _factorial_by_primes(n)
+    _store(n, value)
+    return value
+
+
+def to_decimal_string(value: Decimal) -> str:
+    """整数值Decimal的十进制字符串"""
+    return format(value, "f")
+
+
+def clear_cache() -> None:
+    """清空阶乘缓存"""
+    global _cached_digits
+    with _lock:
+        _cache.clear()
+        _cached_digits = 0
@@ -0,0 +1,116 @@
+"""
+阶乘、排列数和组合数的数量级
+用decimal中的Stirling级数计算ln(n!)，不需要求出整数本身，单次计算耗时与n无关
+
+math.lgamma只有双精度，n = 10^15时ln(n!)约为3.3×10^16，误差已超过1，
+无法给出位数和尾数，因此在50位精度的decimal中求和
+"""
+import decimal
+import math
+from decimal import Decimal
+from fractions import Fraction
+from functools import lru_cache
+from typing import NamedTuple
+
+# 数量级模式支持的最大n
+MAX_MAGNITUDE_N = 10**15
+
+# 计算精度：ln(n!)最多17位整数部分，其余为小数部分
+_CONTEXT = decimal.Context(prec=50)
+
+# 小于该值时对精确整数取对数，否则使用Stirling级数（截断误差小于10^-38）
+_STIRLING_MIN = 100
+
+# Stirling级数的系数 B_2k / (2k(2k-1))，k = 1..10
+_BERNOULLI = (
+    Fraction(1, 6), Fraction(-1, 30), Fraction(1, 42), Fraction(-1, 30), Fraction(5, 66),
+    Fraction(-691, 2730), Fraction(7, 6), Fraction(-3617, 510), Fraction(43867, 798),
+    Fraction(-174611, 330),
+)
+_STIRLING_COEFFICIENTS = tuple(
+    _CONTEXT.divide(Decimal(b.numerator), Decimal(b.denominator * 2 * k * (2 * k - 1)))
+    for k, b in enumerate(_BERNOULLI, start=1)
+)
+
+_PI = Decimal("3.14159265358979323846264338327950288419716939937510")
+_HALF_LN_2PI = _CONTEXT.multiply(Decimal("0.5"), _CONTEXT.ln(_CONTEXT.multiply(2, _PI)))
+_LN_10 = _CONTEXT.ln(Decimal(10))
+
+# log10与整数的距离小于该值且指数小于_SNAP_MAX_EXPONENT时，结果就是10的整数次幂
+_SNAP_TOLERANCE = Decimal("1e-30")
+_SNAP_MAX_EXPONENT = 24
+
+
+class Magnitude(NamedTuple):
+    """整数值的数量级：value ≈ mantissa × 10^exponent"""
+    log10: Decimal
+    digit_count: int
+    mantissa: float
+    exponent: int
+
+
+@lru_cache(maxsize=4096)
+def ln_factorial(n: int) -> Decimal:
+    """ln(n!)，约50位有效数字"""
+    if n < 0:
+        raise ValueError("阶乘只定义在非负整数上")
+    if n > MAX_MAGNITUDE_N:
+        raise ValueError(f"数量级模式最大支持n = {MAX_MAGNITUDE_N:,}")
+    if n < _STIRLING_MIN:
+        return _CONTEXT.ln(Decimal(math.factorial(n)))
+
+    ctx = _CONTEXT
+    x = Decimal(n)
+    ln_x = ctx.ln(x)
+    # (n + 1/2)·ln n − n + ln(2π)/2
+    result = ctx.add(ctx.subtract(ctx.multiply(ctx.add(x, Decimal("0.5")), ln_x), x), _HALF_LN_2PI)
+    inverse_square = ctx.divide(1, ctx.multiply(x, x))
+    power = ctx.divide(1, x)
+    for coefficient in _STIRLING_COEFFICIENTS:
+        result = ctx.add(result, ctx.multiply(coefficient, power))
+        power = ctx.multiply(power, inverse_square)
+    return result
+
+
+def _to_magnitude(ln_value: Decimal) -> Magnitude:
+    log10 = _CONTEXT.divide(ln_value, _LN_10)
+    nearest = log10.to_integral_value(rounding=decimal.ROUND_HALF_EVEN)
+    if abs(log10 - nearest) < _SNAP_TOLERANCE and nearest < _SNAP_MAX_EXPONENT:
+        # 计算误差可能使10^k的log10略小于k
+        exponent = int(nearest)
+        return Magnitude(Decimal(exponent), exponent + 1, 1.0, exponent)
+
+    exponent = int(log10.to_integral_value(rounding=decimal.ROUND_FLOOR))
+    # 小数部分在[0, 1)内，双精度足以给出尾数
+    mantissa = 10 ** float(log10 - exponent)
+    if mantissa >= 10:
+        mantissa /= 10
+        exponent += 1
+    return Magnitude(log10, exponent + 1, mantissa, exponent)
+
+
+def factorial_magnitude(n: int) -> Magnitude:
+    """n!的数量级"""
+    return _to_magnitude(ln_factorial(n))
+
+
+def permutation_magnitude(n: int, r: int) -> Magnitude:
+    """P(n,r) = n!/(n-r)!的数量级"""
+    if not 0 <= r <= n:
+        raise ValueError("选取数r必须满足 0 ≤ r ≤ n")
+    return _to_magnitude(_CONTEXT.subtract(ln_factorial(n), ln_factorial(n - r)))
+
+
+def combination_magnitude(n: int, r: int) -> Magnitude:
+    """C(n,r) = n!/(r!(n-r)!)的数量级"""
+    if not 0 <= r <= n:
+        raise ValueError("选取数r必须满足 0 ≤ r ≤ n")
+    return _to_magnitude(
+        _CONTEXT.subtract(ln_factorial(n), _CONTEXT.add(ln_factorial(r), ln_factorial(n - r)))
+    )
+
+
+def format_scientific(magnitude: Magnitude, digits: int = 15) -> str:
+    """科学计数法文本，如 9.33262154439441e+157"""
+    mantissa = f"{magnitude.mantissa:.{digits - 1}f}".rstrip("0").rstrip(".")
+    return f"{mantissa}e+{magnitude.exponent}"
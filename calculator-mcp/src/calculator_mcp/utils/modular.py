@@ -0,0 +1,93 @@
+"""
+模质数的组合数与排列数
+对每个模数p预先计算 0..p-1 的阶乘表和阶乘逆元表，之后每次查询只需查表；
+n ≥ p时组合数用Lucas定理按p进制逐位查表
+"""
+from array import array
+from functools import lru_cache
+from typing import NamedTuple, Optional
+
+from .number_theory import is_prime
+
+# 支持的最大模数，两张表共占8·p字节
+MAX_MODULUS = 10**6
+
+# 缓存的模数个数上限，超出时淘汰最久未使用的表
+TABLE_CACHE_SIZE = 8
+
+
+class FactorialTables(NamedTuple):
+    """模p的阶乘表和阶乘逆元表"""
+    modulus: int
+    factorials: array
+    inverse_factorials: array
+
+
+def modulus_error(p: int) -> Optional[str]:
+    """模数必须是不超过MAX_MODULUS的质数，不满足时返回错误信息"""
+    if p > MAX_MODULUS:
+        return f"模数过大(最大支持 {MAX_MODULUS:,})"
+    if not is_prime(p):
+        return "模数必须是质数"
+    return None
+
+
+@lru_cache(maxsize=TABLE_CACHE_SIZE)
+def factorial_tables(p: int) -> FactorialTables:
+    """计算模p的阶乘表和阶乘逆元表（结果按p缓存）"""
+    error = modulus_error(p)
+    if error:
+        raise ValueError(error)
+    factorials = array("I", bytes(4 * p))
+    factorials[0] = 1
+    value = 1
+    for i in range(1, p):
+        value = value * i % p
+        factorials[i] = value
+
+    # 由Wilson定理 (p-1)! ≡ -1，其逆元也是 p-1；再逐个乘回 i 得到 (i-1)! 的逆元
+    inverse_factorials = array("I", bytes(4 * p))
+    value = p - 1
+    for i in range(p - 1, 0, -1):
+        inverse_factorials[i] = value
+        value = value * i % p
+    inverse_factorials[0] = value
+    return FactorialTables(p, factorials, inverse_factorials)
+
+
+def _small_combination(tables: FactorialTables, n: int, r: int) -> int:
+    """C(n,r) mod p，其中 0 ≤ n < p"""
+    if r > n:
+        return 0
+    p = tables.modulus
+    return tables.factorials[n] * tables.inverse_factorials[r] % p * tables.inverse_factorials[n - r] % p
+
+
+def combination_mod(n: int, r: int, p: int) -> int:
+    """C(n,r) mod p，n ≥ p时使用Lucas定理：C(n,r) ≡ ∏ C(n_i, r_i)，n_i、r_i为p进制各位"""
+    if not 0 <= r <= n:
+        raise ValueError("选取数r必须满足 0 ≤ r ≤ n")
+    tables = factorial_tables(p)
+    result = 1
+    while r and result:
+        n, n_digit = divmod(n, p)
+        r, r_digit = divmod(r, p)
+        result = result * _small_combination(tables, n_digit, r_digit) % p
+    return result
+
+
+def permutation_mod(n: int, r: int, p: int) -> int:
+    """P(n,r) mod p，即 (n-r+1)·…·n mod p
+
+    r个连续整数中含有p的倍数时结果为0；否则它们模p后是一段连续的非零余数，
+    乘积等于两个阶乘表项之商
+    """
+    if not 0 <= r <= n:
+        raise ValueError("选取数r必须满足 0 ≤ r ≤ n")
+    tables = factorial_tables(p)
+    if r == 0:
+        return 1 % p
+    low, high = (n - r) % p, n % p
+    if r >= p or low >= high:
+        return 0
+    return tables.factorials[high] * tables.inverse_factorials[low] % p
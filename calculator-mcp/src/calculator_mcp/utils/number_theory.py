@@ -0,0 +1,255 @@
+"""
+数论工具
+提供Miller–Rabin素性检验和质因数分解等整数运算
+"""
+import math
+import random
+from functools import lru_cache
+from typing import Dict, Iterable, Iterator, Optional, Sequence, Tuple
+
+
+def primes_up_to(limit: int) -> Tuple[int, ...]:
+    """埃拉托斯特尼筛法求limit以内的质数"""
+    sieve = bytearray([1]) * (limit + 1)
+    sieve[0:2] = b"\x00\x00"
+    for i in range(2, int(limit ** 0.5) + 1):
+        if sieve[i]:
+            sieve[i * i::i] = bytes(len(range(i * i, limit + 1, i)))
+    return tuple(i for i, flag in enumerate(sieve) if flag)
+
+
+# 素性检验前先做试除的小质数
+SMALL_PRIMES = primes_up_to(256)
+
+# 因数分解时先试除的小质数
+TRIAL_PRIMES = primes_up_to(4096)
+
+# 对所有64位整数确定性的7个底数（Jim Sinclair）
+BASES_64BIT = (2, 325, 9375, 28178, 450775, 9780504, 1795265022)
+
+# 以前12个质数为底的Miller–Rabin检验对小于该值的所有整数都是确定性的
+DETERMINISTIC_BASES = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37)
+DETERMINISTIC_LIMIT = 318665857834031151167461
+
+# 超出确定性范围时额外使用的随机底数轮数，误判概率不超过 4^-rounds
+DEFAULT_ROUNDS = 32
+
+
+def _is_strong_probable_prime(n: int, d: int, s: int, base: int) -> bool:
+    """n - 1 = d·2^s，判断n是否为以base为底的强可能素数"""
+    x = pow(base, d, n)
+    if x == 1 or x == n - 1:
+        return True
+    for _ in range(s - 1):
+        x = x * x % n
+        if x == n - 1:
+            return True
+    return False
+
+
+def is_deterministic(n: int) -> bool:
+    """n的素性检验结果是否为确定性的（不存在误判）"""
+    return n < DETERMINISTIC_LIMIT
+
+
+def is_prime(n: int, rounds: int = DEFAULT_ROUNDS) -> bool:
+    """Miller–Rabin素性检验
+
+    n < 3.18×10^23（包括所有64位整数）时结果是确定性的，64位整数只需7个底数；
+    更大的n在固定底数之外再做rounds轮随机底数检验，随机底数以n为种子，
+    同一个数每次得到相同的结果
+    """
+    if n < 2:
+        return False
+    for p in SMALL_PRIMES:
+        if n % p == 0:
+            return n == p
+    if n < SMALL_PRIMES[-1] ** 2:
+        return True
+
+    d, s = n - 1, 0
+    while d % 2 == 0:
+        d //= 2
+        s += 1
+
+    if n < 2**64:
+        # 底数是n的倍数时该轮检验没有意义，跳过
+        return all(
+            _is_strong_probable_prime(n, d, s, base % n)
+            for base in BASES_64BIT if base % n
+        )
+
+    for base in DETERMINISTIC_BASES:
+        if not _is_strong_probable_prime(n, d, s, base):
+            return False
+    if is_deterministic(n):
+        return True
+
+    rng = random.Random(n)
+    return all(
+        _is_strong_probable_prime(n, d, s, rng.randrange(2, n - 1))
+        for _ in range(rounds)
+    )
+
+
+# 缓存的因数分解结果数量上限，prime_check、gcd、lcm和factorize共用
+FACTOR_CACHE_SIZE = 4096
+
+# 单次因数分解中Pollard–Brent rho的迭代次数上限，超出时放弃分解
+RHO_ITERATION_BUDGET = 500_000
+
+# 结果元数据中的因数分解（prime_check、gcd、lcm）只做短暂的rho尝试，两个质因数都很大时放弃分解（约10毫秒）
+METADATA_RHO_BUDGET = 5_000
+
+# 质因数分解结果：按质数升序排列的 (质数, 指数) 元组
+Factorization = Tuple[Tuple[int, int], ...]
+
+
+class FactorizationError(ValueError):
+    """因数分解超出计算预算"""
+    pass
+
+
+class _Budget:
+    """一次因数分解剩余的rho迭代次数"""
+
+    __slots__ = ("remaining",)
+
+    def __init__(self, iterations: int):
+        self.remaining = iterations
+
+    def spend(self, iterations: int) -> None:
+        self.remaining -= iterations
+        if self.remaining < 0:
+            raise FactorizationError("因数分解超出计算预算，该数至少含有两个很大的质因数")
+
+
+def _pollard_brent(n: int, budget: _Budget) -> int:
+    """Pollard–Brent rho：返回奇合数n的一个非平凡因数
+
+    累积 |x - y| 的乘积后再求gcd，每m步才做一次gcd
+    """
+    rng = random.Random(n)
+    m = 128
+    while True:
+        y, c = rng.randrange(1, n), rng.randrange(1, n)
+        g = r = q = 1
+        while g == 1:
+            x = y
+            for _ in range(r):
+                y = (y * y + c) % n
+            k = 0
+            while k < r and g == 1:
+                ys = y
+                steps = min(m, r - k)
+                for _ in range(steps):
+                    y = (y * y + c) % n
+                    q = q * abs(x - y) % n
+                g = math.gcd(q, n)
+                k += m
+                budget.spend(steps)
+            r *= 2
+        if g == n:
+            # 乘积中累积到了n，逐步回退找出因数
+            g = 1
+            while g == 1:
+                ys = (ys * ys + c) % n
+                g = math.gcd(abs(x - ys), n)
+                budget.spend(1)
+        if g != n:
+            return g
+
+
+def _split(n: int, factors: Dict[int, int], budget: _Budget) -> None:
+    """将不含小质因数的n分解为质因数，累加到factors"""
+    if n == 1:
+        return
+    if is_prime(n):
+        factors[n] = factors.get(n, 0) + 1
+        return
+    root = math.isqrt(n)
+    if root * root == n:
+        # rho对完全平方数收敛很慢，直接开方
+        _split(root, factors, budget)
+        _split(root, factors, budget)
+        return
+    divisor = _pollard_brent(n, budget)
+    _split(divisor, factors, budget)
+    _split(n // divisor, factors, budget)
+
+
+@lru_cache(maxsize=FACTOR_CACHE_SIZE)
+def _factorize_within(n: int, iterations: int) -> Optional[Factorization]:
+    """在iterations次rho迭代内分解n，超出预算时返回None（失败结果同样缓存）"""
+    factors: Dict[int, int] = {}
+    for p in TRIAL_PRIMES:
+        if p * p > n:
+            break
+        while n % p == 0:
+            factors[p] = factors.get(p, 0) + 1
+            n //= p
+    if n < TRIAL_PRIMES[-1] ** 2:
+        if n > 1:
+            factors[n] = factors.get(n, 0) + 1
+    else:
+        try:
+            _split(n, factors, _Budget(iterations))
+        except FactorizationError:
+            return None
+    return tuple(sorted(factors.items()))
+
+
+def factorize(n: int, iterations: Optional[int] = None) -> Factorization:
+    """质因数分解（结果按n和预算缓存）
+
+    先用小质数表试除，余下部分用Miller–Rabin判断素性、Pollard–Brent rho拆分。
+    rho迭代超出iterations（默认RHO_ITERATION_BUDGET）时抛出FactorizationError；
+    失败也会被缓存，同一个数再次调用时不再重复耗尽预算
+    """
+    if n < 1:
+        raise ValueError("只能分解正整数")
+    factorization = _factorize_within(n, RHO_ITERATION_BUDGET if iterations is None else iterations)
+    if factorization is None:
+        raise FactorizationError("因数分解超出计算预算，该数至少含有两个很大的质因数")
+    return factorization
+
+
+factorize.cache_info = _factorize_within.cache_info
+factorize.cache_clear = _factorize_within.cache_clear
+
+
+def merge_factorizations(factorizations: Iterable[Factorization]) -> Factorization:
+    """取各质因数的最高指数合并多个质因数分解，即这些数的最小公倍数的分解"""
+    exponents: Dict[int, int] = {}
+    for factorization in factorizations:
+        for prime, exponent in factorization:
+            exponents[prime] = max(exponents.get(prime, 0), exponent)
+    return tuple(sorted(exponents.items()))
+
+
+def format_factorization(factorization: Factorization) -> str:
+    """质因数分解的文本形式，如 2^3 × 5"""
+    if not factorization:
+        return "1"
+    return " × ".join(
+        str(prime) if exponent == 1 else f"{prime}^{exponent}"
+        for prime, exponent in factorization
+    )
+
+
+def prime_bits(numbers: Sequence[int]) -> bytes:
+    """批量素性检验的紧凑结果：第i位（按字节从低位起）为1表示numbers[i]是质数
+
+    作为进程池任务时只需传回len(numbers)/8个字节
+    """
+    bits = bytearray((len(numbers) + 7) // 8)
+    for i, n in enumerate(numbers):
+        if is_prime(n):
+            bits[i >> 3] |= 1 << (i & 7)
+    return bytes(bits)
+
+
+def iter_bits(bits: bytes, count: int) -> Iterator[bool]:
+    """按顺序展开prime_bits的结果"""
+    for i in range(count):
+        yield bool(bits[i >> 3] >> (i & 7) & 1)
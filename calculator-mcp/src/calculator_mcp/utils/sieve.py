@@ -0,0 +1,82 @@
+"""
+分段埃拉托斯特尼筛法
+只筛奇数，每段使用固定大小的字节数组，内存占用与区间长度无关
+
+导入本模块时预先计算筛分用的小质数表（10^6以内），因此不在utils包中导出，
+只有用到质数区间的运算首次调用时才会导入
+"""
+import math
+from typing import Iterator, List, Tuple
+
+import numpy as np
+
+from .number_theory import primes_up_to
+
+# 支持的最大整数
+SIEVE_LIMIT = 10**12
+
+# 每段的字节数，每字节表示一个奇数；256KB的段可以放入L2缓存
+SEGMENT_BYTES = 1 << 18
+
+# 筛分SIEVE_LIMIT以内区间所需的全部奇质数（不超过√SIEVE_LIMIT）
+BASE_PRIMES = np.array(primes_up_to(math.isqrt(SIEVE_LIMIT))[1:], dtype=np.int64)
+
+# 小于该值的质数在每段内命中很多次，逐个用切片赋值筛去；
+# 更大的质数每段最多命中16次，对所有这样的质数整体向量化处理
+_SLICE_PRIME_LIMIT = SEGMENT_BYTES // 16
+_SLICE_PRIMES = BASE_PRIMES[BASE_PRIMES < _SLICE_PRIME_LIMIT].tolist()
+_VECTOR_PRIMES = BASE_PRIMES[BASE_PRIMES >= _SLICE_PRIME_LIMIT]
+
+
+def _first_odd_multiples(primes: np.ndarray, low: int) -> np.ndarray:
+    """每个质数p在low之后第一个不小于p²的奇数倍"""
+    first = np.maximum(primes * primes, -(-low // primes) * primes)
+    return first + primes * (first % 2 == 0)
+
+
+def _segments(start: int, stop: int) -> Iterator[Tuple[int, np.ndarray]]:
+    """逐段筛分[start, stop]中的奇数
+
+    产出 (low, flags)：low为奇数，flags[i]为1表示 low + 2i 是质数
+    """
+    low = max(start, 3) | 1
+    while low <= stop:
+        size = min(SEGMENT_BYTES, (stop - low) // 2 + 1)
+        high = low + 2 * (size - 1)
+        root = math.isqrt(high)
+        flags = np.ones(size, dtype=np.uint8)
+        
+        for p in _SLICE_PRIMES:
+            if p > root:
+                break
+            first = max(p * p, (low + p - 1) // p * p)
+            if first % 2 == 0:
+                first += p
+            flags[(first - low) // 2::p] = 0
+        
+        primes = _VECTOR_PRIMES[:np.searchsorted(_VECTOR_PRIMES, root, side="right")]
+        if len(primes):
+            indices = (_first_odd_multiples(primes, low) - low) // 2
+            while len(indices):
+                hit = indices < size
+                flags[indices[hit]] = 0
+                indices, primes = indices[hit] + primes[hit], primes[hit]
+        
+        yield low, flags
+        low = high + 2
+
+
+def count_primes(start: int, stop: int) -> int:
+    """统计 start ≤ n ≤ stop 中的质数个数"""
+    count = 1 if start <= 2 <= stop else 0
+    for _, flags in _segments(start, stop):
+        count += int(np.count_nonzero(flags))
+    return count
+
+
+def primes_in_range(start: int, stop: int) -> List[int]:
+    """按升序列出 start ≤ n ≤ stop 中的质数"""
+    primes = [2] if start <= 2 <= stop else []
+    for low, flags in _segments(start, stop):
+        primes.extend((low + 2 * np.flatnonzero(flags)).tolist())
+    return primes
@@ -0,0 +1,149 @@
+"""
+流式统计工具
+提供在线累积统计量的累加器和按会话保存累加器的存储
+"""
+import math
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Dict, Iterable, Optional
+
+
+class RunningStatistics:
+    """在线统计累加器
+
+    每次追加一批数值时先求出该批的数量、均值和离差平方和，
+    再用Chan等人的并行合并公式并入已有统计量（Welford算法的分块形式），
+    无需保存历史数据，数值稳定性与逐个更新的Welford算法相同
+    """
+
+    __slots__ = ("count", "mean", "m2", "minimum", "maximum")
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        # 离差平方和 Σ(x - mean)²
+        self.m2 = 0.0
+        self.minimum = math.inf
+        self.maximum = -math.inf
+
+    def push(self, values: Iterable[float]) -> None:
+        """追加一批数值"""
+        chunk = list(values)
+        n = len(chunk)
+        if n == 0:
+            return
+
+        chunk_mean = math.fsum(chunk) / n
+        chunk_m2 = math.fsum((x - chunk_mean) ** 2 for x in chunk)
+
+        total = self.count + n
+        delta = chunk_mean - self.mean
+        self.mean += delta * n / total
+        self.m2 += chunk_m2 + delta * delta * self.count * n / total
+        self.count = total
+        self.minimum = min(self.minimum, min(chunk))
+        self.maximum = max(self.maximum, max(chunk))
+
+    def variance(self, is_sample: bool = True) -> Optional[float]:
+        """样本方差或总体方差，数据不足时返回None"""
+        divisor = self.count - 1 if is_sample else self.count
+        if divisor <= 0:
+            return None
+        return self.m2 / divisor
+
+    def snapshot(self, is_sample: bool = True) -> Dict[str, Optional[float]]:
+        """当前统计量"""
+        variance = self.variance(is_sample)
+        empty = self.count == 0
+        return {
+            "count": self.count,
+            "mean": None if empty else self.mean,
+            "variance": variance,
+            "standard_deviation": None if variance is None else math.sqrt(variance),
+            "min": None if empty else self.minimum,
+            "max": None if empty else self.maximum,
+        }
+
+
+class StreamStore:
+    """按会话保存数据流的统计累加器
+
+    数据流属于打开它的会话，其他会话无法访问；每个会话的数据流数量单独计算上限，
+    一个会话打开过多数据流不会影响其他会话。超过空闲时间未访问的数据流会被清理，
+    close_session可一次关闭某个会话的全部数据流；会话达到上限且没有可清理的数据流时拒绝打开新的数据流
+    """
+
+    def __init__(self, max_streams: int = 1024, idle_timeout: float = 3600.0):
+        # 每个会话可同时打开的数据流数量
+        self.max_streams = max_streams
+        self.idle_timeout = idle_timeout
+        # 会话ID -> 数据流ID -> (累加器, 最近访问时间)，每个会话内按访问时间排序
+        self._sessions: "Dict[str, OrderedDict[str, tuple[RunningStatistics, float]]]" = {}
+        self._lock = threading.Lock()
+
+    def _expire(self, now: float) -> None:
+        for session in list(self._sessions):
+            streams = self._sessions[session]
+            while streams:
+                stream_id, (_, last_access) = next(iter(streams.items()))
+                if now - last_access < self.idle_timeout:
+                    break
+                del streams[stream_id]
+            if not streams:
+                del self._sessions[session]
+
+    def open(self, session: str) -> str:
+        """为会话打开新的数据流，返回数据流ID"""
+        with self._lock:
+            now = time.monotonic()
+            self._expire(now)
+            streams = self._sessions.setdefault(session, OrderedDict())
+            if len(streams) >= self.max_streams:
+                raise ValueError(f"本会话打开的数据流已达上限({self.max_streams})，请先关闭不再使用的数据流")
+            stream_id = uuid.uuid4().hex
+            streams[stream_id] = (RunningStatistics(), now)
+            return stream_id
+
+    def get(self, session: str, stream_id: str) -> RunningStatistics:
+        """获取会话中数据流的累加器并刷新访问时间"""
+        with self._lock:
+            now = time.monotonic()
+            self._expire(now)
+            streams = self._sessions.get(session)
+            if streams is None or stream_id not in streams:
+                raise KeyError(stream_id)
+            statistics, _ = streams[stream_id]
+            streams[stream_id] = (statistics, now)
+            streams.move_to_end(stream_id)
+            return statistics
+
+    def close(self, session: str, stream_id: str) -> RunningStatistics:
+        """关闭会话中的数据流，返回其最终的累加器"""
+        with self._lock:
+            streams = self._sessions.get(session)
+            if streams is None or stream_id not in streams:
+                raise KeyError(stream_id)
+            statistics, _ = streams.pop(stream_id)
+            if not streams:
+                del self._sessions[session]
+            return statistics
+
+    def close_session(self, session: str) -> int:
+        """关闭会话的全部数据流，返回关闭的数量"""
+        with self._lock:
+            return len(self._sessions.pop(session, {}))
+
+    def session_streams(self, session: str) -> int:
+        """会话当前打开的数据流数量"""
+        with self._lock:
+            return len(self._sessions.get(session, {}))
+
+    def __len__(self) -> int:
+        with self._lock:
+            return sum(len(streams) for streams in self._sessions.values())
+
+
+# 服务器进程内的数据流存储，按会话隔离
+stream_store = StreamStore()
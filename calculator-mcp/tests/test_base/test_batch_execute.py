@@ -0,0 +1,98 @@
+"""
+批量执行工具测试
+"""
+import pytest
+from fastmcp import FastMCP, Client
+from calculator_mcp.base.registry import OperationRegistry
+from calculator_mcp.base.models import BatchOperationItem
+from calculator_mcp.operations import (
+    AdditionOperation,
+    MultiplicationOperation,
+    DivisionOperation,
+    SquareRootOperation,
+    FactorialOperation,
+    FactorizeOperation,
+)
+
+
+class TestBatchExecute:
+    
+    def setup_method(self):
+        self.mcp = FastMCP(name="batch-test")
+        self.registry = OperationRegistry(self.mcp)
+        for operation_class in [
+            AdditionOperation, MultiplicationOperation, DivisionOperation, SquareRootOperation,
+            FactorialOperation, FactorizeOperation
+        ]:
+            self.registry.register(operation_class)
+        self.registry.register_batch_tool()
+    
+    @pytest.mark.asyncio
+    async def test_results_in_order(self):
+        items = [
+            BatchOperationItem(operation="multiply", arguments={"a": 3, "b": 4}),
+            BatchOperationItem(operation="add", arguments={"a": 1, "b": 2}),
+            BatchOperationItem(operation="square_root", arguments={"value": 16}),
+        ]
+        result = await self.registry.execute_batch(items)
+        
+        assert result.success is True
+        assert result.succeeded == 3
+        assert result.failed == 0
+        assert [r.result for r in result.results] == [12.0, 3.0, 4.0]
+        assert [r.operation_name for r in result.results] == ["multiply", "add", "square_root"]
+    
+    @pytest.mark.asyncio
+    async def test_per_item_errors(self):
+        items = [
+            BatchOperationItem(operation="divide", arguments={"a": 1, "b": 0}),
+            BatchOperationItem(operation="unknown_op", arguments={}),
+            BatchOperationItem(operation="add", arguments={"a": 1}),
+            BatchOperationItem(operation="add", arguments={"a": 1, "b": 1}),
+        ]
+        result = await self.registry.execute_batch(items)
+        
+        assert result.success is False
+        assert result.succeeded == 1
+        assert result.failed == 3
+        assert result.results[0].success is False
+        assert "unknown_op" in result.results[1].error_message
+        assert result.results[2].success is False
+        assert result.results[3].result == 2.0
+    
+    @pytest.mark.asyncio
+    async def test_batch_tool_via_client(self):
+        async with Client(self.mcp) as client:
+            response = await client.call_tool("batch_execute", {
+                "operations": [
+                    {"operation": "multiply", "arguments": {"a": i, "b": j}}
+                    for i in range(1, 4) for j in range(1, 4)
+                ]
+            })
+        
+        data = response.structured_content
+        assert data["success"] is True
+        assert [r["result"] for r in data["results"]] == [1, 2, 3, 2, 4, 6, 3, 6, 9]
+    
+    @pytest.mark.asyncio
+    async def test_batch_tool_keeps_result_subclass_fields(self):
+        async with Client(self.mcp) as client:
+            response = await client.call_tool("batch_execute", {
+                "operations": [
+                    {"operation": "factorial", "arguments": {"n": 25, "mode": "exact"}},
+                    {"operation": "factorize", "arguments": {"number": 360}},
+                ]
+            })
+        
+        exact, factors = response.structured_content["results"]
+        assert exact["exact"] == "15511210043330985984000000"
+        assert factors["factors"] == [[2, 3], [3, 2], [5, 1]]
+    
+    @pytest.mark.asyncio
+    async def test_batch_tool_rejects_empty_list(self):
+        async with Client(self.mcp) as client:
+            response = await client.call_tool("batch_execute", {"operations": []})
+        
+        data = response.structured_content
+        assert data["success"] is False
+        assert data["error_message"]
@@ -0,0 +1,118 @@
+"""
+结果元数据详细程度测试
+"""
+import pytest
+from fastmcp import FastMCP, Client
+from calculator_mcp.base.operation import detail_level
+from calculator_mcp.base.registry import OperationRegistry, DETAIL_ENV
+from calculator_mcp.base.models import BatchOperationItem
+from calculator_mcp.operations.gcd import GCDOperation, GCDInput
+from calculator_mcp.operations.lcm import LCMOperation
+from calculator_mcp.operations.median import MedianOperation
+
+
+class TestDetailLevel:
+    
+    def setup_method(self):
+        self.mcp = FastMCP(name="detail-test")
+        self.registry = OperationRegistry(self.mcp)
+        for operation_class in [MedianOperation, GCDOperation, LCMOperation]:
+            self.registry.register(operation_class)
+        self.registry.register_batch_tool()
+    
+    @pytest.mark.asyncio
+    async def test_default_is_full(self):
+        result = await self.registry.execute("median", {"numbers": [3, 1, 2]})
+        
+        assert result.metadata["sorted_numbers"] == [1, 2, 3]
+    
+    @pytest.mark.asyncio
+    async def test_summary_omits_lists(self):
+        result = await self.registry.execute("median", {"numbers": [3, 1, 2]}, detail="summary")
+        
+        assert result.result == 2
+        assert "sorted_numbers" not in result.metadata
+        assert result.metadata["min"] == 1
+        assert result.metadata["max"] == 3
+        
+        result = await self.registry.execute("gcd", {"numbers": [12, 18]}, detail="summary")
+        assert result.result == 6
+        assert result.metadata == {"count": 2, "is_coprime": False}
+        
+        result = await self.registry.execute("lcm", {"numbers": [4, 6]}, detail="summary")
+        assert result.result == 12
+        assert "original_numbers" not in result.metadata
+        assert result.metadata["gcd"] == 2
+    
+    @pytest.mark.asyncio
+    async def test_none_returns_no_metadata(self):
+        for name, arguments in [("median", {"numbers": [3, 1, 2]}), ("gcd", {"numbers": [12, 18]}), ("lcm", {"numbers": [4, 6]})]:
+            result = await self.registry.execute(name, arguments, detail="none")
+            
+            assert result.success is True
+            assert result.metadata is None
+    
+    @pytest.mark.asyncio
+    async def test_invalid_level(self):
+        result = await self.registry.execute("median", {"numbers": [1]}, detail="verbose")
+        
+        assert result.success is False
+        assert "detail" in result.error_message
+    
+    @pytest.mark.asyncio
+    async def test_server_default(self, monkeypatch):
+        monkeypatch.setenv(DETAIL_ENV, "summary")
+        registry = OperationRegistry(FastMCP(name="detail-env-test"))
+        registry.register(MedianOperation)
+        
+        result = await registry.execute("median", {"numbers": [3, 1, 2]})
+        assert "sorted_numbers" not in result.metadata
+        
+        registry = OperationRegistry(FastMCP(name="detail-arg-test"), detail="none")
+        registry.register(MedianOperation)
+        
+        result = await registry.execute("median", {"numbers": [3, 1, 2]})
+        assert result.metadata is None
+        
+        result = await registry.execute("median", {"numbers": [3, 1, 2]}, detail="full")
+        assert result.metadata["sorted_numbers"] == [1, 2, 3]
+    
+    def test_invalid_server_default(self):
+        with pytest.raises(ValueError):
+            OperationRegistry(FastMCP(name="detail-invalid-test"), detail="verbose")
+    
+    @pytest.mark.asyncio
+    async def test_batch_detail(self):
+        items = [
+            BatchOperationItem(operation="median", arguments={"numbers": [3, 1, 2]}),
+            BatchOperationItem(operation="gcd", arguments={"numbers": [12, 18]}, detail="full"),
+        ]
+        result = await self.registry.execute_batch(items, detail="none")
+        
+        assert result.results[0].metadata is None
+        assert result.results[1].metadata["reduced_numbers"] == [2, 3]
+    
+    @pytest.mark.asyncio
+    async def test_detail_tool_parameter(self):
+        async with Client(self.mcp) as client:
+            tools = {tool.name: tool for tool in await client.list_tools()}
+            schema = tools["median"].input_schema
+            assert schema["properties"]["detail"]["anyOf"][0]["enum"] == ["none", "summary", "full"]
+            assert "detail" not in schema.get("required", [])
+            
+            response = await client.call_tool("median", {"numbers": [3, 1, 2], "detail": "summary"})
+        
+        data = response.structured_content
+        assert data["result"] == 2
+        assert "sorted_numbers" not in data["metadata"]
+    
+    @pytest.mark.asyncio
+    async def test_operation_reads_context(self):
+        operation = GCDOperation()
+        
+        with detail_level("summary"):
+            result = await operation.execute(GCDInput(numbers=[12, 18]))
+        assert "reduced_numbers" not in result.metadata
+        
+        result = await operation.execute(GCDInput(numbers=[12, 18]))
+        assert result.metadata["reduced_numbers"] == [2, 3]
@@ -0,0 +1,376 @@
+"""
+运算执行后端测试
+"""
+import asyncio
+import os
+import sys
+import threading
+import time
+from typing import List
+import pytest
+from fastmcp import Client, FastMCP
+from pydantic import BaseModel
+from calculator_mcp.base.executor import (
+    EXECUTOR_ENV,
+    OFFLOAD_ENV,
+    WORKERS_ENV,
+    ProcessExecutor,
+    create_executor,
+    get_executor,
+    set_executor,
+)
+from calculator_mcp.base.models import BatchOperationItem, OperationResult
+from calculator_mcp.base.operation import BaseOperation
+from calculator_mcp.base.registry import OperationRegistry
+from calculator_mcp.operations import magnitude_array, prime_check
+from calculator_mcp.operations.addition import AdditionOperation
+from calculator_mcp.operations.factorial import EXACT_OFFLOAD_THRESHOLD, FactorialInput, FactorialOperation
+from calculator_mcp.operations.median import OFFLOAD_THRESHOLD, MedianInput, MedianOperation
+from calculator_mcp.operations.prime_range import (
+    COUNT_OFFLOAD_THRESHOLD,
+    CountPrimesOperation,
+    PrimeRangeInput,
+)
+from calculator_mcp.server import create_calculator_server
+from calculator_mcp.utils import factorials, number_theory
+
+
+class RecordingExecutor(ProcessExecutor):
+    """记录提交的任务，再交给进程池执行"""
+
+    def __init__(self):
+        super().__init__(max_workers=1)
+        self.submitted = []
+
+    async def submit(self, fn, *args):
+        self.submitted.append((fn.__name__, args))
+        return await super().submit(fn, *args)
+
+
+class ThreadInput(BaseModel):
+    values: List[float] = []
+    sleep: float = 0.0
+
+
+class ThreadNameOperation(BaseOperation):
+    """在结果中返回执行所在的线程和元数据详细程度"""
+
+    @property
+    def name(self) -> str:
+        return "thread_name"
+
+    @property
+    def description(self) -> str:
+        return "返回执行线程"
+
+    @property
+    def input_model(self):
+        return ThreadInput
+
+    def validate_input(self, input_data: ThreadInput) -> bool:
+        return True
+
+    async def execute(self, input_data: ThreadInput) -> OperationResult:
+        # 模拟同步计算，期间不让出事件循环
+        time.sleep(input_data.sleep)
+        return OperationResult(
+            success=True,
+            result=time.perf_counter(),
+            operation_name=self.name,
+            metadata={"thread": threading.current_thread().name, "detail": self.detail}
+        )
+
+
+class CpuBoundOperation(ThreadNameOperation):
+
+    @property
+    def name(self) -> str:
+        return "cpu_bound"
+
+    def cpu_bound(self, input_data) -> bool:
+        return True
+
+
+class StatefulCpuBoundOperation(CpuBoundOperation):
+
+    @property
+    def name(self) -> str:
+        return "stateful"
+
+    @property
+    def cacheable(self) -> bool:
+        return False
+
+
+class TestCreateExecutor:
+
+    @pytest.mark.parametrize("kind", ["auto", "ray"])
+    def test_falls_back_to_process_pool_without_ray(self, monkeypatch, kind):
+        monkeypatch.setitem(sys.modules, "ray", None)
+
+        executor = create_executor(kind)
+
+        assert isinstance(executor, ProcessExecutor)
+
+    def test_process_kind_and_workers_from_env(self, monkeypatch):
+        monkeypatch.setenv(EXECUTOR_ENV, "process")
+        monkeypatch.setenv(WORKERS_ENV, "3")
+
+        executor = create_executor()
+
+        assert executor.name == "process"
+        assert executor.workers == 3
+
+    def test_unknown_kind(self):
+        with pytest.raises(ValueError):
+            create_executor("dask")
+
+
+class TestProcessExecutor:
+
+    @pytest.mark.asyncio
+    async def test_submit_runs_in_another_process(self):
+        executor = ProcessExecutor(max_workers=1)
+        try:
+            assert await executor.submit(os.getpid) != os.getpid()
+            assert await executor.map(abs, [-1, 2, -3]) == [1, 2, 3]
+        finally:
+            executor.shutdown()
+
+
+class TestOffloadDeclaration:
+
+    def test_default_is_not_offloadable(self):
+        operation = AdditionOperation()
+
+        assert not operation.offloadable
+
+    def test_size_threshold(self):
+        operation = MedianOperation()
+
+        assert not operation.should_offload(MedianInput(numbers=[1.0] * (OFFLOAD_THRESHOLD - 1)))
+        assert operation.should_offload(MedianInput(numbers=[1.0] * OFFLOAD_THRESHOLD))
+
+    def test_custom_sizes(self):
+        assert CountPrimesOperation().offload_size(PrimeRangeInput(start=10, stop=19)) == 10
+        # 过长的精确阶乘只返回位数和资源URI，无需卸载
+        assert not FactorialOperation().should_offload(FactorialInput(n=EXACT_OFFLOAD_THRESHOLD, mode="exact"))
+
+
+class TestRegistryOffload:
+
+    def setup_method(self):
+        self.executor = RecordingExecutor()
+
+    def teardown_method(self):
+        self.executor.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_large_input_runs_on_executor(self):
+        registry = OperationRegistry(FastMCP(name="offload-test"), executor=self.executor)
+        registry.register(CountPrimesOperation)
+
+        small = await registry.execute("count_primes", {"start": 0, "stop": 100})
+        large = await registry.execute("count_primes", {"start": 0, "stop": COUNT_OFFLOAD_THRESHOLD}, "summary")
+
+        assert small.result == 25
+        assert large.success and large.result == 348513
+        assert len(self.executor.submitted) == 1
+        name, (module, class_name, input_data, level) = self.executor.submitted[0]
+        assert name == "run_operation"
+        assert (module, class_name) == (CountPrimesOperation.__module__, "CountPrimesOperation")
+        assert input_data.stop == COUNT_OFFLOAD_THRESHOLD
+        assert level == "summary"
+
+    @pytest.mark.asyncio
+    async def test_offload_disabled_by_env(self, monkeypatch):
+        monkeypatch.setenv(OFFLOAD_ENV, "0")
+        registry = OperationRegistry(FastMCP(name="offload-test"), executor=self.executor)
+        registry.register(CountPrimesOperation)
+
+        result = await registry.execute("count_primes", {"start": 0, "stop": COUNT_OFFLOAD_THRESHOLD})
+
+        assert result.result == 348513
+        assert self.executor.submitted == []
+
+    @pytest.mark.asyncio
+    async def test_prime_check_chunks_use_registry_executor(self):
+        registry = OperationRegistry(FastMCP(name="offload-test"), executor=self.executor)
+        registry.register(prime_check.PrimeCheckOperation)
+        numbers = list(range(2, 2 + prime_check.PARALLEL_THRESHOLD))
+
+        result = await registry.execute("prime_check", {"numbers": numbers})
+        registry.offload = False
+        inline = await registry.execute("prime_check", {"numbers": numbers})
+
+        assert result.primes == inline.primes
+        assert [name for name, _ in self.executor.submitted] == ["prime_bits"]
+
+    @pytest.mark.asyncio
+    async def test_factorial_resource_runs_on_executor(self, tmp_path):
+        factorials.clear_cache()
+        server = create_calculator_server(cache_dir=tmp_path, executor=self.executor)
+        uri = f"factorial://{EXACT_OFFLOAD_THRESHOLD}"
+
+        async with Client(server) as client:
+            called = await client.call_tool("factorial", {"n": EXACT_OFFLOAD_THRESHOLD, "mode": "exact"})
+            first = (await client.read_resource(uri))[0].text
+            second = (await client.read_resource(uri))[0].text
+
+        assert called.structured_content["resource_uri"] == uri
+        assert first.startswith("3347320509")
+        assert second == first
+        # 工具调用不计算精确值，重复读取使用本进程的缓存
+        assert [name for name, _ in self.executor.submitted] == ["exact_factorial"]
+
+
+class TestThreadDispatch:
+
+    def setup_method(self):
+        self.registry = OperationRegistry(FastMCP(name="thread-test"))
+        for operation_class in (ThreadNameOperation, CpuBoundOperation, StatefulCpuBoundOperation):
+            self.registry.register(operation_class)
+
+    async def _thread(self, name, **arguments):
+        result = await self.registry.execute(name, arguments, "full")
+        return result.metadata["thread"]
+
+    @pytest.mark.asyncio
+    async def test_cheap_call_stays_on_event_loop(self):
+        assert await self._thread("thread_name", values=[1.0]) == threading.current_thread().name
+
+    @pytest.mark.asyncio
+    async def test_cpu_bound_runs_in_thread_with_detail(self):
+        result = await self.registry.execute("cpu_bound", {}, "summary")
+
+        assert result.metadata["thread"].startswith("calculator-mcp")
+        assert result.metadata["detail"] == "summary"
+
+    @pytest.mark.asyncio
+    async def test_size_threshold(self):
+        # 输入规模为列表长度加上sleep参数
+        self.registry.thread_threshold = 4
+
+        assert await self._thread("thread_name", values=[1.0, 2.0]) == threading.current_thread().name
+        assert (await self._thread("thread_name", values=[1.0, 2.0, 3.0])).startswith("calculator-mcp")
+
+    @pytest.mark.asyncio
+    async def test_stateful_operation_stays_on_event_loop(self):
+        assert await self._thread("stateful") == threading.current_thread().name
+
+    @pytest.mark.asyncio
+    async def test_offload_disabled(self):
+        self.registry.offload = False
+
+        assert await self._thread("cpu_bound") == threading.current_thread().name
+
+    @pytest.mark.asyncio
+    async def test_slow_call_does_not_block_cheap_calls(self):
+        slow, cheap = await asyncio.gather(
+            self.registry.execute("cpu_bound", {"sleep": 0.2}),
+            self.registry.execute("thread_name", {})
+        )
+
+        assert cheap.result < slow.result
+
+    @pytest.mark.asyncio
+    async def test_batch_items_run_concurrently(self):
+        items = [BatchOperationItem(operation="cpu_bound", arguments={"sleep": 0.2}) for _ in range(3)]
+        started = time.perf_counter()
+        result = await self.registry.execute_batch(items)
+
+        assert result.succeeded == 3
+        assert time.perf_counter() - started < 0.5
+
+    @pytest.mark.asyncio
+    async def test_batch_stateful_items_keep_order(self):
+        items = [
+            BatchOperationItem(operation="cpu_bound", arguments={"sleep": 0.2}),
+            BatchOperationItem(operation="stateful", arguments={}),
+            BatchOperationItem(operation="thread_name", arguments={}),
+        ]
+        result = await self.registry.execute_batch(items)
+        finished = [r.result for r in result.results]
+
+        assert [r.operation_name for r in result.results] == ["cpu_bound", "stateful", "thread_name"]
+        assert finished[0] < finished[1] < finished[2]
+
+    @pytest.mark.asyncio
+    async def test_large_evaluate_array_runs_in_thread(self):
+        mcp = FastMCP(name="thread-test")
+        registry = OperationRegistry(mcp)
+        registry.register_expression_tool()
+        registry.thread_threshold = 3
+        tool = await mcp.get_tool("evaluate_array")
+        threads = []
+        evaluate_array = registry.evaluate_array
+
+        def recording(expression, variables):
+            threads.append(threading.current_thread().name)
+            return evaluate_array(expression, variables)
+
+        registry.evaluate_array = recording
+        small = await tool.fn(expression="x * 2", variables={"x": [1.0, 2.0]})
+        large = await tool.fn(expression="x * 2", variables={"x": [1.0, 2.0, 3.0]})
+
+        assert small.results == [2.0, 4.0]
+        assert large.results == [2.0, 4.0, 6.0]
+        assert threads[0] == threading.current_thread().name
+        assert threads[1].startswith("calculator-mcp")
+
+
+class TestCpuBoundInputs:
+
+    def test_prime_check_decides_from_input(self):
+        operation = prime_check.PrimeCheckOperation()
+
+        assert not operation.cpu_bound(prime_check.PrimeCheckInput(number=97))
+        assert operation.cpu_bound(prime_check.PrimeCheckInput(number=prime_check.THREAD_MIN_NUMBER))
+        assert not operation.cpu_bound(prime_check.PrimeCheckInput(numbers=[2**61 - 1]))
+        assert operation.offload_size(prime_check.PrimeCheckInput(start=10, stop=10_009)) == 10_000
+
+    def test_magnitude_array_uses_thread_before_offload(self):
+        operation = magnitude_array.MagnitudeArrayOperation()
+        small = magnitude_array.MagnitudeArrayInput(kind="factorial", n_values=[10] * (magnitude_array.THREAD_MIN_SIZE - 1))
+        medium = magnitude_array.MagnitudeArrayInput(kind="factorial", n_values=[10] * magnitude_array.THREAD_MIN_SIZE)
+        large = magnitude_array.MagnitudeArrayInput(kind="factorial", n_values=[10] * magnitude_array.OFFLOAD_THRESHOLD)
+
+        assert not operation.cpu_bound(small)
+        assert operation.cpu_bound(medium) and not operation.should_offload(medium)
+        assert operation.should_offload(large)
+
+    @pytest.mark.asyncio
+    async def test_small_prime_check_stays_on_event_loop(self):
+        registry = OperationRegistry(FastMCP(name="thread-test"))
+        registry.register(prime_check.PrimeCheckOperation)
+        threads = []
+        operation = registry.get_operation("prime_check")
+        execute = operation.execute
+
+        async def recording(input_data):
+            threads.append(threading.current_thread().name)
+            return await execute(input_data)
+
+        operation.execute = recording
+        await registry.execute("prime_check", {"number": 97})
+        await registry.execute("prime_check", {"number": 2**61 - 1})
+
+        assert threads[0] == threading.current_thread().name
+        assert threads[1].startswith("calculator-mcp")
+
+
+class TestSharedExecutor:
+
+    @pytest.mark.asyncio
+    async def test_prime_check_chunks_use_shared_executor(self):
+        executor = RecordingExecutor()
+        set_executor(executor)
+        try:
+            numbers = list(range(2, 2 + prime_check.PARALLEL_THRESHOLD))
+            bits = await prime_check.check_many(numbers)
+        finally:
+            set_executor(None)
+
+        assert bits == number_theory.prime_bits(numbers)
+        assert [name for name, _ in executor.submitted] == ["prime_bits"]
+        assert get_executor() is not executor
@@ -0,0 +1,155 @@
+"""
+注册清单与按需导入测试
+"""
+import json
+from pathlib import Path
+import pytest
+from fastmcp import Client, FastMCP
+from calculator_mcp.base.registry import OperationRegistry
+from calculator_mcp.base.prompt_registry import PromptRegistry
+from calculator_mcp import manifest as manifest_module
+from calculator_mcp.manifest import (
+    MANIFEST_FILE,
+    OPERATIONS,
+    PROMPTS,
+    build_manifest,
+    compute_source_hash,
+    load_manifest,
+    read_manifest,
+)
+
+
+class TestManifest:
+    
+    def test_packaged_manifest_is_up_to_date(self):
+        """打包的清单必须与源码一致，修改运算后需运行 calculator-mcp-manifest"""
+        packaged = read_manifest(MANIFEST_FILE)
+        
+        assert packaged["source_hash"] == compute_source_hash()
+        assert packaged == build_manifest()
+    
+    def test_source_hash_covers_utils(self, tmp_path, monkeypatch):
+        """工具描述引用了utils中的常量，修改utils必须使清单失效"""
+        for package in manifest_module.SOURCE_PACKAGES:
+            target = tmp_path / package
+            target.mkdir()
+            for path in (manifest_module.PACKAGE_DIR / package).glob("*.py"):
+                (target / path.name).write_bytes(path.read_bytes())
+        monkeypatch.setattr(manifest_module, "PACKAGE_DIR", tmp_path)
+        (tmp_path / "manifest.py").write_bytes(Path(manifest_module.__file__).read_bytes())
+        before = compute_source_hash()
+        
+        with (tmp_path / "utils" / "magnitude.py").open("a", encoding="utf-8") as f:
+            f.write("\n# changed\n")
+        
+        assert compute_source_hash() != before
+    
+    def test_manifest_covers_catalog(self, tmp_path):
+        manifest = load_manifest(tmp_path)
+        
+        assert len(manifest["operations"]) == len(OPERATIONS)
+        assert len(manifest["prompts"]) == len(PROMPTS)
+        assert manifest["operations"][0]["name"] == "add"
+        assert manifest["operations"][0]["parameters"][0] == {
+            "name": "a",
+            "annotation": "float",
+            "required": True,
+            "default": None,
+            "description": "第一个操作数",
+        }
+
+
+class TestManifestCache:
+    
+    @pytest.fixture
+    def stale_package(self, tmp_path, monkeypatch):
+        """模拟打包的清单与源码不一致"""
+        monkeypatch.setattr(manifest_module, "MANIFEST_FILE", tmp_path / "missing.json")
+    
+    def test_rebuilds_and_writes_cache(self, tmp_path, stale_package):
+        cache_dir = tmp_path / "cache"
+        
+        manifest = load_manifest(cache_dir)
+        
+        cached = json.loads((cache_dir / "manifest.json").read_text(encoding="utf-8"))
+        assert cached == manifest
+        assert cached["source_hash"] == compute_source_hash()
+    
+    def test_reads_cache_when_hash_matches(self, tmp_path, stale_package, monkeypatch):
+        cache_dir = tmp_path / "cache"
+        load_manifest(cache_dir)
+        
+        def fail():
+            raise AssertionError("清单不应重新生成")
+        monkeypatch.setattr(manifest_module, "build_manifest", fail)
+        
+        assert load_manifest(cache_dir)["source_hash"] == compute_source_hash()
+    
+    def test_rewrites_cache_when_hash_changes(self, tmp_path, stale_package):
+        cache_dir = tmp_path / "cache"
+        cache_dir.mkdir()
+        (cache_dir / "manifest.json").write_text(
+            json.dumps({"source_hash": "outdated", "operations": [], "prompts": []}),
+            encoding="utf-8"
+        )
+        
+        manifest = load_manifest(cache_dir)
+        
+        assert len(manifest["operations"]) == len(OPERATIONS)
+        assert read_manifest(cache_dir / "manifest.json")["source_hash"] == compute_source_hash()
+    
+    def test_corrupt_cache_is_ignored(self, tmp_path, stale_package):
+        cache_dir = tmp_path / "cache"
+        cache_dir.mkdir()
+        (cache_dir / "manifest.json").write_text("{not json", encoding="utf-8")
+        
+        assert len(load_manifest(cache_dir)["prompts"]) == len(PROMPTS)
+
+
+class TestLazyRegistration:
+    
+    def setup_method(self):
+        self.manifest = read_manifest(MANIFEST_FILE)
+        self.mcp = FastMCP(name="lazy-test")
+    
+    @pytest.mark.asyncio
+    async def test_operation_imported_on_first_call(self):
+        registry = OperationRegistry(self.mcp)
+        for entry in self.manifest["operations"]:
+            registry.register_entry(entry)
+        
+        assert registry.operations == {}
+        assert "median" in registry.list_operations()
+        
+        result = await registry.execute("median", {"numbers": [3, 1, 2]})
+        
+        assert result.success is True
+        assert result.result == 2
+        assert list(registry.operations) == ["median"]
+        assert len(registry.list_operations()) == len(OPERATIONS)
+    
+    @pytest.mark.asyncio
+    async def test_prompt_imported_on_first_use(self):
+        registry = PromptRegistry(self.mcp)
+        for entry in self.manifest["prompts"]:
+            registry.register_entry(entry)
+        
+        assert registry.prompts == {}
+        
+        prompt = registry.get_prompt("multiplication_table")
+        
+        assert prompt.name == "multiplication_table"
+        assert list(registry.prompts) == ["multiplication_table"]
+    
+    @pytest.mark.asyncio
+    async def test_prompt_rendered_over_mcp(self):
+        registry = PromptRegistry(self.mcp)
+        for entry in self.manifest["prompts"]:
+            registry.register_entry(entry)
+        
+        async with Client(self.mcp) as client:
+            result = await client.get_prompt("multiplication_table", {"size": 3})
+        
+        text = result.messages[0].content.text
+        assert "3x3" in text
+        assert list(registry.prompts) == ["multiplication_table"]
@@ -0,0 +1,225 @@
+"""
+工具调用指标测试
+"""
+import asyncio
+import json
+import logging
+import pytest
+from fastmcp import Client, FastMCP
+from calculator_mcp.base.metrics import (
+    LATENCY_BUCKETS,
+    METRICS_ENV,
+    METRICS_FILE_ENV,
+    Histogram,
+    Metrics,
+    input_size,
+)
+from calculator_mcp.base.prompt_registry import PromptRegistry
+from calculator_mcp.base.registry import OperationRegistry
+from calculator_mcp.operations.addition import AdditionOperation
+from calculator_mcp.operations.division import DivisionOperation
+from calculator_mcp.operations.median import MedianOperation
+from calculator_mcp.prompts import MultiplicationTablePrompt
+from calculator_mcp.server import create_calculator_server
+
+
+class TestHistogram:
+
+    def test_buckets_are_cumulative(self):
+        histogram = Histogram((1, 10, 100))
+        for value in (0.5, 1, 5, 50, 500):
+            histogram.observe(value)
+
+        assert histogram.cumulative() == [("1", 2), ("10", 3), ("100", 4), ("+Inf", 5)]
+        assert histogram.count == 5
+        assert histogram.sum == 556.5
+
+    def test_quantile_interpolates_within_bucket(self):
+        histogram = Histogram((1, 2))
+        for _ in range(4):
+            histogram.observe(1.5)
+
+        assert histogram.quantile(0.5) == pytest.approx(1.5)
+        assert Histogram((1,)).quantile(0.5) is None
+
+    def test_quantile_in_overflow_bucket(self):
+        histogram = Histogram((1, 2))
+        histogram.observe(100)
+
+        assert histogram.quantile(0.99) == 2
+
+
+class TestMetrics:
+
+    def test_input_size_counts_list_elements(self):
+        assert input_size({"numbers": [1, 2, 3], "is_sample": True}) == 4
+        assert input_size({}) == 0
+
+    def test_record_and_snapshot(self):
+        metrics = Metrics()
+        metrics.record("tool", "median", {"validation": 0.001, "execution": 0.002, "total": 0.004}, 100, False)
+        metrics.record("tool", "median", {"validation": 0.001, "total": 0.001}, 5, True)
+
+        snapshot = metrics.snapshot()
+        median = snapshot["tools"]["median"]
+
+        assert snapshot["prompts"] == {}
+        assert (median["calls"], median["errors"]) == (2, 1)
+        assert median["input_size"]["sum"] == 105
+        assert median["latency"]["validation"]["count"] == 2
+        assert median["latency"]["execution"]["count"] == 1
+        assert "result" not in median["latency"]
+
+    def test_prometheus_text_format(self):
+        metrics = Metrics()
+        metrics.record("tool", "add", {"total": 0.003}, 2, False)
+        metrics.record("prompt", 'say "hi"', {"total": 0.5}, 1, True)
+
+        text = metrics.to_prometheus()
+
+        assert "# TYPE calculator_mcp_calls_total counter" in text
+        assert 'calculator_mcp_calls_total{kind="tool",name="add"} 1' in text
+        assert 'calculator_mcp_errors_total{kind="prompt",name="say \\"hi\\""} 1' in text
+        assert 'calculator_mcp_latency_seconds_bucket{kind="tool",name="add",phase="total",le="0.0025"} 0' in text
+        assert 'calculator_mcp_latency_seconds_bucket{kind="tool",name="add",phase="total",le="0.005"} 1' in text
+        assert 'calculator_mcp_latency_seconds_count{kind="tool",name="add",phase="total"} 1' in text
+        assert text.count('phase="total",le=') == 2 * (len(LATENCY_BUCKETS) + 1)
+        assert text.endswith("\n")
+
+    def test_writes_prometheus_file(self, tmp_path):
+        path = tmp_path / "metrics" / "calculator.prom"
+        metrics = Metrics(path=path, interval=0)
+
+        metrics.record("tool", "add", {"total": 0.001}, 2, False)
+
+        assert 'calculator_mcp_calls_total{kind="tool",name="add"} 1' in path.read_text(encoding="utf-8")
+        assert list(path.parent.iterdir()) == [path]
+
+    def test_write_interval(self, tmp_path):
+        path = tmp_path / "calculator.prom"
+        metrics = Metrics(path=path, interval=3600)
+
+        metrics.record("tool", "add", {"total": 0.001}, 2, False)
+        metrics.record("tool", "add", {"total": 0.001}, 2, False)
+
+        assert 'name="add"} 1' in path.read_text(encoding="utf-8")
+
+    def test_write_failure_is_logged(self, tmp_path, caplog):
+        metrics = Metrics(path=tmp_path / "file" / "calculator.prom", interval=0)
+        (tmp_path / "file").write_text("", encoding="utf-8")
+
+        with caplog.at_level(logging.WARNING):
+            metrics.record("tool", "add", {"total": 0.001}, 2, False)
+
+        assert "写入指标文件" in caplog.text
+        assert metrics.snapshot()["tools"]["add"]["calls"] == 1
+
+    @pytest.mark.asyncio
+    async def test_tool_call_survives_unwritable_file(self, tmp_path):
+        (tmp_path / "file").write_text("", encoding="utf-8")
+        mcp = FastMCP(name="metrics-test")
+        registry = OperationRegistry(mcp, metrics=Metrics(path=tmp_path / "file" / "calculator.prom", interval=0))
+        registry.register(AdditionOperation)
+
+        async with Client(mcp) as client:
+            response = await client.call_tool("add", {"a": 1, "b": 2})
+
+        assert response.is_error is False
+        assert response.structured_content["result"] == 3
+
+    @pytest.mark.asyncio
+    async def test_file_written_off_event_loop(self, tmp_path):
+        path = tmp_path / "calculator.prom"
+        metrics = Metrics(path=path, interval=0)
+
+        metrics.record("tool", "add", {"total": 0.001}, 2, False)
+        for _ in range(100):
+            if path.exists():
+                break
+            await asyncio.sleep(0.01)
+
+        assert 'name="add"} 1' in path.read_text(encoding="utf-8")
+
+    def test_from_env(self, monkeypatch, tmp_path):
+        monkeypatch.delenv(METRICS_ENV, raising=False)
+        monkeypatch.setenv(METRICS_FILE_ENV, str(tmp_path / "calculator.prom"))
+
+        metrics = Metrics.from_env()
+
+        assert metrics.path == tmp_path / "calculator.prom"
+        monkeypatch.setenv(METRICS_ENV, "0")
+        assert Metrics.from_env() is None
+
+
+class TestRegistryMetrics:
+
+    def setup_method(self):
+        self.mcp = FastMCP(name="metrics-test")
+        self.metrics = Metrics()
+
+    @pytest.mark.asyncio
+    async def test_tool_wrapper_records_phases(self):
+        registry = OperationRegistry(self.mcp, metrics=self.metrics)
+        registry.register(MedianOperation)
+        registry.register(DivisionOperation)
+
+        async with Client(self.mcp) as client:
+            await client.call_tool("median", {"numbers": [3, 1, 2]})
+            await client.call_tool("divide", {"a": 1, "b": 0})
+            await client.call_tool("divide", {"a": 1, "b": "x"}, raise_on_error=False)
+
+        tools = self.metrics.snapshot()["tools"]
+        median = tools["median"]
+        assert (median["calls"], median["errors"]) == (1, 0)
+        assert median["input_size"]["sum"] == 3
+        assert set(median["latency"]) == {"validation", "execution", "result", "total"}
+        # 参数类型错误也由注册器校验，计入调用指标
+        assert (tools["divide"]["calls"], tools["divide"]["errors"]) == (2, 2)
+
+    @pytest.mark.asyncio
+    async def test_validation_failure_records_only_validation(self):
+        registry = OperationRegistry(self.mcp, metrics=self.metrics)
+        registry.register(MedianOperation)
+        tool = await self.mcp.get_tool("median")
+
+        result = await tool.fn(numbers=[])
+
+        median = self.metrics.snapshot()["tools"]["median"]
+        assert result.success is False
+        assert median["errors"] == 1
+        assert set(median["latency"]) == {"validation", "total"}
+
+    @pytest.mark.asyncio
+    async def test_direct_execute_is_not_recorded(self):
+        registry = OperationRegistry(self.mcp, metrics=self.metrics)
+        registry.register(MedianOperation)
+
+        await registry.execute("median", {"numbers": [1, 2]})
+
+        assert self.metrics.snapshot()["tools"] == {}
+
+    @pytest.mark.asyncio
+    async def test_prompt_wrapper_records_calls(self):
+        registry = PromptRegistry(self.mcp, metrics=self.metrics)
+        registry.register(MultiplicationTablePrompt)
+
+        async with Client(self.mcp) as client:
+            await client.get_prompt("multiplication_table", {"size": 3})
+
+        prompt = self.metrics.snapshot()["prompts"]["multiplication_table"]
+        assert (prompt["calls"], prompt["errors"]) == (1, 0)
+        assert set(prompt["latency"]) == {"validation", "execution", "total"}
+
+    @pytest.mark.asyncio
+    async def test_metrics_resources(self, tmp_path):
+        server = create_calculator_server(cache_dir=tmp_path, metrics=Metrics())
+
+        async with Client(server) as client:
+            await client.call_tool("add", {"a": 1, "b": 2})
+            await client.call_tool("evaluate", {"expression": "1+2*3"})
+            snapshot = json.loads((await client.read_resource("metrics://calls"))[0].text)
+            prometheus = (await client.read_resource("metrics://prometheus"))[0].text
+
+        assert snapshot["tools"]["add"]["calls"] == 1
+        assert snapshot["tools"]["evaluate"]["calls"] == 1
+        assert 'calculator_mcp_calls_total{kind="tool",name="add"} 1' in prometheus
@@ -0,0 +1,81 @@
+"""
+运算注册器调用路径测试
+"""
+import pytest
+from fastmcp import Client, FastMCP
+from calculator_mcp.base.registry import OperationRegistry, OperationTool, input_adapter
+from calculator_mcp.base.signature import build_signature, build_tool_function
+from calculator_mcp.operations.gcd import GCDOperation, GCDInput
+from calculator_mcp.operations.median import MedianOperation, MedianInput
+
+
+class TestOperationRegistry:
+    
+    def setup_method(self):
+        self.registry = OperationRegistry(FastMCP(name="registry-test"))
+        self.registry.register(MedianOperation)
+        self.registry.register(GCDOperation)
+    
+    def test_input_adapter_is_cached(self):
+        assert input_adapter(MedianInput) is input_adapter(MedianInput)
+    
+    @pytest.mark.asyncio
+    async def test_execute_with_arguments(self):
+        result = await self.registry.execute("median", {"numbers": [5, 1, 3]})
+        
+        assert result.success is True
+        assert result.result == 3
+    
+    @pytest.mark.asyncio
+    async def test_execute_with_validated_model(self):
+        result = await self.registry.execute("median", MedianInput(numbers=[4, 2]))
+        
+        assert result.success is True
+        assert result.result == 3
+    
+    @pytest.mark.asyncio
+    async def test_validation_errors_become_results(self):
+        result = await self.registry.execute("median", {"numbers": ["abc"]})
+        
+        assert result.success is False
+        assert result.operation_name == "median"
+    
+    @pytest.mark.asyncio
+    async def test_tool_arguments_validated_only_by_registry(self):
+        mcp = self.registry.mcp_server
+        tool = await mcp.get_tool("median")
+        
+        async with Client(mcp) as client:
+            result = await client.call_tool("median", {"numbers": ["abc"]})
+        
+        assert isinstance(tool, OperationTool)
+        assert tool.parameters["required"] == ["numbers"]
+        assert result.structured_content["success"] is False
+        assert result.structured_content["operation_name"] == "median"
+    
+    @pytest.mark.asyncio
+    async def test_body_validation_error_is_tool_error(self):
+        async def handler(kwargs):
+            return MedianInput(numbers=[])
+        
+        mcp = FastMCP(name="body-error-test", mask_error_details=True)
+        tool_function = build_tool_function("broken", build_signature(MedianInput), handler)
+        mcp.add_tool(OperationTool.from_tool_function(tool_function, "broken"))
+        
+        async with Client(mcp) as client:
+            result = await client.call_tool("broken", {"numbers": [1]}, raise_on_error=False)
+        
+        # 函数体内的校验错误属于服务端错误，按掩码规则隐藏细节，而不是当作参数错误返回
+        assert result.is_error is True
+        assert result.content[0].text == "Error calling tool 'broken'"
+    
+    @pytest.mark.asyncio
+    async def test_field_validator_still_applies(self):
+        result = await self.registry.execute("gcd", {"numbers": [0, 0]})
+        
+        assert result.success is False
+        assert "不能全部为0" in result.error_message
+    
+    def test_integer_list_rejects_fractions(self):
+        with pytest.raises(ValueError):
+            GCDInput(numbers=[4, 2.5])
@@ -0,0 +1,148 @@
+"""
+运算结果缓存测试
+"""
+import pytest
+from fastmcp import FastMCP
+from calculator_mcp.base import result_cache as result_cache_module
+from calculator_mcp.base.models import OperationResult
+from calculator_mcp.base.registry import OperationRegistry
+from calculator_mcp.base.result_cache import CACHE_ENV, CACHE_TTL_ENV, ResultCache
+from calculator_mcp.operations.addition import AdditionOperation
+from calculator_mcp.operations.combination import CombinationOperation, CombinationInput
+from calculator_mcp.operations.division import DivisionOperation
+from calculator_mcp.operations.stream_statistics import StreamOpenOperation
+
+
+def _result(value: float, name: str = "addition") -> OperationResult:
+    return OperationResult(success=True, result=value, operation_name=name, metadata={"value": value})
+
+
+class TestResultCache:
+    
+    def test_key_is_canonical(self):
+        key = ResultCache.key("combination", CombinationInput(n=10, r=3), "full")
+        
+        assert key == ResultCache.key("combination", CombinationInput(r=3, n=10), "full")
+        assert key != ResultCache.key("combination", CombinationInput(n=10, r=4), "full")
+        assert key != ResultCache.key("combination", CombinationInput(n=10, r=3), "none")
+        assert key != ResultCache.key("permutation", CombinationInput(n=10, r=3), "full")
+    
+    def test_hit_and_miss_counters(self):
+        cache = ResultCache()
+        
+        assert cache.get("a") is None
+        cache.put("a", "addition", _result(1))
+        assert cache.get("a").result == 1
+        stats = cache.stats()
+        assert (stats["entries"], stats["hits"], stats["misses"], stats["evictions"]) == (1, 1, 1, 0)
+        assert stats["bytes"] == len(_result(1).model_dump_json())
+    
+    def test_returns_copies(self):
+        cache = ResultCache()
+        result = _result(1)
+        cache.put("a", "addition", result)
+        
+        result.metadata["value"] = 2
+        cache.get("a").metadata["value"] = 3
+        
+        assert cache.get("a").metadata["value"] == 1
+    
+    def test_evicts_least_recently_used_by_entries(self):
+        cache = ResultCache(max_entries=2)
+        cache.put("a", "addition", _result(1))
+        cache.put("b", "addition", _result(2))
+        cache.get("a")
+        cache.put("c", "addition", _result(3))
+        
+        assert cache.get("b") is None
+        assert cache.get("a") is not None
+        assert cache.evictions == 1
+    
+    def test_evicts_by_bytes(self):
+        size = len(_result(1).model_dump_json())
+        cache = ResultCache(max_bytes=2 * size)
+        for key in "abc":
+            cache.put(key, "addition", _result(1))
+        
+        assert len(cache) == 2
+        assert cache.stats()["bytes"] <= 2 * size
+        assert cache.evictions == 1
+    
+    def test_per_operation_ttl(self, monkeypatch):
+        now = [1000.0]
+        monkeypatch.setattr(result_cache_module.time, "monotonic", lambda: now[0])
+        cache = ResultCache(ttl=60, ttls={"prime_check": None, "combination": 0})
+        cache.put("a", "addition", _result(1))
+        cache.put("p", "prime_check", _result(1, "prime_check"))
+        cache.put("c", "combination", _result(1, "combination"))
+        
+        now[0] += 61
+        
+        assert cache.get("a") is None
+        assert cache.get("p") is not None
+        assert cache.get("c") is None
+        assert cache.expirations == 1
+    
+    def test_from_env(self, monkeypatch):
+        monkeypatch.delenv(CACHE_ENV, raising=False)
+        assert ResultCache.from_env() is None
+        
+        monkeypatch.setenv(CACHE_ENV, "128")
+        monkeypatch.setenv(CACHE_TTL_ENV, "30")
+        cache = ResultCache.from_env()
+        assert cache.max_entries == 128
+        assert cache.ttl == 30
+
+
+class TestRegistryResultCache:
+    
+    def setup_method(self):
+        self.cache = ResultCache()
+        self.registry = OperationRegistry(FastMCP(name="cache-test"), result_cache=self.cache)
+        for operation_class in [AdditionOperation, CombinationOperation, DivisionOperation, StreamOpenOperation]:
+            self.registry.register(operation_class)
+    
+    @pytest.mark.asyncio
+    async def test_repeated_call_hits_cache(self, monkeypatch):
+        first = await self.registry.execute("combination", {"n": 30, "r": 4})
+        
+        async def fail(input_data):
+            raise AssertionError("应直接返回缓存的结果")
+        monkeypatch.setattr(self.registry.get_operation("combination"), "execute", fail)
+        second = await self.registry.execute("combination", {"n": 30, "r": 4})
+        
+        assert second == first
+        assert self.cache.hits == 1
+    
+    @pytest.mark.asyncio
+    async def test_detail_is_part_of_key(self):
+        full = await self.registry.execute("combination", {"n": 30, "r": 4})
+        none = await self.registry.execute("combination", {"n": 30, "r": 4}, detail="none")
+        again = await self.registry.execute("combination", {"n": 30, "r": 4})
+        
+        assert none.metadata is None
+        assert again.metadata == full.metadata
+        assert self.cache.hits == 1
+    
+    @pytest.mark.asyncio
+    async def test_failures_are_not_cached(self):
+        await self.registry.execute("divide", {"a": 1, "b": 0})
+        
+        assert len(self.cache) == 0
+    
+    @pytest.mark.asyncio
+    async def test_stateful_operations_bypass_cache(self):
+        first = await self.registry.execute("stream_open", {})
+        second = await self.registry.execute("stream_open", {})
+        
+        assert first.stream_id != second.stream_id
+        assert self.cache.stats()["misses"] == 0
+    
+    @pytest.mark.asyncio
+    async def test_disabled_by_default(self):
+        registry = OperationRegistry(FastMCP(name="no-cache"))
+        registry.register(AdditionOperation)
+        
+        result = await registry.execute("add", {"a": 1, "b": 2})
+        assert result.result == 3
+        assert registry.result_cache is None
@@ -0,0 +1,48 @@
+"""
+工具签名构建测试
+"""
+import inspect
+from typing import List
+import pytest
+from calculator_mcp.base.signature import build_signature, build_tool_function
+from calculator_mcp.operations.prime_check import PrimeCheckInput
+from calculator_mcp.operations.variance import VarianceInput
+from calculator_mcp.prompts.multiplication_table import MultiplicationTableArguments
+
+
+class TestBuildSignature:
+    
+    def test_operation_signature_fields_required(self):
+        signature = build_signature(VarianceInput)
+        
+        assert list(signature.parameters) == ["numbers", "is_sample"]
+        assert signature.parameters["numbers"].annotation is List
+        assert signature.parameters["is_sample"].annotation is bool
+        assert all(p.default is inspect.Parameter.empty for p in signature.parameters.values())
+    
+    def test_prompt_signature_keeps_defaults(self):
+        signature = build_signature(MultiplicationTableArguments, with_defaults=True)
+        
+        assert signature.parameters["size"].default is inspect.Parameter.empty
+        assert signature.parameters["start_number"].default == 1
+        assert signature.parameters["language"].default == "zh"
+    
+    def test_signature_is_cached(self):
+        assert build_signature(VarianceInput) is build_signature(VarianceInput)
+    
+    @pytest.mark.asyncio
+    async def test_tool_function_forwards_kwargs(self):
+        async def handler(kwargs):
+            return kwargs
+        
+        tool_function = build_tool_function("variance", build_signature(VarianceInput), handler)
+        
+        assert tool_function.__name__ == "variance"
+        assert inspect.signature(tool_function) == build_signature(VarianceInput)
+        assert await tool_function(numbers=[1, 2], is_sample=False) == {"numbers": [1, 2], "is_sample": False}
+    
+    def test_none_default_fields_are_optional(self):
+        signature = build_signature(PrimeCheckInput)
+        
+        assert signature.parameters["number"].default is None
+        assert signature.parameters["numbers"].default is None
@@ -0,0 +1,216 @@
+"""
+调用追踪测试
+"""
+import asyncio
+import json
+import logging
+import pytest
+from fastmcp import Client, FastMCP
+from calculator_mcp.base.prompt_registry import PromptRegistry
+from calculator_mcp.base.registry import OperationRegistry
+from calculator_mcp.base.tracing import (
+    TRACE_ENV,
+    TRACE_FILE_ENV,
+    JsonlExporter,
+    RingBufferExporter,
+    Tracer,
+    TracingMiddleware,
+    current_span,
+)
+from calculator_mcp.operations.division import DivisionOperation
+from calculator_mcp.operations.variance import VarianceOperation
+from calculator_mcp.prompts import MultiplicationTablePrompt
+from calculator_mcp.server import create_calculator_server
+
+
+def _by_name(spans):
+    return {span.name: span for span in spans}
+
+
+class TestTracer:
+
+    def test_nested_spans_share_trace(self):
+        exporter = RingBufferExporter()
+        tracer = Tracer(exporter)
+
+        with tracer.span("outer", operation="add") as outer:
+            assert current_span() is outer
+            with tracer.span("inner") as inner:
+                pass
+        assert current_span() is None
+
+        assert [span.name for span in exporter.spans()] == ["inner", "outer"]
+        assert inner.trace_id == outer.trace_id
+        assert inner.parent_id == outer.span_id
+        assert outer.parent_id is None
+        assert outer.duration >= inner.duration >= 0
+        assert outer.attributes == {"operation": "add"}
+
+    def test_span_records_exception(self):
+        exporter = RingBufferExporter()
+        tracer = Tracer(exporter)
+
+        with pytest.raises(ValueError):
+            with tracer.span("failing"):
+                raise ValueError("boom")
+
+        assert exporter.spans()[0].attributes["error"] == "boom"
+
+    def test_ring_buffer_keeps_latest(self):
+        exporter = RingBufferExporter(capacity=2)
+        tracer = Tracer(exporter)
+        for name in ("a", "b", "c"):
+            with tracer.span(name):
+                pass
+
+        assert [span.name for span in exporter.spans()] == ["b", "c"]
+        exporter.clear()
+        assert exporter.spans() == []
+
+    def test_jsonl_exporter(self, tmp_path):
+        path = tmp_path / "traces" / "spans.jsonl"
+        tracer = Tracer(JsonlExporter(path))
+
+        with tracer.span("outer", operation="add"):
+            with tracer.span("inner"):
+                pass
+
+        lines = [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+        assert [line["name"] for line in lines] == ["inner", "outer"]
+        assert lines[0]["parent_id"] == lines[1]["span_id"]
+        assert lines[1]["attributes"] == {"operation": "add"}
+
+    def test_jsonl_exporter_keeps_file_open(self, tmp_path):
+        path = tmp_path / "spans.jsonl"
+        exporter = JsonlExporter(path)
+        tracer = Tracer(exporter)
+
+        with tracer.span("first"):
+            pass
+        handle = exporter._file
+        with tracer.span("second"):
+            pass
+
+        assert exporter._file is handle
+        exporter.close()
+        assert exporter._file is None
+        assert len(path.read_text(encoding="utf-8").splitlines()) == 2
+
+    def test_jsonl_write_failure_is_logged(self, tmp_path, caplog):
+        path = tmp_path / "spans.jsonl"
+        path.mkdir()
+        tracer = Tracer(JsonlExporter(path))
+
+        with caplog.at_level(logging.WARNING):
+            with tracer.span("outer"):
+                pass
+
+        assert "写入追踪文件" in caplog.text
+
+    @pytest.mark.asyncio
+    async def test_jsonl_written_off_event_loop(self, tmp_path):
+        path = tmp_path / "spans.jsonl"
+        tracer = Tracer(JsonlExporter(path))
+
+        with tracer.span("outer"):
+            with tracer.span("inner"):
+                pass
+        for _ in range(100):
+            if path.exists() and path.read_text(encoding="utf-8"):
+                break
+            await asyncio.sleep(0.01)
+
+        lines = [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+        assert [line["name"] for line in lines] == ["inner", "outer"]
+
+    def test_from_env(self, monkeypatch, tmp_path):
+        monkeypatch.delenv(TRACE_ENV, raising=False)
+        monkeypatch.delenv(TRACE_FILE_ENV, raising=False)
+        assert Tracer.from_env() is None
+
+        monkeypatch.setenv(TRACE_ENV, "memory")
+        assert isinstance(Tracer.from_env().exporter, RingBufferExporter)
+
+        monkeypatch.delenv(TRACE_ENV)
+        monkeypatch.setenv(TRACE_FILE_ENV, str(tmp_path / "spans.jsonl"))
+        assert isinstance(Tracer.from_env().exporter, JsonlExporter)
+
+        monkeypatch.delenv(TRACE_FILE_ENV)
+        monkeypatch.setenv(TRACE_ENV, "jaeger")
+        with pytest.raises(ValueError):
+            Tracer.from_env()
+
+
+class TestRegistryTracing:
+
+    def setup_method(self):
+        self.mcp = FastMCP(name="tracing-test")
+        self.exporter = RingBufferExporter()
+        self.tracer = Tracer(self.exporter)
+
+    @pytest.mark.asyncio
+    async def test_tool_call_spans(self):
+        self.mcp.add_middleware(TracingMiddleware(self.tracer))
+        registry = OperationRegistry(self.mcp, tracer=self.tracer)
+        registry.register(VarianceOperation)
+
+        async with Client(self.mcp) as client:
+            await client.call_tool("variance", {"numbers": [1, 2, 3, 4], "is_sample": True})
+
+        spans = _by_name(self.exporter.spans())
+        root = spans["tool/variance"]
+        assert set(spans) == {"tool/variance", "arguments", "validation", "execute", "result", "serialization"}
+        assert root.parent_id is None
+        assert root.attributes["input_size"] == 5
+        for name in ("arguments", "validation", "execute", "result", "serialization"):
+            assert spans[name].parent_id == root.span_id
+            assert spans[name].trace_id == root.trace_id
+            assert spans[name].attributes["operation"] == "variance"
+        assert spans["validation"].start <= spans["execute"].start <= spans["result"].start
+        assert sum(spans[name].duration for name in ("validation", "execute", "result")) <= root.duration
+
+    @pytest.mark.asyncio
+    async def test_failed_call_marks_root(self):
+        self.mcp.add_middleware(TracingMiddleware(self.tracer))
+        registry = OperationRegistry(self.mcp, tracer=self.tracer)
+        registry.register(DivisionOperation)
+
+        async with Client(self.mcp) as client:
+            await client.call_tool("divide", {"a": 1, "b": 0})
+
+        assert "除数不能为零" in _by_name(self.exporter.spans())["tool/divide"].attributes["error"]
+
+    @pytest.mark.asyncio
+    async def test_without_middleware_registry_creates_root(self):
+        registry = OperationRegistry(self.mcp, tracer=self.tracer)
+        registry.register(VarianceOperation)
+        tool = await self.mcp.get_tool("variance")
+
+        await tool.fn(numbers=[1, 2, 3])
+
+        spans = _by_name(self.exporter.spans())
+        assert set(spans) == {"tool/variance", "validation", "execute", "result"}
+        assert spans["execute"].parent_id == spans["tool/variance"].span_id
+
+    @pytest.mark.asyncio
+    async def test_prompt_spans(self):
+        self.mcp.add_middleware(TracingMiddleware(self.tracer))
+        registry = PromptRegistry(self.mcp, tracer=self.tracer)
+        registry.register(MultiplicationTablePrompt)
+
+        async with Client(self.mcp) as client:
+            await client.get_prompt("multiplication_table", {"size": 3})
+
+        spans = _by_name(self.exporter.spans())
+        assert set(spans) == {"prompt/multiplication_table", "arguments", "validation", "execute", "serialization"}
+
+    @pytest.mark.asyncio
+    async def test_traces_resource(self, tmp_path):
+        server = create_calculator_server(cache_dir=tmp_path, tracer=self.tracer)
+
+        async with Client(server) as client:
+            await client.call_tool("add", {"a": 1, "b": 2})
+            spans = json.loads((await client.read_resource("traces://recent"))[0].text)
+
+        assert spans[-1]["name"] == "tool/add"
+        assert spans[-1]["attributes"]["operation"] == "add"
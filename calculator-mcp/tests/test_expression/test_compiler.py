@@ -0,0 +1,126 @@
+"""
+表达式编译与整列求值测试
+"""
+import pytest
+from fastmcp import FastMCP, Client
+from calculator_mcp.base.registry import OperationRegistry
+from calculator_mcp.expression import compiler
+from calculator_mcp.expression.compiler import MAX_ROWS, compile_expression, evaluate_array
+from calculator_mcp.expression.parser import ExpressionError, normalize
+
+
+class TestCompileCache:
+    
+    def setup_method(self):
+        compiler.clear_cache()
+    
+    def test_normalize(self):
+        assert normalize(" P * (1 + r / n) ** (n * t) ") == "P*(1+r/n)^(n*t)"
+        assert normalize("sin( 30 deg )") == "sin(30 deg)"
+    
+    def test_cached_by_normalized_text(self):
+        first, first_cached = compile_expression("P*(1+r/n)^(n*t)")
+        second, second_cached = compile_expression("P * (1 + r/n) ^ (n*t)")
+        
+        assert second is first
+        assert (first_cached, second_cached) == (False, True)
+        assert first.variables == ("P", "r", "n", "t")
+    
+    def test_result_reports_cache_use(self):
+        assert evaluate_array("x + 1", {"x": [1]}).compiled_from_cache is False
+        assert evaluate_array("x+1", {"x": [2]}).compiled_from_cache is True
+    
+    def test_unknown_function_fails_at_compile_time(self):
+        with pytest.raises(ExpressionError, match="未知的函数"):
+            compile_expression("foo(x)")
+
+
+class TestEvaluateArray:
+    
+    def test_compound_interest_table(self):
+        rows = [(1000, 0.05, 10), (2500, 0.03, 5), (100, 0.12, 1)]
+        result = evaluate_array("P*(1+r/n)^(n*t)", {
+            "P": [row[0] for row in rows],
+            "r": [row[1] for row in rows],
+            "t": [row[2] for row in rows],
+            "n": 12,
+        })
+        
+        assert result.success is True
+        assert result.count == 3
+        for value, (p, r, t) in zip(result.results, rows):
+            assert value == pytest.approx(p * (1 + r / 12) ** (12 * t))
+    
+    @pytest.mark.parametrize("source, expected", [
+        ("-x^2", [-1, -4]),
+        ("x % 3 + abs(-x)", [2, 4]),
+        ("x! + comb(x + 3, 2) + perm(x + 1, 2)", [9, 18]),
+        ("gcd(x * 6, 4) + lcm(x, 3) + mean(x, 3) + median(x, 0, 5)", [8, 14.5]),
+        ("sin(x * 90deg) + cos(0) + tan(45deg)", [3, 2]),
+        ("log(100) + ln(e) + log(8, 2) + exp(0) + sqrt(16) + root(-8, 3)", [9, 9]),
+        ("180deg / pi", [1, 1]),
+    ])
+    def test_matches_scalar_semantics(self, source, expected):
+        result = evaluate_array(source, {"x": [1, 2]})
+        
+        assert result.success is True, result.error_message
+        assert result.results == pytest.approx(expected)
+    
+    @pytest.mark.parametrize("source, message, rows", [
+        ("1 / x", "除数不能为零", [1]),
+        ("sqrt(x - 1)", "负数的平方根", [1]),
+        ("(x + 0.5)!", "整数", [0, 1, 2]),
+        ("ln(x)", "正数", [1]),
+        ("tan(x * 90deg)", "无定义", [0, 2]),
+        ("(-x) ^ 0.5", "复数", [0, 2]),
+    ])
+    def test_domain_errors_report_rows(self, source, message, rows):
+        result = evaluate_array(source, {"x": [1, 0, 3]})
+        
+        assert result.success is False
+        assert message in result.error_message
+        assert result.invalid_rows == rows
+    
+    def test_integer_functions_reject_inexact_values(self):
+        gcd = evaluate_array("gcd(x, 6)", {"x": [3e19, 12]})
+        lcm = evaluate_array("lcm(x, 2^52 - 1)", {"x": [2**52 - 3, 3]})
+        
+        assert gcd.success is False
+        assert gcd.invalid_rows == [0]
+        assert lcm.success is False
+        assert lcm.invalid_rows == [0]
+        assert evaluate_array("lcm(x, 6, 4)", {"x": [5, 9]}).results == [60, 36]
+    
+    def test_binding_errors(self):
+        assert "缺少变量: y" in evaluate_array("x + y", {"x": [1]}).error_message
+        assert "不一致" in evaluate_array("x + y", {"x": [1, 2], "y": [1]}).error_message
+        assert evaluate_array("x", {"x": [1, float("nan")]}).invalid_rows == [1]
+    
+    def test_overflow(self):
+        result = evaluate_array("10 ^ x", {"x": [1, 400]})
+        
+        assert result.success is False
+        assert result.invalid_rows == [1]
+    
+    def test_row_limit(self, monkeypatch):
+        monkeypatch.setattr(compiler, "MAX_ROWS", 2)
+        
+        assert "行数过多" in evaluate_array("x", {"x": [1, 2, 3]}).error_message
+        assert MAX_ROWS == 1_000_000
+
+
+class TestEvaluateArrayTool:
+    
+    @pytest.mark.asyncio
+    async def test_tool(self):
+        mcp = FastMCP(name="expression-array-test")
+        OperationRegistry(mcp).register_expression_tool()
+        
+        async with Client(mcp) as client:
+            response = await client.call_tool(
+                "evaluate_array",
+                {"expression": "a * b + c", "variables": {"a": [1, 2, 3], "b": [4, 5, 6], "c": 1}}
+            )
+        
+        assert response.structured_content["results"] == [5, 11, 19]
+        assert response.structured_content["variables"] == ["a", "b", "c"]
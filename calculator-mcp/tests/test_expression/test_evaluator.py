@@ -0,0 +1,95 @@
+"""
+表达式求值测试
+"""
+import math
+import pytest
+from fastmcp import FastMCP, Client
+from calculator_mcp.base.registry import OperationRegistry
+from calculator_mcp.manifest import load_manifest
+
+
+class TestEvaluate:
+    
+    def setup_method(self):
+        self.mcp = FastMCP(name="expression-test")
+        self.registry = OperationRegistry(self.mcp)
+        for entry in load_manifest()["operations"]:
+            self.registry.register_entry(entry)
+        self.registry.register_expression_tool()
+    
+    @pytest.mark.asyncio
+    async def test_example_formula(self):
+        result = await self.registry.evaluate("sqrt(3^2+4^2) * sin(30deg) / gcd(12, 18)")
+        
+        assert result.success is True
+        assert result.result == pytest.approx(5 * 0.5 / 6)
+        assert result.operation_count == 8
+        assert result.trace is None
+    
+    @pytest.mark.asyncio
+    async def test_trace(self):
+        result = await self.registry.evaluate("(1 + 2) * 3!", trace=True)
+        
+        assert result.result == 18
+        assert [(step.expression, step.operation, step.result) for step in result.trace] == [
+            ("(1 + 2)", "add", 3),
+            ("3!", "factorial", 6),
+            ("(1 + 2) * 3!", "multiply", 18),
+        ]
+        assert result.trace[0].arguments == {"a": 1, "b": 2}
+    
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("source, expected", [
+        ("-2^2", -4),
+        ("2^3^2", 512),
+        ("10 % 4", 2),
+        ("log(1000)", 3),
+        ("log(8, 2)", 3),
+        ("ln(e)", 1),
+        ("exp(0)", 1),
+        ("root(27, 3)", 3),
+        ("abs(-3) + square(2) + cube(2)", 15),
+        ("comb(10, 3) + perm(5, 2)", 140),
+        ("lcm(4, 6) - mean(1, 2, 3) + median(5, 1, 3)", 13),
+        ("cos(pi)", -1),
+        ("tan(45deg)", 1),
+        ("180deg", math.pi),
+    ])
+    async def test_functions(self, source, expected):
+        result = await self.registry.evaluate(source)
+        
+        assert result.success is True, result.error_message
+        assert result.result == pytest.approx(expected)
+    
+    @pytest.mark.asyncio
+    async def test_operation_validation_applies(self):
+        result = await self.registry.evaluate("1 + 4 / (2 - 2)")
+        
+        assert result.success is False
+        assert "4 / (2 - 2)" in result.error_message
+        assert "除数不能为零" in result.error_message
+        
+        result = await self.registry.evaluate("sqrt(-1)")
+        assert result.success is False
+        
+        result = await self.registry.evaluate("gcd(2.5, 5)")
+        assert result.success is False
+    
+    @pytest.mark.asyncio
+    async def test_unknown_function_and_arity(self):
+        result = await self.registry.evaluate("foo(1)")
+        assert "未知的函数" in result.error_message
+        
+        result = await self.registry.evaluate("sqrt(1, 2)")
+        assert "需要1个参数" in result.error_message
+        
+        result = await self.registry.evaluate("gcd(4)")
+        assert "至少2个" in result.error_message
+    
+    @pytest.mark.asyncio
+    async def test_evaluate_tool(self):
+        async with Client(self.mcp) as client:
+            response = await client.call_tool("evaluate", {"expression": "2 * (3 + 4)", "trace": True})
+        
+        assert response.structured_content["result"] == 14
+        assert len(response.structured_content["trace"]) == 2
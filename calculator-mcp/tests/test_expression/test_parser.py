@@ -0,0 +1,99 @@
+"""
+表达式解析测试
+"""
+import pytest
+from calculator_mcp.expression.parser import (
+    MAX_DEPTH,
+    MAX_TOKENS,
+    Binary,
+    Call,
+    Constant,
+    Degrees,
+    ExpressionError,
+    Factorial,
+    Number,
+    Unary,
+    parse,
+)
+
+
+def _shape(node):
+    """语法树的简洁形式，便于比较结构"""
+    if isinstance(node, Number):
+        return node.value
+    if isinstance(node, Constant):
+        return node.name
+    if isinstance(node, Unary):
+        return (node.operator, _shape(node.operand))
+    if isinstance(node, Binary):
+        return (node.operator, _shape(node.left), _shape(node.right))
+    if isinstance(node, Factorial):
+        return ("!", _shape(node.operand))
+    if isinstance(node, Degrees):
+        return ("deg", _shape(node.operand))
+    if isinstance(node, Call):
+        return (node.function, *map(_shape, node.args))
+
+
+class TestParser:
+    
+    @pytest.mark.parametrize("source, shape", [
+        ("1 + 2 * 3", ("+", 1, ("*", 2, 3))),
+        ("(1 + 2) * 3", ("*", ("+", 1, 2), 3)),
+        ("8 - 3 - 2", ("-", ("-", 8, 3), 2)),
+        ("2 ^ 3 ^ 2", ("^", 2, ("^", 3, 2))),
+        ("2 ** 3", ("^", 2, 3)),
+        ("-2 ^ 2", ("-", ("^", 2, 2))),
+        ("2 ^ -1", ("^", 2, ("-", 1))),
+        ("3! + 1", ("+", ("!", 3), 1)),
+        ("sin(30deg)", ("sin", ("deg", 30))),
+        ("gcd(12, 18) % 4", ("%", ("gcd", 12, 18), 4)),
+        ("2 * pi", ("*", 2, "pi")),
+        (".5e1 + 1.5", ("+", 5.0, 1.5)),
+    ])
+    def test_precedence_and_associativity(self, source, shape):
+        assert _shape(parse(source)) == shape
+    
+    def test_node_spans_cover_source(self):
+        source = "sqrt(3^2 + 4^2) * 2"
+        node = parse(source)
+        
+        assert source[node.start:node.end] == source
+        assert source[node.left.start:node.left.end] == "sqrt(3^2 + 4^2)"
+        assert source[node.left.args[0].start:node.left.args[0].end] == "3^2 + 4^2"
+    
+    def test_integer_literals_stay_integers(self):
+        assert parse("12").value == 12
+        assert isinstance(parse("12").value, int)
+        assert isinstance(parse("12.0").value, float)
+    
+    @pytest.mark.parametrize("source, message", [
+        ("", "不能为空"),
+        ("1 +", "不完整"),
+        ("(1 + 2", "缺少 '\\)'"),
+        ("1 2", "意外"),
+        ("x + 1", "未知的名称"),
+        ("1 $ 2", "无法识别"),
+        ("1e400", "超出浮点数范围"),
+    ])
+    def test_syntax_errors(self, source, message):
+        with pytest.raises(ExpressionError, match=message):
+            parse(source)
+    
+    def test_error_reports_position(self):
+        with pytest.raises(ExpressionError) as info:
+            parse("1 + * 2")
+        
+        assert info.value.position == 4
+    
+    def test_overflowing_literal_reports_position(self):
+        with pytest.raises(ExpressionError) as info:
+            parse("2 * 1.5e309")
+        
+        assert info.value.position == 4
+    
+    def test_limits(self):
+        with pytest.raises(ExpressionError, match="嵌套过深"):
+            parse("(" * (MAX_DEPTH + 1) + "1" + ")" * (MAX_DEPTH + 1))
+        with pytest.raises(ExpressionError, match="过长"):
+            parse("+".join(["1"] * MAX_TOKENS))
@@ -92,4 +92,61 @@ class TestCombinationOperation:
     
     def test_validate_input_valid(self):
         input_data = CombinationInput(n=10, r=3)
-        assert self.operation.validate_input(input_data) is True
\ No newline at end of file
+        assert self.operation.validate_input(input_data) is True
+    
+    @pytest.mark.asyncio
+    async def test_magnitude_mode(self):
+        input_data = CombinationInput(n=1000, r=500, mode="magnitude")
+        result = await self.operation.execute(input_data)
+        digits = str(math.comb(1000, 500))
+        
+        assert result.success is True
+        assert result.digit_count == len(digits)
+        assert result.mantissa == pytest.approx(float(digits[:16]) / 1e15, rel=1e-14)
+    
+    @pytest.mark.asyncio
+    async def test_magnitude_mode_power_of_ten(self):
+        input_data = CombinationInput(n=10**14, r=1, mode="magnitude")
+        result = await self.operation.execute(input_data)
+        
+        assert result.success is True
+        assert result.digit_count == 15
+        assert result.mantissa == 1.0
+        assert result.exponent == 14
+    
+    def test_invalid_mode(self):
+        with pytest.raises(ValueError):
+            CombinationInput(n=5, r=2, mode="exact")
+    
+    @pytest.mark.asyncio
+    async def test_modular_mode(self):
+        input_data = CombinationInput(n=10**18, r=10**9, modulus=999_983)
+        result = await self.operation.execute(input_data)
+        
+        assert result.success is True
+        assert result.metadata["method"] == "lucas"
+        assert 0 <= result.result < 999_983
+    
+    @pytest.mark.asyncio
+    async def test_modular_mode_small_n(self):
+        input_data = CombinationInput(n=1000, r=500, modulus=13)
+        result = await self.operation.execute(input_data)
+        
+        assert result.success is True
+        assert result.result == math.comb(1000, 500) % 13
+    
+    @pytest.mark.asyncio
+    async def test_modular_mode_requires_prime(self):
+        input_data = CombinationInput(n=10, r=3, modulus=12)
+        result = await self.operation.execute(input_data)
+        
+        assert result.success is False
+        assert "质数" in result.error_message
+    
+    @pytest.mark.asyncio
+    async def test_modular_mode_excludes_magnitude(self):
+        input_data = CombinationInput(n=10, r=3, modulus=7, mode="magnitude")
+        result = await self.operation.execute(input_data)
+        
+        assert result.success is False
+        assert "modulus" in result.error_message
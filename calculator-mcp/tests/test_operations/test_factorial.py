@@ -3,7 +3,11 @@
 """
 import pytest
 import math
-from calculator_mcp.operations.factorial import FactorialOperation, FactorialInput
+from decimal import Decimal
+from calculator_mcp.operations.factorial import FactorialOperation, FactorialInput, read_factorial
+from calculator_mcp.utils import factorials
+from calculator_mcp.utils.factorials import MAX_EXACT_N
+from calculator_mcp.utils.magnitude import MAX_MAGNITUDE_N
 
 
 class TestFactorialOperation:
@@ -95,4 +99,85 @@ class TestFactorialOperation:
     
     def test_validate_input_too_large(self):
         input_data = FactorialInput(n=171)
-        assert self.operation.validate_input(input_data) is False
\ No newline at end of file
+        assert self.operation.validate_input(input_data) is False
+    
+    @pytest.mark.asyncio
+    async def test_exact_mode(self):
+        input_data = FactorialInput(n=30, mode="exact")
+        result = await self.operation.execute(input_data)
+        
+        assert result.success is True
+        assert result.exact == str(math.factorial(30))
+        assert result.metadata["digit_count"] == 33
+    
+    @pytest.mark.asyncio
+    async def test_exact_mode_beyond_float(self):
+        input_data = FactorialInput(n=1000, mode="exact")
+        result = await self.operation.execute(input_data)
+        
+        assert result.success is True
+        assert result.result is None
+        assert result.exact == str(math.factorial(1000))
+    
+    @pytest.mark.asyncio
+    async def test_exact_mode_resource_for_long_results(self):
+        input_data = FactorialInput(n=5000, mode="exact")
+        result = await self.operation.execute(input_data)
+        
+        assert result.success is True
+        assert result.exact is None
+        assert result.resource_uri == "factorial://5000"
+        assert result.metadata["digit_count"] == len(read_factorial(5000))
+        assert Decimal(read_factorial(5000)) == Decimal(math.factorial(5000))
+    
+    @pytest.mark.asyncio
+    async def test_exact_mode_resource_value_not_computed(self):
+        factorials.clear_cache()
+        input_data = FactorialInput(n=200_000, mode="exact")
+        result = await self.operation.execute(input_data)
+        
+        assert result.resource_uri == "factorial://200000"
+        assert result.metadata["digit_count"] == 973_351
+        assert factorials.cached_factorial(200_000) is None
+    
+    @pytest.mark.asyncio
+    async def test_exact_mode_limit(self):
+        input_data = FactorialInput(n=MAX_EXACT_N + 1, mode="exact")
+        result = await self.operation.execute(input_data)
+        
+        assert result.success is False
+        assert "过大" in result.error_message
+    
+    def test_invalid_mode(self):
+        with pytest.raises(ValueError):
+            FactorialInput(n=5, mode="approx")
+    
+    @pytest.mark.asyncio
+    async def test_magnitude_mode(self):
+        input_data = FactorialInput(n=100, mode="magnitude")
+        result = await self.operation.execute(input_data)
+        digits = str(math.factorial(100))
+        
+        assert result.success is True
+        assert result.digit_count == len(digits) == 158
+        assert result.exponent == 157
+        assert result.mantissa == pytest.approx(float(digits[:16]) / 1e15, rel=1e-14)
+        assert result.result == pytest.approx(math.lgamma(101) / math.log(10))
+        assert result.metadata["scientific"].startswith("9.33262154439442e+157")
+    
+    @pytest.mark.asyncio
+    async def test_magnitude_mode_huge_n(self):
+        input_data = FactorialInput(n=10**15, mode="magnitude")
+        result = await self.operation.execute(input_data)
+        
+        assert result.success is True
+        assert result.digit_count == 14565705518096757
+        assert result.exponent == 14565705518096756
+    
+    @pytest.mark.asyncio
+    async def test_magnitude_mode_limit(self):
+        input_data = FactorialInput(n=MAX_MAGNITUDE_N + 1, mode="magnitude")
+        result = await self.operation.execute(input_data)
+        
+        assert result.success is False
+        assert "过大" in result.error_message
@@ -0,0 +1,44 @@
+"""
+质因数分解操作测试
+"""
+import pytest
+from calculator_mcp.operations.factorize import FactorizeOperation, FactorizeInput
+
+
+class TestFactorizeOperation:
+    
+    def setup_method(self):
+        self.operation = FactorizeOperation()
+    
+    def test_operation_properties(self):
+        assert self.operation.name == "factorize"
+        assert "质因数" in self.operation.description
+        assert self.operation.input_model == FactorizeInput
+    
+    @pytest.mark.asyncio
+    async def test_composite(self):
+        result = await self.operation.execute(FactorizeInput(number=360))
+        
+        assert result.success is True
+        assert result.factors == [[2, 3], [3, 2], [5, 1]]
+        assert result.metadata["divisor_count"] == 24
+        assert result.metadata["expression"] == "360 = 2^3 × 3^2 × 5"
+        assert result.metadata["is_prime"] is False
+    
+    @pytest.mark.asyncio
+    async def test_prime(self):
+        result = await self.operation.execute(FactorizeInput(number=2**61 - 1))
+        
+        assert result.success is True
+        assert result.factors == [[2**61 - 1, 1]]
+        assert result.metadata["is_prime"] is True
+    
+    @pytest.mark.asyncio
+    async def test_large_prime_factors(self):
+        result = await self.operation.execute(FactorizeInput(number=1000003 * 1000033))
+        
+        assert result.factors == [[1000003, 1], [1000033, 1]]
+    
+    def test_number_1_error(self):
+        with pytest.raises(ValueError):
+            FactorizeInput(number=1)
@@ -155,4 +155,23 @@ class TestGCDOperation:
         """测试输入验证：全为0"""
         input_data = GCDInput.__new__(GCDInput)
         input_data.numbers = [0, 0]
-        assert self.operation.validate_input(input_data) is False
\ No newline at end of file
+        assert self.operation.validate_input(input_data) is False
+    
+    @pytest.mark.asyncio
+    async def test_prime_factorization_metadata(self):
+        """测试最大公约数的质因数分解元数据"""
+        result = await self.operation.execute(GCDInput(numbers=[12, 18]))
+        
+        assert result.metadata["prime_factorization"] == [[2, 1], [3, 1]]
+        assert result.metadata["factorization_complete"] is True
+    
+    @pytest.mark.asyncio
+    async def test_hard_factorization_gives_up_quickly(self):
+        """测试两个大质因数的乘积在元数据预算内放弃分解"""
+        g = (10**18 + 9) * (10**18 + 3)
+        result = await self.operation.execute(GCDInput(numbers=[3 * g, 5 * g]))
+        
+        assert result.success is True
+        assert result.metadata["reduced_numbers"] == [3, 5]
+        assert "prime_factorization" not in result.metadata
+        assert result.metadata["factorization_complete"] is False
\ No newline at end of file
@@ -165,4 +165,23 @@ class TestLCMOperation:
         """测试输入验证：数字不足"""
         input_data = LCMInput.__new__(LCMInput)
         input_data.numbers = [10]
-        assert self.operation.validate_input(input_data) is False
\ No newline at end of file
+        assert self.operation.validate_input(input_data) is False
+    
+    @pytest.mark.asyncio
+    async def test_prime_factorization_metadata(self):
+        """测试最小公倍数的质因数分解元数据"""
+        result = await self.operation.execute(LCMInput(numbers=[4, 6]))
+        
+        assert result.metadata["prime_factorization"] == [[2, 2], [3, 1]]
+        assert result.metadata["factorization_complete"] is True
+    
+    @pytest.mark.asyncio
+    async def test_hard_factorization_gives_up_quickly(self):
+        """测试含两个大质因数的数在元数据预算内放弃分解"""
+        first = (10**18 + 9) * (10**18 + 3)
+        second = (10**18 + 31) * (10**18 + 37)
+        result = await self.operation.execute(LCMInput(numbers=[first, second]))
+        
+        assert result.success is True
+        assert "prime_factorization" not in result.metadata
+        assert result.metadata["factorization_complete"] is False
\ No newline at end of file
@@ -0,0 +1,72 @@
+"""
+数组数量级运算操作测试
+"""
+import math
+import pytest
+from calculator_mcp.base.operation import detail_level
+from calculator_mcp.operations.magnitude_array import MagnitudeArrayOperation, MagnitudeArrayInput
+
+
+class TestMagnitudeArrayOperation:
+    
+    def setup_method(self):
+        self.operation = MagnitudeArrayOperation()
+    
+    def test_operation_properties(self):
+        assert self.operation.name == "magnitude_array"
+        assert self.operation.input_model == MagnitudeArrayInput
+    
+    @pytest.mark.asyncio
+    async def test_factorial(self):
+        input_data = MagnitudeArrayInput(kind="factorial", n_values=[0, 5, 100])
+        result = await self.operation.execute(input_data)
+        
+        assert result.success is True
+        assert result.digit_counts == [1, 3, 158]
+        assert result.exponents == [0, 2, 157]
+        assert result.mantissas[1] == pytest.approx(1.2)
+        assert result.results[2] == pytest.approx(math.log10(math.factorial(100)))
+        assert result.metadata["count"] == 3
+    
+    @pytest.mark.asyncio
+    async def test_combination(self):
+        pairs = [(52, 5), (1000, 3), (10**12, 10**6)]
+        input_data = MagnitudeArrayInput(
+            kind="combination",
+            n_values=[n for n, _ in pairs],
+            r_values=[r for _, r in pairs]
+        )
+        result = await self.operation.execute(input_data)
+        
+        assert result.success is True
+        assert result.digit_counts[:2] == [len(str(math.comb(52, 5))), len(str(math.comb(1000, 3)))]
+        assert result.mantissas[0] == pytest.approx(2.598960)
+    
+    @pytest.mark.asyncio
+    async def test_requires_r_values(self):
+        input_data = MagnitudeArrayInput(kind="permutation", n_values=[5, 6])
+        result = await self.operation.execute(input_data)
+        
+        assert result.success is False
+        assert "r_values" in result.error_message
+    
+    @pytest.mark.asyncio
+    async def test_reports_invalid_indices(self):
+        input_data = MagnitudeArrayInput(kind="permutation", n_values=[5, 3, 10**16], r_values=[2, 4, 1])
+        result = await self.operation.execute(input_data)
+        
+        assert result.success is False
+        assert result.metadata["invalid_indices"] == [1, 2]
+    
+    @pytest.mark.asyncio
+    async def test_detail_none_keeps_arrays(self):
+        input_data = MagnitudeArrayInput(kind="factorial", n_values=[10])
+        with detail_level("none"):
+            result = await self.operation.execute(input_data)
+        
+        assert result.metadata is None
+        assert result.digit_counts == [7]
+    
+    def test_invalid_kind(self):
+        with pytest.raises(ValueError):
+            MagnitudeArrayInput(kind="gamma", n_values=[1])
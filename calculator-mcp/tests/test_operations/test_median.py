@@ -1,8 +1,11 @@
 """
 中位数运算操作测试
 """
+import random
+import numpy as np
 import pytest
-from calculator_mcp.operations.median import MedianOperation, MedianInput
+from calculator_mcp.base.operation import detail_level
+from calculator_mcp.operations.median import MedianOperation, MedianInput, SELECTION_THRESHOLD
 
 
 class TestMedianOperation:
@@ -118,6 +121,36 @@ class TestMedianOperation:
         assert result.metadata["q1_approx"] == 2
         assert result.metadata["q3_approx"] == 4
     
+    @pytest.mark.asyncio
+    async def test_exact_quartiles(self):
+        """测试精确四分位数（线性插值）"""
+        input_data = MedianInput(numbers=[7, 1, 3, 5, 2, 8])
+        result = await self.operation.execute(input_data)
+        
+        assert result.metadata["q1"] == pytest.approx(float(np.quantile([7, 1, 3, 5, 2, 8], 0.25)))
+        assert result.metadata["q3"] == pytest.approx(float(np.quantile([7, 1, 3, 5, 2, 8], 0.75)))
+    
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("size", [SELECTION_THRESHOLD + 1, SELECTION_THRESHOLD + 2])
+    async def test_selection_path_matches_sort(self, size):
+        """测试大列表的选择算法与排序结果一致"""
+        numbers = [random.uniform(-1000, 1000) for _ in range(size)]
+        full = await self.operation.execute(MedianInput(numbers=numbers))
+        
+        with detail_level("summary"):
+            summary = await self.operation.execute(MedianInput(numbers=numbers))
+        
+        assert "sorted_numbers" not in summary.metadata
+        assert "sorted_numbers" not in full.metadata
+        assert full.metadata["sorted_numbers_omitted"] is True
+        assert full.result == pytest.approx(float(np.median(numbers)))
+        assert full.metadata["max"] == max(numbers)
+        assert summary.result == pytest.approx(full.result)
+        assert summary.result == pytest.approx(float(np.median(numbers)))
+        for key in ("min", "max", "q1", "q3", "q1_approx", "q3_approx"):
+            assert summary.metadata[key] == pytest.approx(full.metadata[key])
+        assert summary.metadata["q1"] == pytest.approx(float(np.quantile(numbers, 0.25)))
+    
     @pytest.mark.asyncio
     async def test_empty_list(self):
         """测试空列表"""
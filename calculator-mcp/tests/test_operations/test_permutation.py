@@ -95,4 +95,40 @@ class TestPermutationOperation:
         input_data = PermutationInput.__new__(PermutationInput)
         object.__setattr__(input_data, 'n', 3)
         object.__setattr__(input_data, 'r', 5)
-        assert self.operation.validate_input(input_data) is False
\ No newline at end of file
+        assert self.operation.validate_input(input_data) is False
+    
+    @pytest.mark.asyncio
+    async def test_magnitude_mode(self):
+        input_data = PermutationInput(n=10**15, r=2, mode="magnitude")
+        result = await self.operation.execute(input_data)
+        digits = str(math.perm(10**15, 2))
+        
+        assert result.success is True
+        assert result.digit_count == len(digits)
+        assert result.mantissa == pytest.approx(float(digits[:16]) / 1e15, rel=1e-14)
+        assert result.metadata["formula"] == f"log10(P({10**15},2))"
+    
+    @pytest.mark.asyncio
+    async def test_float_mode_limit_mentions_magnitude(self):
+        input_data = PermutationInput(n=200, r=3)
+        result = await self.operation.execute(input_data)
+        
+        assert result.success is False
+        assert "magnitude" in result.error_message
+    
+    @pytest.mark.asyncio
+    async def test_modular_mode(self):
+        input_data = PermutationInput(n=500, r=200, modulus=1009)
+        result = await self.operation.execute(input_data)
+        
+        assert result.success is True
+        assert result.result == math.perm(500, 200) % 1009
+        assert result.metadata["formula"] == "P(500,200) mod 1009"
+    
+    @pytest.mark.asyncio
+    async def test_modular_mode_modulus_too_large(self):
+        input_data = PermutationInput(n=5, r=2, modulus=10**9 + 7)
+        result = await self.operation.execute(input_data)
+        
+        assert result.success is False
+        assert "过大" in result.error_message
@@ -1,8 +1,13 @@
 """
 质数判断操作测试
 """
+import base64
 import pytest
+from calculator_mcp.base import executor
+from calculator_mcp.base.operation import detail_level
+from calculator_mcp.operations import prime_check
 from calculator_mcp.operations.prime_check import PrimeCheckOperation, PrimeCheckInput
+from calculator_mcp.utils.number_theory import is_prime, iter_bits
 
 
 class TestPrimeCheckOperation:
@@ -115,7 +120,85 @@ class TestPrimeCheckOperation:
         input_data = PrimeCheckInput(number=17)
         assert self.operation.validate_input(input_data) is True
     
-    def test_validate_input_too_large(self):
-        input_data = PrimeCheckInput.__new__(PrimeCheckInput)
-        object.__setattr__(input_data, 'number', 10**16)
-        assert self.operation.validate_input(input_data) is False
\ No newline at end of file
+    def test_validate_input_large(self):
+        input_data = PrimeCheckInput(number=10**16)
+        assert self.operation.validate_input(input_data) is True
+    
+    @pytest.mark.asyncio
+    async def test_large_64bit_prime(self):
+        # 2^61 - 1 是梅森素数
+        result = await self.operation.execute(PrimeCheckInput(number=2**61 - 1))
+        
+        assert result.success is True
+        assert result.metadata["is_prime"] is True
+        assert result.metadata["deterministic"] is True
+    
+    @pytest.mark.asyncio
+    async def test_large_semiprime(self):
+        # 两个大于10000的质数之积，试除找不到因数
+        result = await self.operation.execute(PrimeCheckInput(number=1000003 * 1000033))
+        
+        assert result.success is True
+        assert result.metadata["is_prime"] is False
+    
+    @pytest.mark.asyncio
+    async def test_hard_semiprime_uses_small_budget(self):
+        # 两个质因数都约为10^15，超出元数据的分解预算
+        n = (10**15 + 37) * (10**15 + 91)
+        with detail_level("full"):
+            result = await self.operation.execute(PrimeCheckInput(number=n))
+        
+        assert result.metadata["is_prime"] is False
+        assert result.metadata["factorization_complete"] is False
+        assert result.metadata["factors"] == []
+    
+    @pytest.mark.asyncio
+    async def test_arbitrary_size_prime(self):
+        # 2^127 - 1 是梅森素数，超出确定性范围
+        result = await self.operation.execute(PrimeCheckInput(number=2**127 - 1))
+        
+        assert result.success is True
+        assert result.metadata["is_prime"] is True
+        assert result.metadata["deterministic"] is False
+    
+    @pytest.mark.asyncio
+    async def test_batch_numbers(self):
+        numbers = [1, 2, 15, 17, 17, 10**9 + 7, 2**61 - 1, 1000003 * 1000033]
+        with detail_level("full"):
+            result = await self.operation.execute(PrimeCheckInput(numbers=numbers))
+        
+        assert result.success is True
+        assert result.primes == [2, 17, 17, 10**9 + 7, 2**61 - 1]
+        assert result.result == 5
+        bits = base64.b64decode(result.metadata["bitmap"])
+        assert list(iter_bits(bits, len(numbers))) == [is_prime(n) for n in numbers]
+    
+    @pytest.mark.asyncio
+    async def test_batch_range(self):
+        result = await self.operation.execute(PrimeCheckInput(start=90, stop=110))
+        
+        assert result.primes == [97, 101, 103, 107, 109]
+        assert result.metadata["checked"] == 21
+        bits = base64.b64decode(result.metadata["bitmap"])
+        assert [90 + i for i, flag in enumerate(iter_bits(bits, 21)) if flag] == result.primes
+    
+    @pytest.mark.asyncio
+    async def test_batch_uses_process_pool(self, monkeypatch):
+        monkeypatch.setattr(prime_check, "PARALLEL_THRESHOLD", 8)
+        numbers = list(range(10**12, 10**12 + 1000))
+        result = await self.operation.execute(PrimeCheckInput(numbers=numbers))
+        
+        assert result.primes == [n for n in numbers if is_prime(n)]
+        assert executor._executor is not None
+    
+    def test_batch_input_modes(self):
+        with pytest.raises(ValueError):
+            PrimeCheckInput()
+        with pytest.raises(ValueError):
+            PrimeCheckInput(number=7, numbers=[7])
+        with pytest.raises(ValueError):
+            PrimeCheckInput(start=10)
+        with pytest.raises(ValueError):
+            PrimeCheckInput(start=10, stop=5)
+        with pytest.raises(ValueError):
+            PrimeCheckInput(start=0, stop=prime_check.MAX_BATCH_SIZE)
@@ -0,0 +1,88 @@
+"""
+质数区间操作测试
+"""
+import pytest
+from calculator_mcp.operations.prime_range import (
+    PrimesInRangeOperation,
+    CountPrimesOperation,
+    PrimeRangeInput,
+    MAX_LIST_RANGE,
+)
+from calculator_mcp.utils.number_theory import is_prime
+
+
+class TestPrimesInRangeOperation:
+    
+    def setup_method(self):
+        self.operation = PrimesInRangeOperation()
+    
+    def test_operation_properties(self):
+        assert self.operation.name == "primes_in_range"
+        assert "质数" in self.operation.description
+        assert self.operation.input_model == PrimeRangeInput
+    
+    @pytest.mark.asyncio
+    async def test_small_range(self):
+        result = await self.operation.execute(PrimeRangeInput(start=0, stop=30))
+        
+        assert result.success is True
+        assert result.primes == [2, 3, 5, 7, 11, 13, 17, 19, 23, 29]
+        assert result.result == 10
+    
+    @pytest.mark.asyncio
+    async def test_inclusive_bounds(self):
+        result = await self.operation.execute(PrimeRangeInput(start=97, stop=101))
+        
+        assert result.primes == [97, 101]
+    
+    @pytest.mark.asyncio
+    async def test_matches_primality_test_near_limit(self):
+        start, stop = 10**12 - 20000, 10**12
+        result = await self.operation.execute(PrimeRangeInput(start=start, stop=stop))
+        
+        assert result.primes == [n for n in range(start, stop + 1) if is_prime(n)]
+    
+    @pytest.mark.asyncio
+    async def test_spans_multiple_segments(self):
+        result = await self.operation.execute(PrimeRangeInput(start=0, stop=MAX_LIST_RANGE - 1))
+        
+        assert result.result == 78498
+    
+    @pytest.mark.asyncio
+    async def test_range_too_wide(self):
+        result = await self.operation.execute(PrimeRangeInput(start=0, stop=MAX_LIST_RANGE))
+        
+        assert result.success is False
+        assert "count_primes" in result.error_message
+    
+    def test_invalid_range(self):
+        with pytest.raises(ValueError):
+            PrimeRangeInput(start=10, stop=5)
+        with pytest.raises(ValueError):
+            PrimeRangeInput(start=0, stop=10**12 + 1)
+
+
+class TestCountPrimesOperation:
+    
+    def setup_method(self):
+        self.operation = CountPrimesOperation()
+    
+    def test_operation_properties(self):
+        assert self.operation.name == "count_primes"
+        assert self.operation.input_model == PrimeRangeInput
+    
+    @pytest.mark.asyncio
+    async def test_known_counts(self):
+        for stop, expected in [(1, 0), (2, 1), (10, 4), (100, 25), (10**7, 664579)]:
+            result = await self.operation.execute(PrimeRangeInput(start=0, stop=stop))
+            
+            assert result.success is True
+            assert result.result == expected
+    
+    @pytest.mark.asyncio
+    async def test_count_matches_list(self):
+        input_data = PrimeRangeInput(start=123456, stop=654321)
+        listed = await PrimesInRangeOperation().execute(input_data)
+        counted = await self.operation.execute(input_data)
+        
+        assert counted.result == len(listed.primes)
@@ -0,0 +1,199 @@
+"""
+流式统计运算操作测试
+"""
+import pytest
+import math
+import statistics
+from fastmcp import Client
+from calculator_mcp.operations.stream_statistics import (
+    LOCAL_SESSION,
+    StreamOpenOperation, StreamOpenInput,
+    StreamPushOperation, StreamPushInput,
+    StreamStatsOperation, StreamStatsInput,
+    StreamCloseOperation, StreamCloseInput,
+)
+from calculator_mcp.server import create_calculator_server
+from calculator_mcp.utils.streaming import RunningStatistics, StreamStore, stream_store
+
+
+class TestRunningStatistics:
+    """在线统计累加器测试类"""
+
+    def test_matches_two_pass_statistics(self):
+        """测试分批追加与一次性计算结果一致"""
+        data = [2, 4, 4, 4, 5, 5, 7, 9, 1.5, -3.25]
+        accumulator = RunningStatistics()
+        for chunk in (data[:3], data[3:4], data[4:]):
+            accumulator.push(chunk)
+
+        assert accumulator.count == len(data)
+        assert math.isclose(accumulator.mean, statistics.fmean(data))
+        assert math.isclose(accumulator.variance(True), statistics.variance(data))
+        assert math.isclose(accumulator.variance(False), statistics.pvariance(data))
+        assert accumulator.minimum == -3.25
+        assert accumulator.maximum == 9
+
+    def test_numerically_stable_with_large_offset(self):
+        """测试大偏移量下的数值稳定性"""
+        offset = 1e9
+        accumulator = RunningStatistics()
+        for _ in range(1000):
+            accumulator.push([offset + 4, offset + 7, offset + 13, offset + 16])
+
+        assert math.isclose(accumulator.variance(False), 22.5, rel_tol=1e-9)
+
+    def test_empty(self):
+        """测试空累加器"""
+        snapshot = RunningStatistics().snapshot()
+
+        assert snapshot["count"] == 0
+        assert snapshot["mean"] is None
+        assert snapshot["variance"] is None
+        assert snapshot["min"] is None
+
+
+class TestStreamStore:
+    """数据流存储测试类"""
+
+    def test_stream_limit(self):
+        """测试每个会话的数据流数量上限"""
+        store = StreamStore(max_streams=2)
+        first = store.open("a")
+        store.open("a")
+
+        with pytest.raises(ValueError):
+            store.open("a")
+
+        store.open("b")
+        store.close("a", first)
+        store.open("a")
+        assert store.session_streams("a") == 2
+        assert len(store) == 3
+
+    def test_streams_belong_to_session(self):
+        """测试其他会话无法访问数据流"""
+        store = StreamStore()
+        stream_id = store.open("a")
+
+        with pytest.raises(KeyError):
+            store.get("b", stream_id)
+        with pytest.raises(KeyError):
+            store.close("b", stream_id)
+        assert store.get("a", stream_id).count == 0
+
+    def test_close_session(self):
+        """测试一次关闭会话的全部数据流"""
+        store = StreamStore()
+        store.open("a")
+        store.open("a")
+        other = store.open("b")
+
+        assert store.close_session("a") == 2
+        assert store.close_session("a") == 0
+        assert len(store) == 1
+        assert store.get("b", other).count == 0
+
+    def test_idle_streams_expire(self):
+        """测试空闲数据流被清理"""
+        store = StreamStore(max_streams=1, idle_timeout=0)
+        stream_id = store.open("a")
+
+        store.open("a")
+        with pytest.raises(KeyError):
+            store.get("a", stream_id)
+
+
+class TestStreamOperations:
+    """流式统计运算操作测试类"""
+
+    def setup_method(self):
+        self.open = StreamOpenOperation()
+        self.push = StreamPushOperation()
+        self.stats = StreamStatsOperation()
+        self.close = StreamCloseOperation()
+
+    def test_operation_properties(self):
+        """测试操作属性"""
+        assert self.open.name == "stream_open"
+        assert self.push.name == "stream_push"
+        assert self.stats.name == "stream_stats"
+        assert self.close.name == "stream_close"
+        assert self.push.input_model == StreamPushInput
+
+    @pytest.mark.asyncio
+    async def test_session_lifecycle(self):
+        """测试打开、追加、读取和关闭数据流"""
+        opened = await self.open.execute(StreamOpenInput())
+        assert opened.success is True
+        stream_id = opened.stream_id
+
+        result = await self.push.execute(StreamPushInput(stream_id=stream_id, numbers=[2, 4, 4, 4]))
+        assert result.success is True
+        assert result.result == 4
+
+        result = await self.push.execute(StreamPushInput(stream_id=stream_id, numbers=[5, 5, 7, 9]))
+        assert result.result == 8
+
+        result = await self.stats.execute(StreamStatsInput(stream_id=stream_id, is_sample=False))
+        assert result.success is True
+        assert result.result == 5
+        assert math.isclose(result.metadata["variance"], 4)
+        assert math.isclose(result.metadata["standard_deviation"], 2)
+        assert result.metadata["min"] == 2
+        assert result.metadata["max"] == 9
+        assert result.metadata["count"] == 8
+
+        result = await self.close.execute(StreamCloseInput(stream_id=stream_id))
+        assert result.success is True
+        assert math.isclose(result.metadata["variance"], 32 / 7)
+
+        result = await self.stats.execute(StreamStatsInput(stream_id=stream_id))
+        assert result.success is False
+        assert "未知数据流" in result.error_message
+
+    @pytest.mark.asyncio
+    async def test_push_unknown_stream(self):
+        """测试向不存在的数据流追加"""
+        result = await self.push.execute(StreamPushInput(stream_id="missing", numbers=[1]))
+
+        assert result.success is False
+        assert "missing" in result.error_message
+
+    @pytest.mark.asyncio
+    async def test_push_rejects_non_finite(self):
+        """测试拒绝无穷大和NaN"""
+        stream_id = (await self.open.execute(StreamOpenInput())).stream_id
+        result = await self.push.execute(StreamPushInput(stream_id=stream_id, numbers=[1, float("inf")]))
+
+        assert result.success is False
+        stats = await self.stats.execute(StreamStatsInput(stream_id=stream_id))
+        assert stats.metadata["count"] == 0
+        await self.close.execute(StreamCloseInput(stream_id=stream_id))
+
+    def test_empty_push_rejected(self):
+        """测试空列表"""
+        with pytest.raises(ValueError):
+            StreamPushInput(stream_id="x", numbers=[])
+
+
+class TestStreamSessions:
+    """数据流会话隔离测试类"""
+
+    @pytest.mark.asyncio
+    async def test_streams_scoped_to_mcp_session(self):
+        """测试数据流只在打开它的会话中有效"""
+        server = create_calculator_server()
+
+        async with Client(server, mode="legacy") as first, Client(server, mode="legacy") as second:
+            opened = await first.call_tool("stream_open", {})
+            stream_id = opened.structured_content["stream_id"]
+            foreign = await second.call_tool("stream_push", {"stream_id": stream_id, "numbers": [1]})
+            own = await first.call_tool("stream_push", {"stream_id": stream_id, "numbers": [1]})
+            sessions = [session for session in stream_store._sessions if session != LOCAL_SESSION]
+            closed = await first.call_tool("stream_close", {"stream_id": stream_id})
+
+        assert foreign.structured_content["success"] is False
+        assert own.structured_content["result"] == 1
+        assert len(sessions) == 1
+        assert closed.structured_content["success"] is True
+        assert stream_store.session_streams(sessions[0]) == 0
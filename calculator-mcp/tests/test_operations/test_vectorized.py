@@ -0,0 +1,146 @@
+"""
+数组一元运算操作测试
+"""
+import math
+import pytest
+from calculator_mcp.base.models import ArrayInput
+from calculator_mcp.operations.vectorized import (
+    ArrayAngleInput,
+    ArrayLogarithmInput,
+    SquareArrayOperation,
+    CubeArrayOperation,
+    SquareRootArrayOperation,
+    AbsoluteArrayOperation,
+    LogarithmArrayOperation,
+    SineArrayOperation,
+    CosineArrayOperation,
+    TangentArrayOperation,
+)
+
+
+class TestVectorizedOperations:
+    
+    def test_operation_properties(self):
+        assert SquareArrayOperation().name == "square_array"
+        assert SquareArrayOperation().input_model == ArrayInput
+        assert LogarithmArrayOperation().input_model == ArrayLogarithmInput
+        assert TangentArrayOperation().input_model == ArrayAngleInput
+    
+    @pytest.mark.asyncio
+    async def test_square(self):
+        result = await SquareArrayOperation().execute(ArrayInput(values=[1, -2, 0.1]))
+        
+        assert result.success is True
+        assert result.results == [1.0, 4.0, 0.01]
+        assert result.metadata["count"] == 3
+    
+    @pytest.mark.asyncio
+    async def test_cube(self):
+        result = await CubeArrayOperation().execute(ArrayInput(values=[2, -3]))
+        
+        assert result.success is True
+        assert result.results == [8.0, -27.0]
+    
+    @pytest.mark.asyncio
+    async def test_square_root(self):
+        result = await SquareRootArrayOperation().execute(ArrayInput(values=[0, 4, 2.25]))
+        
+        assert result.success is True
+        assert result.results == [0.0, 2.0, 1.5]
+    
+    @pytest.mark.asyncio
+    async def test_square_root_reports_negative_indices(self):
+        result = await SquareRootArrayOperation().execute(ArrayInput(values=[4, -1, 9, -16]))
+        
+        assert result.success is False
+        assert "负数" in result.error_message
+        assert result.metadata["invalid_indices"] == [1, 3]
+        assert result.metadata["invalid_count"] == 2
+    
+    @pytest.mark.asyncio
+    async def test_absolute(self):
+        result = await AbsoluteArrayOperation().execute(ArrayInput(values=[-5, 3.5, 0]))
+        
+        assert result.success is True
+        assert result.results == [5.0, 3.5, 0.0]
+    
+    @pytest.mark.asyncio
+    async def test_logarithm_bases(self):
+        natural = await LogarithmArrayOperation().execute(ArrayLogarithmInput(values=[1, math.e]))
+        common = await LogarithmArrayOperation().execute(ArrayLogarithmInput(values=[10, 1000], base=10))
+        binary = await LogarithmArrayOperation().execute(ArrayLogarithmInput(values=[8], base=2))
+        
+        assert natural.results == pytest.approx([0.0, 1.0])
+        assert common.results == pytest.approx([1.0, 3.0])
+        assert binary.results == pytest.approx([3.0])
+    
+    @pytest.mark.asyncio
+    async def test_logarithm_reports_non_positive_indices(self):
+        result = await LogarithmArrayOperation().execute(ArrayLogarithmInput(values=[1, 0, -2]))
+        
+        assert result.success is False
+        assert result.metadata["invalid_indices"] == [1, 2]
+    
+    def test_logarithm_invalid_base(self):
+        with pytest.raises(ValueError):
+            ArrayLogarithmInput(values=[1], base=1)
+    
+    @pytest.mark.asyncio
+    async def test_sine_and_cosine_degrees(self):
+        sine = await SineArrayOperation().execute(ArrayAngleInput(values=[0, 30, 90, 180]))
+        cosine = await CosineArrayOperation().execute(ArrayAngleInput(values=[0, 60, 90]))
+        
+        assert sine.results == pytest.approx([0.0, 0.5, 1.0, 0.0])
+        assert sine.results[3] == 0.0
+        assert cosine.results == pytest.approx([1.0, 0.5, 0.0])
+    
+    @pytest.mark.asyncio
+    async def test_sine_radians(self):
+        result = await SineArrayOperation().execute(ArrayAngleInput(values=[math.pi / 2], unit="radian"))
+        
+        assert result.results == pytest.approx([1.0])
+    
+    @pytest.mark.asyncio
+    async def test_tangent_reports_singularities(self):
+        result = await TangentArrayOperation().execute(ArrayAngleInput(values=[45, 90, 0, 270, -90]))
+        
+        assert result.success is False
+        assert result.metadata["invalid_indices"] == [1, 3, 4]
+    
+    @pytest.mark.asyncio
+    async def test_tangent_valid(self):
+        result = await TangentArrayOperation().execute(ArrayAngleInput(values=[0, 45, 180]))
+        
+        assert result.success is True
+        assert result.results == pytest.approx([0.0, 1.0, 0.0])
+    
+    @pytest.mark.asyncio
+    async def test_non_finite_values(self):
+        result = await SquareArrayOperation().execute(ArrayInput(values=[1, float("inf"), float("nan")]))
+        
+        assert result.success is False
+        assert result.metadata["invalid_indices"] == [1, 2]
+    
+    @pytest.mark.asyncio
+    async def test_overflow_reported(self):
+        result = await CubeArrayOperation().execute(ArrayInput(values=[1, 1e200]))
+        
+        assert result.success is False
+        assert result.metadata["invalid_indices"] == [1]
+    
+    @pytest.mark.asyncio
+    async def test_large_array(self):
+        values = [float(i) for i in range(10000)]
+        result = await SquareRootArrayOperation().execute(ArrayInput(values=values))
+        
+        assert result.success is True
+        assert len(result.results) == 10000
+        assert result.results[9] == 3.0
+    
+    def test_empty_array(self):
+        with pytest.raises(ValueError):
+            ArrayInput(values=[])
+    
+    def test_invalid_unit(self):
+        with pytest.raises(ValueError):
+            ArrayAngleInput(values=[1], unit="grad")
@@ -0,0 +1,44 @@
+"""
+精确阶乘测试
+"""
+import math
+from decimal import Decimal
+import pytest
+from calculator_mcp.utils import factorials
+from calculator_mcp.utils.factorials import digit_count, exact_factorial, to_decimal_string
+
+
+class TestExactFactorial:
+    
+    def setup_method(self):
+        factorials.clear_cache()
+    
+    @pytest.mark.parametrize("n", [0, 1, 2, 10, 170, 1000, 1001, 2500, 4096])
+    def test_matches_math_factorial(self, n):
+        value = exact_factorial(n)
+        
+        assert value == Decimal(math.factorial(n))
+        assert digit_count(value) == len(to_decimal_string(value))
+    
+    def test_extends_from_cached_value(self, monkeypatch):
+        exact_factorial(4000)
+        
+        def fail(n):
+            raise AssertionError("应从缓存的4000!继续计算")
+        monkeypatch.setattr(factorials, "_factorial_by_primes", fail)
+        
+        assert exact_factorial(4500) == Decimal(math.factorial(4500))
+        assert exact_factorial(4000) == Decimal(math.factorial(4000))
+    
+    def test_cache_is_bounded(self, monkeypatch):
+        monkeypatch.setattr(factorials, "CACHE_MAX_DIGITS", 30000)
+        for n in (2000, 5000, 8000):
+            exact_factorial(n)
+        
+        assert list(factorials._cache) == [8000]
+    
+    def test_limits(self):
+        with pytest.raises(ValueError):
+            exact_factorial(-1)
+        with pytest.raises(ValueError):
+            exact_factorial(factorials.MAX_EXACT_N + 1)
@@ -0,0 +1,56 @@
+"""
+数量级计算测试
+"""
+import decimal
+import math
+from decimal import Decimal
+import pytest
+from calculator_mcp.utils.magnitude import (
+    MAX_MAGNITUDE_N,
+    combination_magnitude,
+    factorial_magnitude,
+    format_scientific,
+    ln_factorial,
+    permutation_magnitude,
+)
+
+
+def _leading(value: int) -> float:
+    digits = str(value)
+    return float(f"{digits[0]}.{digits[1:17]}")
+
+
+class TestMagnitude:
+    
+    @pytest.mark.parametrize("n", [0, 1, 2, 9, 10, 99, 100, 101, 170, 1000, 1400])
+    def test_factorial_matches_exact(self, n):
+        value = math.factorial(n)
+        magnitude = factorial_magnitude(n)
+        
+        assert magnitude.digit_count == len(str(value))
+        assert magnitude.exponent == magnitude.digit_count - 1
+        assert magnitude.mantissa == pytest.approx(_leading(value), rel=1e-14)
+    
+    @pytest.mark.parametrize("n, r", [(10, 1), (10**6, 1), (100, 50), (10**15, 3), (500, 500)])
+    def test_permutation_and_combination_match_exact(self, n, r):
+        for magnitude, value in (
+            (permutation_magnitude(n, r), math.perm(n, r)),
+            (combination_magnitude(n, r), math.comb(n, r)),
+        ):
+            assert magnitude.digit_count == len(str(value))
+            assert magnitude.mantissa == pytest.approx(_leading(value), rel=1e-14)
+    
+    @pytest.mark.parametrize("n", [100, 120, 1000])
+    def test_stirling_precision(self, n):
+        exact = decimal.Context(prec=60).ln(Decimal(math.factorial(n)))
+        assert abs(ln_factorial(n) - exact) < Decimal("1e-40")
+    
+    def test_format_scientific(self):
+        assert format_scientific(factorial_magnitude(5)) == "1.2e+2"
+        assert format_scientific(factorial_magnitude(100)) == "9.33262154439442e+157"
+    
+    def test_limits(self):
+        with pytest.raises(ValueError):
+            factorial_magnitude(MAX_MAGNITUDE_N + 1)
+        with pytest.raises(ValueError):
+            combination_magnitude(3, 4)
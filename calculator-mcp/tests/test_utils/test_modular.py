@@ -0,0 +1,51 @@
+"""
+模质数组合数与排列数测试
+"""
+import math
+import pytest
+from calculator_mcp.utils import modular
+from calculator_mcp.utils.modular import combination_mod, factorial_tables, permutation_mod
+
+
+class TestModular:
+    
+    @pytest.mark.parametrize("p", [2, 3, 7, 101])
+    def test_matches_exact_values(self, p):
+        for n in range(0, 320, 7):
+            for r in range(0, n + 1, 3):
+                assert combination_mod(n, r, p) == math.comb(n, r) % p
+                assert permutation_mod(n, r, p) == math.perm(n, r) % p
+    
+    def test_lucas_for_huge_n(self):
+        p = 999_983
+        # C(a·p + b, c·p + d) ≡ C(a,c)·C(b,d)
+        assert combination_mod(7 * p + 5, 3 * p + 2, p) == math.comb(7, 3) * math.comb(5, 2) % p
+        # p进制下 n = (2,0,0,1)，r = (1,0,0,0)
+        assert combination_mod(2 * p**3 + 1, p**3, p) == 2
+        assert combination_mod(p**3, 1, p) == 0
+    
+    def test_permutation_across_multiple_of_p(self):
+        assert permutation_mod(15, 3, 7) == 0
+        assert permutation_mod(20, 3, 7) == 18 * 19 * 20 % 7
+    
+    def test_tables(self):
+        tables = factorial_tables(13)
+        
+        for i in range(13):
+            assert tables.factorials[i] == math.factorial(i) % 13
+            assert tables.factorials[i] * tables.inverse_factorials[i] % 13 == 1
+    
+    def test_tables_are_cached_per_modulus(self):
+        factorial_tables.cache_clear()
+        for p in (5, 7, 5):
+            factorial_tables(p)
+        
+        info = factorial_tables.cache_info()
+        assert info.hits == 1
+        assert info.maxsize == modular.TABLE_CACHE_SIZE
+    
+    @pytest.mark.parametrize("p", [12, modular.MAX_MODULUS + 3])
+    def test_invalid_modulus(self, p):
+        assert modular.modulus_error(p) is not None
+        with pytest.raises(ValueError):
+            combination_mod(5, 2, p)
@@ -0,0 +1,89 @@
+"""
+数论工具测试
+"""
+import pytest
+from calculator_mcp.utils import number_theory
+from calculator_mcp.utils.number_theory import (
+    SMALL_PRIMES,
+    FactorizationError,
+    factorize,
+    format_factorization,
+    is_deterministic,
+    is_prime,
+    merge_factorizations,
+)
+
+
+class TestMillerRabin:
+    
+    def test_matches_trial_division(self):
+        def trial(n):
+            return n > 1 and all(n % d for d in range(2, int(n ** 0.5) + 1))
+        
+        assert [n for n in range(20000) if is_prime(n)] == [n for n in range(20000) if trial(n)]
+    
+    def test_small_primes_table(self):
+        assert SMALL_PRIMES[:5] == (2, 3, 5, 7, 11)
+        assert SMALL_PRIMES[-1] == 251
+    
+    def test_strong_pseudoprimes(self):
+        # 以2为底的强伪素数及Carmichael数
+        for n in [2047, 3215031751, 3825123056546413051, 318665857834031151167461, 561, 41041]:
+            assert is_prime(n) is False
+    
+    def test_64bit_boundaries(self):
+        assert is_prime(2**64 - 59) is True
+        assert is_prime(2**64 - 1) is False
+        assert is_deterministic(2**64)
+    
+    def test_large_numbers(self):
+        assert is_prime(2**521 - 1) is True
+        assert is_prime((2**89 - 1) * (2**107 - 1)) is False
+        assert not is_deterministic(2**127 - 1)
+
+
+class TestFactorize:
+    
+    def test_small_numbers(self):
+        for n in range(1, 3000):
+            product = 1
+            for prime, exponent in factorize(n):
+                assert is_prime(prime)
+                product *= prime ** exponent
+            assert product == n
+    
+    def test_large_prime_factors(self):
+        assert factorize(1000003 * 1000033) == ((1000003, 1), (1000033, 1))
+        assert factorize(2**64 - 1) == ((3, 1), (5, 1), (17, 1), (257, 1), (641, 1), (65537, 1), (6700417, 1))
+        assert factorize(3 * 4294967291**2) == ((3, 1), (4294967291, 2))
+        assert factorize(2**200) == ((2, 200),)
+    
+    def test_results_are_cached(self):
+        factorize.cache_clear()
+        factorize(600851475143)
+        factorize(600851475143)
+        
+        assert factorize.cache_info().hits == 1
+    
+    def test_budget_exceeded(self, monkeypatch):
+        monkeypatch.setattr(number_theory, "RHO_ITERATION_BUDGET", 10)
+        factorize.cache_clear()
+        
+        with pytest.raises(FactorizationError):
+            factorize(1000003 * 1000033)
+    
+    def test_budget_exceeded_is_cached(self):
+        factorize.cache_clear()
+        
+        for _ in range(2):
+            with pytest.raises(FactorizationError):
+                factorize(1000003 * 1000033, iterations=10)
+        
+        assert factorize.cache_info().hits == 1
+        assert factorize(1000003 * 1000033) == ((1000003, 1), (1000033, 1))
+    
+    def test_merge_and_format(self):
+        merged = merge_factorizations([factorize(12), factorize(18), factorize(5)])
+        
+        assert merged == ((2, 2), (3, 2), (5, 1))
+        assert format_factorization(merged) == "2^2 × 3^2 × 5"